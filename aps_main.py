@@ -297,14 +297,25 @@ from pathlib import Path
 from datetime import datetime
 
 # Import APS modules
-from engine.aps_config import INPUT_DIR, OUTPUT_DIR, REQUIRED_HEADERS
-from engine.aps_normalize import normalize_and_score
-from engine.aps_healthcheck import health_check
+from engine.aps_config import INPUT_DIR, OUTPUT_DIR, REQUIRED_HEADERS, STREAM_CHUNK_ROWS, STREAM_THRESHOLD_MB
+from engine.aps_parallel import normalize_and_score_parallel
+from engine.aps_dtypes import apply_dtype_plan, bytes_per_row, memory_report, widen
+from engine.aps_stream import stream_score_csv
+from engine.aps_quarantine import quarantine_path, quarantine_rows
+from engine.aps_aliases import engine_header_map
+from engine.aps_schema import read_plan
+from engine.aps_normalize import parse_sources
+from engine.aps_io import read_csv
+from engine.aps_healthcheck import HealthPartial, health_check, health_report
+from engine.aps_sketch import column_median
 from engine.aps_feed_config import detect_feed_type
 from engine.aps_render import render_pdf
 from engine.aps_database import MarketDataDB
 import engine.aps_metrics as metrics
 
+# Feed this pipeline renders (its Black Kit is the Core Equity layout)
+FEED = 'core_equity'
+
 def print_banner():
     """Print pipeline banner"""
     print("=" * 60)
@@ -351,12 +362,26 @@ def print_health_results(checks: dict):
     
     print(f"  Summary: {pass_count} PASS, {warn_count} WARN, {fail_count} FAIL")
 
-def calculate_market_aggregates(df: pd.DataFrame) -> dict:
+# ZIPs with fewer records are left out of the ZIP breakdowns
+MIN_ZIP_RECORDS = 5
+
+# Columns with per-ZIP medians
+ZIP_MEDIAN_COLUMNS = ['APS_Score (v2.0)', 'LTV %', 'Equity %', 'Equity_Dollars', 'Loan_Age_Mo']
+
+def group_modes(df: pd.DataFrame, key: str, col: str) -> dict:
+    """Most common `col` value per `key` group (ties go to the smallest, like Series.mode()[0])"""
+    counts = df.groupby([key, col], observed=True).size()
+    top = counts.groupby(level=0, observed=True).idxmax()
+    return {group: pair[1] for group, pair in top.items()}
+
+def calculate_market_aggregates(df: pd.DataFrame, sketches: dict = None) -> dict:
     """
     Calculate city/ZIP level aggregates for database storage
     
     Args:
         df: DataFrame with scored data
+        sketches: Optional median sketches by column (from health_check);
+                  city medians reuse them and add their own for later stages
     
     Returns:
         Dictionary with city and ZIP aggregates
@@ -374,91 +399,163 @@ def calculate_market_aggregates(df: pd.DataFrame) -> dict:
         aggregates['city'] = {
             'city': city,
             'state': state,
-            'median_ltv': df['LTV %'].median() / 100 if 'LTV %' in df.columns else 0,
-            'median_equity_pct': df['Equity %'].median() / 100 if 'Equity %' in df.columns else 0,
-            'median_equity_dollars': df['Equity_Dollars'].median() if 'Equity_Dollars' in df.columns else 0,
-            'median_loan_age_months': int(df['Loan_Age_Mo'].median()) if 'Loan_Age_Mo' in df.columns else 0,
+            'median_ltv': column_median(df, 'LTV %', sketches) / 100,
+            'median_equity_pct': column_median(df, 'Equity %', sketches) / 100,
+            'median_equity_dollars': column_median(df, 'Equity_Dollars', sketches),
+            'median_loan_age_months': int(column_median(df, 'Loan_Age_Mo', sketches)),
             'refi_pressure': 74,  # Placeholder - calculate from refi-eligible percentage
             'equity_delta_90d': 3.1,  # Placeholder - would come from historical data
             'record_count': len(df)
         }
     
-    # ZIP-level breakdowns
+    # ZIP-level breakdowns: one grouped pass instead of a loop over every ZIP
     if 'ZIP' in df.columns:
-        zip_groups = df.groupby('ZIP')
+        columns = [col for col in ZIP_MEDIAN_COLUMNS if col in df.columns]
+        grouped = pd.DataFrame({col: widen(df[col]) for col in columns}).assign(ZIP=df['ZIP']).groupby('ZIP', observed=True)
+        sizes = grouped.size()
+        sizes = sizes[sizes >= MIN_ZIP_RECORDS]
+        medians = grouped.median().loc[sizes.index].to_dict('index') if columns else {}
+        cities = group_modes(df, 'ZIP', 'City') if 'City' in df.columns else {}
+        states = group_modes(df, 'ZIP', 'State') if 'State' in df.columns else {}
         
-        for zip_code, group in zip_groups:
-            if len(group) < 5:  # Skip ZIPs with too few records
-                continue
-            
+        for zip_code, count in sizes.items():
+            zip_medians = medians.get(zip_code, {})
             zip_data = {
                 'zip': str(zip_code),
-                'city': group['City'].mode()[0] if 'City' in group.columns else 'Unknown',
-                'state': group['State'].mode()[0] if 'State' in group.columns else 'XX',
-                'tip_zip_score': group['APS_Score (v2.0)'].median() if 'APS_Score (v2.0)' in group.columns else 0,
+                'city': cities.get(zip_code, 'Unknown'),
+                'state': states.get(zip_code, 'XX'),
+                'tip_zip_score': zip_medians.get('APS_Score (v2.0)', 0),
                 'median_dom': 21,  # Placeholder - would come from transaction data
                 'equity_delta_90d': 3.0,  # Placeholder
                 'refi_pressure': 75,  # Placeholder
-                'record_count': len(group),
-                'median_ltv': group['LTV %'].median() / 100 if 'LTV %' in group.columns else 0,
-                'median_equity_pct': group['Equity %'].median() / 100 if 'Equity %' in group.columns else 0,
-                'median_equity_dollars': group['Equity_Dollars'].median() if 'Equity_Dollars' in group.columns else 0,
-                'median_loan_age': int(group['Loan_Age_Mo'].median()) if 'Loan_Age_Mo' in group.columns else 0
+                'record_count': int(count),
+                'median_ltv': zip_medians.get('LTV %', 0) / 100,
+                'median_equity_pct': zip_medians.get('Equity %', 0) / 100,
+                'median_equity_dollars': zip_medians.get('Equity_Dollars', 0),
+                'median_loan_age': int(zip_medians.get('Loan_Age_Mo', 0))
             }
             
             aggregates['zips'].append(zip_data)
     
     return aggregates
 
-def main(csv_path: Path):
+def main(csv_path: Path, chunk_rows: int = None):
     """
     Main pipeline execution
     
     Args:
         csv_path: Path to input CSV file
+        chunk_rows: Stream the file in chunks of this many rows (optional).
+                    Files over STREAM_THRESHOLD_MB stream automatically.
     """
     
     print_banner()
     print(f"📁 Input file: {csv_path.name}")
     
-    # ===== STEP 1: Load CSV =====
-    print("[1/7] Loading CSV...")
-    try:
-        df = pd.read_csv(csv_path, encoding='utf-8-sig')
-        print(f"  ✓ Loaded {len(df)} records")
-        print(f"  ✓ Found {len(df.columns)} columns")
-    except Exception as e:
-        print(f"  ✗ Error loading CSV: {e}")
-        return
-    
-    # ===== STEP 2: Normalize and Score =====
-    print("[2/7] Normalizing and scoring data...")
-    try:
-        df = normalize_and_score(df)
-        print(f"  ✓ Calculated LTV, Equity, Loan Age")
-        print(f"  ✓ Calculated APS Score v2.0")
-        print(f"  ✓ Assigned APS Tiers")
-        print(f"  ✓ Calculated CCI Index")
-    except Exception as e:
-        print(f"  ⚠ Scoring error: {e}")
-    
-    # ===== STEP 3: Health Check =====
-    print("[3/7] Running 18-point health check...")
-    checks = health_check(df)
-    print_health_results(checks)
+    if chunk_rows is None and csv_path.stat().st_size > STREAM_THRESHOLD_MB * 1024 * 1024:
+        chunk_rows = STREAM_CHUNK_ROWS
     
-    # ===== STEP 4: Save Scored CSV =====
-    print("[4/7] Saving scored CSV...")
     scored_csv_name = csv_path.stem + "_scored.csv"
     scored_csv_path = OUTPUT_DIR / scored_csv_name
-    try:
-        df.to_csv(scored_csv_path, index=False, encoding='utf-8-sig')
-        print(f"  ✓ Saved: {scored_csv_name}")
-    except Exception as e:
-        print(f"  ⚠ CSV save error: {e}")
+    quarantine_csv_path = quarantine_path(scored_csv_path)
+    total_records = None
+    counts = None  # streaming: full-file counts for the cover page (df is a sample)
+    
+    if chunk_rows:
+        # ===== STEPS 1, 2 & 4 (streaming): score each chunk and append it to the scored CSV =====
+        print(f"[1/7] Streaming CSV ({chunk_rows:,} rows per chunk)...")
+        print("[2/7] Normalizing and scoring data...")
+        health = HealthPartial()
+        try:
+            # Columns the feed outputs, typed, and the names the engine reads - resolved once from the header row
+            header = read_csv(csv_path, nrows=0, encoding='utf-8-sig').columns
+            plan = read_plan(header, FEED)
+            header_map = engine_header_map(plan['usecols'])
+            print(f"  ✓ Reading {len(plan['usecols'])} of {len(header)} columns")
+            if header_map:
+                print(f"  ✓ Mapped {len(header_map)} vendor headers")
+            total_records, df = stream_score_csv(
+                csv_path,
+                scored_csv_path,
+                chunk_rows,
+                encoding='utf-8-sig',
+                read_kwargs={'encoding': 'utf-8-sig', **plan},
+                health=health,
+                quarantine_path=quarantine_csv_path,
+                header_map=header_map
+            )
+            print(f"  ✓ Scored {total_records:,} records")
+            print(f"  ✓ Saved: {scored_csv_name}")
+            print(f"  ✓ Report sample: {len(df):,} records")
+            df = apply_dtype_plan(df)
+        except Exception as e:
+            print(f"  ✗ Streaming error: {e}")
+            return
+        
+        # ===== STEP 3: Health Check (merged from every chunk) =====
+        print("[3/7] Running 18-point health check...")
+        checks = health_report(health)
+        print_health_results(checks)
+        sketches = health.sketches  # full-file medians for the later stages
+        counts = health.counts
+        
+        print("[4/7] Scored CSV written during streaming")
+    else:
+        # ===== STEP 1: Load CSV =====
+        print("[1/7] Loading CSV...")
+        try:
+            header = read_csv(csv_path, nrows=0, encoding='utf-8-sig').columns
+            df = read_csv(csv_path, encoding='utf-8-sig', **read_plan(header, FEED))
+            header_map = engine_header_map(df.columns)
+            df.rename(columns=header_map, inplace=True)
+            print(f"  ✓ Loaded {len(df)} records")
+            if header_map:
+                print(f"  ✓ Mapped {len(header_map)} vendor headers")
+            print(f"  ✓ Read {len(df.columns)} of {len(header)} columns")
+        except Exception as e:
+            print(f"  ✗ Error loading CSV: {e}")
+            return
+        
+        # Rows failing the quarantine rules go to a sidecar CSV, unscored
+        parsed = parse_sources(df)
+        df, quarantined = quarantine_rows(df, parsed)
+        if len(quarantined):
+            quarantined.to_csv(quarantine_csv_path, index=False, encoding='utf-8-sig')
+            print(f"  ⚠ Quarantined {len(quarantined):,} rows → {quarantine_csv_path.name}")
+        
+        # ===== STEP 2: Normalize and Score =====
+        print("[2/7] Normalizing and scoring data...")
+        sources = {}  # parsed money/date arrays, reused by the health check
+        sketches = {}  # median sketches, reused by the aggregates and the cover page
+        try:
+            df = normalize_and_score_parallel(df, sources=sources, parsed=parsed)
+            print(f"  ✓ Calculated LTV, Equity, Loan Age")
+            print(f"  ✓ Calculated APS Score v2.0")
+            print(f"  ✓ Assigned APS Tiers")
+            print(f"  ✓ Calculated CCI Index")
+            before = bytes_per_row(df)
+            df = apply_dtype_plan(df)
+            print(f"  ✓ Compact dtypes: {memory_report(before, df)}")
+        except Exception as e:
+            print(f"  ⚠ Scoring error: {e}")
+        
+        # ===== STEP 3: Health Check =====
+        print("[3/7] Running 18-point health check...")
+        checks = health_check(df, sources, sketches)
+        print_health_results(checks)
+        
+        # ===== STEP 4: Save Scored CSV =====
+        print("[4/7] Saving scored CSV...")
+        try:
+            df.to_csv(scored_csv_path, index=False, encoding='utf-8-sig')
+            print(f"  ✓ Saved: {scored_csv_name}")
+        except Exception as e:
+            print(f"  ⚠ CSV save error: {e}")
     
     # ===== STEP 5: Calculate Aggregates (BEFORE database) =====
-    aggregates = calculate_market_aggregates(df)
+    aggregates = calculate_market_aggregates(df, sketches)
+    if total_records is not None and aggregates['city']:
+        aggregates['city']['record_count'] = total_records
     
     # ===== STEP 6: Store in Database =====
     print("[5/7] Storing aggregates in database...")
@@ -521,7 +618,9 @@ def main(csv_path: Path):
             csv_filename=csv_path.name,
             market_name=market_name,
             quarter=quarter,
-            year=year
+            year=year,
+            sketches=sketches,
+            counts=counts
         )
     except Exception as e:
         print(f"  ⚠ PDF generation error: {e}")
@@ -549,18 +648,23 @@ def main(csv_path: Path):
 
 if __name__ == "__main__":
     # Get CSV file path
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('--'):
         csv_file = Path(sys.argv[1])
     else:
         # Default to test.csv in input directory
         csv_file = INPUT_DIR / "test.csv"
     
+    # Optional: --chunk-rows N (streaming mode)
+    chunk_rows = None
+    if '--chunk-rows' in sys.argv:
+        chunk_rows = int(sys.argv[sys.argv.index('--chunk-rows') + 1])
+    
     # Check if file exists
     if not csv_file.exists():
         print(f"❌ Error: File not found: {csv_file}")
-        print(f"\nUsage: python aps_main.py <csv_file>")
+        print(f"\nUsage: python aps_main.py <csv_file> [--chunk-rows N]")
         print(f"Example: python aps_main.py input/test.csv")
         sys.exit(1)
     
     # Run pipeline
-    main(csv_file)
\ No newline at end of file
+    main(csv_file, chunk_rows=chunk_rows)
\ No newline at end of file
@@ -0,0 +1,185 @@
+# aps_aliases.py - Vendor Header Resolver
+"""
+Compiled vendor header resolver (aliases/vendor_alias_map.json)
+Every alias is indexed under a normalized key (case, spaces, underscores
+and punctuation ignored), so a header list resolves with one dict lookup
+per header. Headers with no exact key fall back to fuzzy matching against
+the indexed keys; each fuzzy result is cached, so a vendor's headers are
+only fuzzy-matched the first time they are seen.
+"""
+
+import difflib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from engine.aps_config import ALIAS_MAP_FILE, ALIAS_FUZZY_CUTOFF
+
+# Canonical field -> column name the scoring, health check and report stages read
+ENGINE_HEADERS = {
+    'owner_name': 'Owner Name',
+    'mailing_address': 'Mail Address',
+    'property_address': 'Property Address',
+    'city': 'City',
+    'state': 'State',
+    'zip': 'ZIP',
+    'property_value': 'EstValue',
+    'loan_balance': 'TotalLoanBal',
+    'loan_date': 'LastLoanDate'
+}
+
+# Shorter keys are too ambiguous to fuzzy-match ('st', 'apn', ...)
+FUZZY_MIN_LENGTH = 5
+
+# Resolved header lists kept per resolver (a deployment sees a handful of layouts)
+RESOLVED_CACHE_SIZE = 1024
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+# alias map file -> HeaderResolver (compiled on first use)
+RESOLVER_CACHE = {}
+
+# ==================== NORMALIZED KEYS ====================
+
+def header_key(header) -> str:
+    """
+    Normalized lookup key of a header
+
+    Example:
+        >>> header_key('Est. Value $'), header_key('EST_VALUE')
+        ('estvalue', 'estvalue')
+    """
+    return _NON_ALNUM.sub('', str(header).lower())
+
+# ==================== RESOLVER ====================
+
+class HeaderResolver:
+    """
+    Vendor header -> canonical field resolver
+
+    Example:
+        >>> resolver = load_resolver()
+        >>> resolver.resolve(['SITE_ADDR', 'Est. Value $', 'Loan_Balance'])
+        {'SITE_ADDR': 'property_address', 'Est. Value $': 'property_value', 'Loan_Balance': 'loan_balance'}
+    """
+
+    def __init__(self, alias_map: Dict[str, List[str]], fuzzy_cutoff: float = ALIAS_FUZZY_CUTOFF):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.index = {}
+        self.conflicts = []
+        self._fuzzy = {}
+        self._resolved = {}
+
+        # Fields are indexed in file order: on a key clash the first field keeps it
+        for field, aliases in alias_map.items():
+            if not isinstance(aliases, list):  # e.g. "notes"
+                continue
+            for alias in [field] + aliases:
+                key = header_key(alias)
+                owner = self.index.setdefault(key, field)
+                if owner != field:
+                    self.conflicts.append((alias, owner, field))
+        self.keys = list(self.index)
+
+    @property
+    def fields(self) -> List[str]:
+        """Canonical field names"""
+        return list(dict.fromkeys(self.index.values()))
+
+    def match(self, header) -> Optional[str]:
+        """Canonical field of one header: exact key, then cached fuzzy match (None = unknown)"""
+        key = header_key(header)
+        field = self.index.get(key)
+        if field is not None:
+            return field
+        if key not in self._fuzzy:
+            close = difflib.get_close_matches(key, self.keys, n=1, cutoff=self.fuzzy_cutoff)
+            self._fuzzy[key] = self.index[close[0]] if close and len(key) >= FUZZY_MIN_LENGTH else None
+        return self._fuzzy[key]
+
+    def resolve(self, headers) -> Dict[str, str]:
+        """
+        Map a header list to canonical fields
+
+        Exact matches are assigned first, so a fuzzy match never takes a
+        field that another header names exactly; each field is assigned to
+        one header at most (the first, in header order).
+
+        Args:
+            headers: Column names (e.g. df.columns)
+
+        Returns:
+            Dict of header -> canonical field for every recognized header
+        """
+        headers = tuple(headers)
+        if headers in self._resolved:
+            return self._resolved[headers]
+
+        mapping = {}
+        taken = set()
+        exact = [(header, self.index.get(header_key(header))) for header in headers]
+        for header, field in exact:
+            if field is not None and field not in taken:
+                mapping[header] = field
+                taken.add(field)
+        for header, field in exact:
+            if field is None:
+                field = self.match(header)
+                if field is not None and field not in taken:
+                    mapping[header] = field
+                    taken.add(field)
+
+        mapping = {header: mapping[header] for header in headers if header in mapping}
+        if len(self._resolved) >= RESOLVED_CACHE_SIZE:
+            self._resolved.clear()
+        self._resolved[headers] = mapping
+        return mapping
+
+    def rename_map(self, headers, targets: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Renames that give `headers` canonical names (or `targets` names)
+
+        Args:
+            headers: Column names
+            targets: Optional canonical field -> output name; fields not in
+                     it are left as they are (e.g. ENGINE_HEADERS)
+
+        Returns:
+            Dict of header -> new name, identity renames left out
+        """
+        renames = {}
+        for header, field in self.resolve(headers).items():
+            name = field if targets is None else targets.get(field)
+            if name is not None and name != header:
+                renames[header] = name
+        # Never rename onto a column the frame already has under that name
+        return {header: name for header, name in renames.items()
+                if name not in headers or name in renames}
+
+# ==================== LOADING ====================
+
+def load_alias_map(path: Path = ALIAS_MAP_FILE) -> Dict[str, List[str]]:
+    """Canonical field -> vendor aliases, as stored in the alias map JSON"""
+    with open(path, encoding='utf-8') as f:
+        return {field: aliases for field, aliases in json.load(f).items() if isinstance(aliases, list)}
+
+def load_resolver(path: Path = ALIAS_MAP_FILE) -> HeaderResolver:
+    """Compiled resolver for an alias map file (cached per path)"""
+    path = Path(path)
+    if path not in RESOLVER_CACHE:
+        RESOLVER_CACHE[path] = HeaderResolver(load_alias_map(path))
+    return RESOLVER_CACHE[path]
+
+def resolver_for(alias_map: Optional[Dict[str, List[str]]] = None) -> HeaderResolver:
+    """Resolver for a request-supplied alias map (compiled once per distinct map), default file otherwise"""
+    if alias_map is None:
+        return load_resolver()
+    key = json.dumps(alias_map, sort_keys=True)
+    if key not in RESOLVER_CACHE:
+        RESOLVER_CACHE[key] = HeaderResolver(alias_map)
+    return RESOLVER_CACHE[key]
+
+def engine_header_map(headers) -> Dict[str, str]:
+    """Renames from vendor headers to the ENGINE_HEADERS names aps_main and aps_pipeline read"""
+    return load_resolver().rename_map(headers, ENGINE_HEADERS)
@@ -325,14 +325,19 @@ Production REST API with job tracking, chunked processing, and feed routing
 Client Requirements: Phase 1 Implementation
 """
 
-from fastapi import FastAPI, Query, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, Query, HTTPException, BackgroundTasks, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from typing import Optional, Dict, Any, List
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Dict, Any, List, Iterator
 from datetime import datetime
 from pathlib import Path
 from pydantic import BaseModel, HttpUrl
+import csv
+import io
+import re
 import uuid
+import numpy as np
 import pandas as pd
 import json
 import requests
@@ -340,9 +345,21 @@ from enum import Enum
 
 import engine.aps_metrics as metrics
 from engine.aps_database import MarketDataDB
-from engine.aps_feed_config import detect_feed_type, get_feed_config
-from engine.aps_normalize import normalize_and_score
+from engine.aps_feed_config import detect_feed_type, feed_groups, get_feed_config
+from engine.aps_normalize import normalize_and_score, parse_sources
+from engine.aps_healthcheck import HealthPartial, health_partial, health_report
+from engine.aps_healthcheck import health_check as sample_health_check
+from engine.aps_dedupe import FLAG_COLUMNS, DuplicateIndex
+from engine.aps_quarantine import quarantine_rows, reason_counts, merge_counts
+from engine.aps_aliases import load_alias_map, resolver_for
+from engine.aps_schema import ReadProfile, SchemaCache, SchemaDrift, SchemaFingerprint
+from engine.aps_schema import header_feed, learn_fingerprint, read_plan, typed_chunks
+from engine.aps_stream import FeedSpill
+from engine.aps_dtypes import apply_dtype_plan
+from engine.aps_io import read_csv, iter_csv, sample_csv_bytes
 from engine.aps_render import render_pdf
+from engine.aps_config import CALCULATE_BATCH_MAX, CALCULATE_STREAM_ROWS
+from engine.aps_config import PREVIEW_SAMPLE_KB, PREVIEW_STRATA, PREVIEW_ROWS
 
 # ==================== MODELS ====================
 
@@ -396,45 +413,40 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 # ==================== ALIAS MAPPING ====================
 
-DEFAULT_ALIAS_MAP = {
-    "property_address": ["Address", "Property Address", "Street Address", "Property_Address"],
-    "city": ["City", "City Name", "Municipality"],
-    "state": ["State", "ST", "State Code"],
-    "zip": ["ZIP", "Zip Code", "Postal Code", "ZipCode"],
-    "owner_name": ["Owner Name", "Owner", "Owner OO", "OwnerName"],
-    "loan_date": ["LastLoanDate", "Loan Date", "Last Loan Date", "Loan 1 Date"],
-    "loan_balance": ["TotalLoanBal", "Loan Balance", "Total Loan Balance"],
-    "property_value": ["EstValue", "Property Value", "Est Value", "AVM"],
-    "ltv": ["LTV %", "LTV", "Loan to Value"],
-    "equity": ["Equity %", "Equity Pct", "Equity Percentage"]
-}
+# Canonical field -> vendor headers (aliases/vendor_alias_map.json)
+DEFAULT_ALIAS_MAP = load_alias_map()
 
 # ==================== DNC/CONSENT FILTERING ====================
 
 def apply_dnc_filter(df: pd.DataFrame) -> pd.DataFrame:
-    """Filter out Do Not Contact records"""
-    original_count = len(df)
+    """Filter out Do Not Contact records (DNC and consent folded into one mask)"""
+    keep = None
     
     # Remove records with DNC flag
     if 'dnc_flag' in df.columns:
-        df = df[df['dnc_flag'] != True]
+        keep = (df['dnc_flag'] != True).to_numpy()
     
     # Remove records without consent
     if 'consent' in df.columns:
-        df = df[df['consent'] != False]
+        consent = (df['consent'] != False).to_numpy()
+        keep = consent if keep is None else keep & consent
     
-    filtered_count = original_count - len(df)
-    if filtered_count > 0:
-        print(f"  ⚠ Filtered {filtered_count} records due to DNC/consent")
+    # Only materialize a filtered frame when something is actually dropped
+    if keep is None or keep.all():
+        return df
     
-    return df
+    filtered_count = len(df) - int(keep.sum())
+    print(f"  ⚠ Filtered {filtered_count} records due to DNC/consent")
+    
+    return df[keep]
 
 # ==================== SCHEMA VALIDATION ====================
 
 REQUIRED_FIELDS_V2 = ["property_address", "city", "state", "zip"]
 
-def validate_schema(df: pd.DataFrame, schema_version: str = "v2.0") -> tuple[bool, str]:
-    """Validate DataFrame against schema"""
+def validate_schema(df: pd.DataFrame, schema_version: str = "v2.0",
+                    alias_map: Dict[str, List[str]] = None) -> tuple[bool, str]:
+    """Validate DataFrame against schema (any alias of a required field counts)"""
     
     if schema_version == "v2.0":
         required = REQUIRED_FIELDS_V2
@@ -442,7 +454,8 @@ def validate_schema(df: pd.DataFrame, schema_version: str = "v2.0") -> tuple[boo
         return False, f"Unknown schema version: {schema_version}"
     
     # Check for required columns
-    df_cols = [col.lower().replace(' ', '_') for col in df.columns]
+    df_cols = set(resolver_for(alias_map).resolve(df.columns).values())
+    df_cols.update(col.lower().replace(' ', '_') for col in df.columns)
     missing = [field for field in required if field not in df_cols]
     
     if missing:
@@ -453,66 +466,141 @@ def validate_schema(df: pd.DataFrame, schema_version: str = "v2.0") -> tuple[boo
 # ==================== COLUMN ALIAS MAPPING ====================
 
 def apply_alias_mapping(df: pd.DataFrame, alias_map: Dict[str, List[str]] = None) -> pd.DataFrame:
-    """Map column names using alias map"""
-    
-    if alias_map is None:
-        alias_map = DEFAULT_ALIAS_MAP
-    
-    # Create reverse mapping: alias -> standard_name
-    reverse_map = {}
-    for standard_name, aliases in alias_map.items():
-        for alias in aliases:
-            reverse_map[alias] = standard_name
+    """
+    Rename vendor headers to canonical field names
     
-    # Rename columns
-    rename_dict = {}
-    for col in df.columns:
-        if col in reverse_map:
-            rename_dict[col] = reverse_map[col]
+    Headers resolve through a compiled HeaderResolver (normalized-key index,
+    cached fuzzy fallback). A request-supplied alias_map replaces the
+    default vendor_alias_map.json.
+    """
+    rename_dict = resolver_for(alias_map).rename_map(df.columns)
     
     if rename_dict:
-        df = df.rename(columns=rename_dict)
+        df.rename(columns=rename_dict, inplace=True)
         print(f"  ✓ Mapped {len(rename_dict)} column aliases")
     
     return df
 
 # ==================== CHUNKED PROCESSING ====================
 
-def process_file_in_chunks(file_path: Path, chunk_rows: int, job_id: str) -> Dict[str, Any]:
-    """Process large CSV file in chunks"""
+def process_file_in_chunks(file_path: Path, chunk_rows: int, job_id: str,
+                           today: datetime = None, alias_map: Dict[str, List[str]] = None,
+                           fingerprint: Optional[SchemaFingerprint] = None,
+                           read_kwargs: Optional[Dict[str, Any]] = None,
+                           spills: Optional[Dict[str, FeedSpill]] = None,
+                           profile: Optional[ReadProfile] = None) -> Dict[str, Any]:
+    """
+    Process large CSV file in chunks, normalizing and scoring each chunk once
+    
+    Each chunk's rows are routed to their feeds and appended to the feed's
+    spill (<job_id>_<feed>_output.csv, plus a report sample and health
+    partial for its PDF), so counts, progress and outputs all come from
+    this one pass and the file is never held in memory whole.
+    
+    The health check is built from per-chunk partials, and every chunk is
+    checked against the persistent duplicate index (within this job and
+    against previously ingested files); each output row carries the
+    Duplicate_Within_Job / Duplicate_Previously_Ingested flags. The job's keys join the index once
+    all chunks succeed. Rows failing the quarantine rules are written to
+    <job_id>_quarantine.csv with their reason codes and are not scored.
+    
+    With a cached schema fingerprint the chunks are read typed and
+    projected, renamed from the stored mapping and routed to the stored
+    feed; SchemaDrift is raised when a chunk no longer fits the dtypes.
+    Without one, read_kwargs (e.g. a read_plan) shape the read.
+    
+    Args:
+        spills: Optional dict filled with feed -> FeedSpill (closed on return)
+        profile: Optional ReadProfile every raw chunk is folded into
+    """
+    
+    # One loan-age reference date for every chunk of the job
+    if today is None:
+        today = datetime.now()
     
     results = {
         "total_rows": 0,
         "processed_rows": 0,
         "failed_rows": 0,
-        "feeds": {}
+        "feeds": {},
+        "duplicates": {},
+        "quarantine": {"rows": 0, "reasons": {}}
     }
+    health = HealthPartial()
+    dedupe = DuplicateIndex().session(job_id)
+    quarantine_csv = OUTPUT_DIR / f"{job_id}_quarantine.csv"
     
     try:
         # Read CSV in chunks
-        chunk_iterator = pd.read_csv(file_path, chunksize=chunk_rows, encoding='utf-8-sig')
+        if fingerprint is not None:
+            chunk_iterator = typed_chunks(iter_csv(file_path, chunk_rows, encoding='utf-8-sig',
+                                                   **fingerprint.read_kwargs()))
+        else:
+            chunk_iterator = iter_csv(file_path, chunk_rows, encoding='utf-8-sig', **(read_kwargs or {}))
         
         for i, chunk in enumerate(chunk_iterator):
             print(f"  → Processing chunk {i+1} ({len(chunk)} rows)...")
             
             results["total_rows"] += len(chunk)
+            if profile is not None:
+                profile.add(chunk)
             
             # Apply alias mapping
-            chunk = apply_alias_mapping(chunk)
+            if fingerprint is not None:
+                chunk.rename(columns=fingerprint.rename, inplace=True)
+            else:
+                chunk = apply_alias_mapping(chunk, alias_map)
             
             # Apply DNC filter
             chunk = apply_dnc_filter(chunk)
             
-            # Normalize and score
-            chunk = normalize_and_score(chunk)
+            # Quarantine rows failing the validation rules (parsed arrays are reused for scoring)
+            parsed = parse_sources(chunk)
+            chunk, quarantined = quarantine_rows(chunk, parsed)
+            if len(quarantined):
+                first = results["quarantine"]["rows"] == 0
+                quarantined.to_csv(quarantine_csv, mode='w' if first else 'a', header=first,
+                                   index=False, encoding='utf-8-sig')
+                results["quarantine"]["rows"] += len(quarantined)
+                merge_counts(results["quarantine"]["reasons"], reason_counts(quarantined))
+            
+            # Flag duplicates (earlier chunks of this job, earlier jobs)
+            duplicates = dedupe.check(chunk)
+            results["duplicates"] = dict(dedupe.counts)
             
-            # Detect feed type
-            feed_type = detect_feed_type(data=chunk)
+            # Normalize and score (the duplicate flags go out with every row)
+            sources = {}
+            chunk = normalize_and_score(chunk, today=today, sources=sources, parsed=parsed)
+            for name, flags in duplicates.items():
+                chunk[FLAG_COLUMNS[name]] = flags
             
-            # Track feed counts
-            if feed_type not in results["feeds"]:
-                results["feeds"][feed_type] = 0
-            results["feeds"][feed_type] += len(chunk)
+            # Route rows to feeds (a feed_type column decides per row, otherwise the header decides)
+            if fingerprint is not None and fingerprint.feed:
+                routes = {fingerprint.feed: None}
+            else:
+                routes = feed_groups(chunk)
+                if len(routes) == 1:  # single-feed chunk: no need to split
+                    routes = {feed_type: None for feed_type in routes}
+                elif not routes:
+                    routes = {detect_feed_type(data=chunk): None}
+            
+            for feed_type, positions in routes.items():
+                rows = chunk if positions is None else chunk.iloc[positions]
+                rows_sources = sources if positions is None else {name: np.asarray(values)[positions]
+                                                                  for name, values in sources.items()}
+                partial = health_partial(rows, rows_sources)
+                health.merge(partial)
+                
+                # Spill the feed's rows
+                if spills is not None:
+                    if feed_type not in spills:
+                        spills[feed_type] = FeedSpill(OUTPUT_DIR / f"{job_id}_{feed_type}_output.csv")
+                    spills[feed_type].add(rows, partial)
+                
+                # Track feed counts
+                if feed_type not in results["feeds"]:
+                    results["feeds"][feed_type] = 0
+                results["feeds"][feed_type] += len(rows)
             
             results["processed_rows"] += len(chunk)
             
@@ -520,17 +608,277 @@ def process_file_in_chunks(file_path: Path, chunk_rows: int, job_id: str) -> Dic
             JOBS[job_id]["counts"] = results
             JOBS[job_id]["progress"] = (results["processed_rows"] / results["total_rows"]) * 100
         
+        JOBS[job_id]["health"] = health_report(health)
+        dedupe.commit()
+        print(f"  ✓ Duplicates: {dedupe.counts['within_job']} within job, "
+              f"{dedupe.counts['previously_ingested']} previously ingested")
+        if results["quarantine"]["rows"]:
+            results["quarantine"]["csv"] = str(quarantine_csv)
+            print(f"  ⚠ Quarantined {results['quarantine']['rows']} rows → {quarantine_csv.name}")
         return results
         
+    except SchemaDrift:
+        raise  # process_job rediscovers the layout and starts over
     except Exception as e:
         print(f"  ✗ Chunk processing error: {e}")
         results["failed_rows"] = results["total_rows"] - results["processed_rows"]
         raise
+    finally:
+        for spill in (spills or {}).values():
+            spill.close()
+
+# ==================== BATCH CALCULATE ====================
+
+CALCULATE_FIELDS = ["loan", "value", "loan_date", "equity_delta"]
+
+# Item types a numeric field may arrive as (JSON numbers, CSV/JSON strings); bool is not a number here
+NUMBER_TYPES = [int, float, str]
+
+# loan_date is accepted as an ISO calendar date string only
+LOAN_DATE_PATTERN = r'\d{4}-\d{2}-\d{2}'
+LOAN_DATE_ERROR = "'loan_date' must be an ISO date (YYYY-MM-DD)"
+
+# Request Content-Type -> body format (anything else is read as JSON)
+BATCH_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson"
+}
+
+BATCH_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+def parse_batch_body(body: bytes, body_format: str) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Parse a batch /v1/calculate body into one row per property
+    
+    Args:
+        body: Raw request body
+        body_format: 'json' (array of objects), 'ndjson' or 'csv'
+    
+    Returns:
+        (DataFrame of CALCULATE_FIELDS as objects, per-item parse error array)
+    """
+    if body_format == "csv":
+        try:
+            frame = pd.read_csv(io.BytesIO(body), dtype=str, keep_default_na=False, encoding='utf-8-sig')
+        except pd.errors.EmptyDataError:
+            frame = pd.DataFrame(columns=CALCULATE_FIELDS)
+        except pd.errors.ParserError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid CSV body: {e}")
+        frame = frame.reindex(columns=CALCULATE_FIELDS).astype(object)
+        return frame, np.full(len(frame), None, dtype=object)
+    
+    if body_format == "ndjson":
+        items = []
+        for line in body.decode('utf-8-sig').splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                items.append(None)
+    else:
+        try:
+            items = json.loads(body or b"[]")
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of properties")
+    
+    errors = np.array([None if isinstance(item, dict) else "Item is not a JSON object" for item in items], dtype=object)
+    records = [item if isinstance(item, dict) else {} for item in items]
+    frame = pd.DataFrame.from_records(records, columns=CALCULATE_FIELDS).astype(object)
+    return frame, errors
+
+def _blank(values: pd.Series) -> np.ndarray:
+    """Missing or empty-string cells"""
+    return (values.isna() | (values.astype(str).str.strip() == "")).to_numpy()
+
+def validate_batch(frame: pd.DataFrame, errors: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Column-wise validation of batch properties
+    
+    The first problem found for an item is recorded in `errors` (in place);
+    the other items are unaffected. Numbers must be JSON numbers or numeric
+    strings (true/false, lists and objects are rejected), and loan_date a
+    YYYY-MM-DD string.
+    
+    Returns:
+        Dict of parsed columns (loan, value, equity_delta as float64,
+        loan_date as datetime64)
+    """
+    def flag(bad: np.ndarray, message: str):
+        errors[bad & (errors == None)] = message  # noqa: E711 - element-wise
+    
+    parsed = {}
+    for field, required in (("loan", True), ("value", True), ("equity_delta", False)):
+        blank = _blank(frame[field])
+        numeric = frame[field].map(type).isin(NUMBER_TYPES).to_numpy()
+        values = pd.to_numeric(frame[field].where(~blank & numeric), errors='coerce').to_numpy(dtype=np.float64)
+        if required:
+            flag(blank, f"'{field}' is required")
+        flag(~blank & ~np.isfinite(values), f"'{field}' must be a number")
+        parsed[field] = np.where(blank, 0.0, values) if not required else values
+    
+    blank = _blank(frame["loan_date"])
+    text = frame["loan_date"].where(~blank & frame["loan_date"].map(type).eq(str).to_numpy()).str.strip()
+    iso = text.str.fullmatch(LOAN_DATE_PATTERN, na=False)
+    dates = pd.to_datetime(text.where(iso), format='%Y-%m-%d', errors='coerce').to_numpy()
+    flag(~blank & np.isnat(dates), LOAN_DATE_ERROR)
+    parsed["loan_date"] = dates
+    
+    return parsed
+
+def valid_loan_date(loan_date: str) -> bool:
+    """validate_batch's loan_date rule for one value: a YYYY-MM-DD string that is a real date"""
+    if not re.fullmatch(LOAN_DATE_PATTERN, loan_date):
+        return False
+    try:
+        datetime.fromisoformat(loan_date)
+    except ValueError:
+        return False
+    return True
+
+def stream_batch_results(results: Dict[str, np.ndarray], errors: np.ndarray,
+                         body_format: str) -> Iterator[str]:
+    """
+    Serialize batch results in request order, CALCULATE_STREAM_ROWS items at a time
+    
+    Every item carries its request index; failed items carry `error`
+    instead of metrics.
+    """
+    n = len(errors)
+    fields = metrics.PROPERTY_METRICS
+    
+    if body_format == "csv":
+        yield ",".join(["index"] + fields + ["error"]) + "\n"
+    elif body_format == "json":
+        yield "["
+    
+    for start in range(0, n, CALCULATE_STREAM_ROWS):
+        end = min(n, start + CALCULATE_STREAM_ROWS)
+        columns = [results[field][start:end].tolist() for field in fields]
+        rows = [
+            (start + offset, [column[offset] for column in columns], error)
+            for offset, error in enumerate(errors[start:end].tolist())
+        ]
+        
+        if body_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            for index, values, error in rows:
+                writer.writerow([index] + ([""] * len(fields) if error else values) + [error or ""])
+            yield buffer.getvalue()
+            continue
+        
+        items = [
+            json.dumps({"index": index, "error": error} if error else {"index": index, **dict(zip(fields, values))})
+            for index, values, error in rows
+        ]
+        if body_format == "json":
+            yield ("," if start else "") + ",".join(items)
+        else:
+            yield "".join(item + "\n" for item in items)
+    
+    if body_format == "json":
+        yield "]"
+
+# ==================== INGEST PREVIEW ====================
+
+PREVIEW_MODES = ["head", "stratified"]
+
+# Bytes per read while streaming a sample range off the network
+PREVIEW_READ_BYTES = 64 << 10
+
+def url_range_reader(file_url: str) -> tuple:
+    """
+    Byte-range reads of a remote file
+    
+    Returns:
+        (read_range(offset, length) -> bytes, total size or None when the
+        server doesn't advertise byte ranges - only the head can be sampled then)
+    """
+    head = requests.head(file_url, timeout=10, allow_redirects=True)
+    size = head.headers.get("Content-Length")
+    ranges = head.ok and head.headers.get("Accept-Ranges", "").lower() == "bytes" and size is not None
+    
+    def read_range(offset: int, length: int) -> bytes:
+        headers = {"Range": f"bytes={offset}-{offset + length - 1}"}
+        with requests.get(file_url, headers=headers, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                raise ValueError("Server ignored the byte range request")
+            data = bytearray()
+            # A server that ignores Range sends the whole file: stop at `length`
+            for block in response.iter_content(PREVIEW_READ_BYTES):
+                data += block
+                if len(data) >= length:
+                    break
+            return bytes(data[:length])
+    
+    return read_range, int(size) if ranges else None
+
+def upload_range_reader(upload: UploadFile) -> tuple:
+    """Byte-range reads of an uploaded file: (read_range, total size)"""
+    handle = upload.file
+    
+    def read_range(offset: int, length: int) -> bytes:
+        handle.seek(offset)
+        return handle.read(length)
+    
+    handle.seek(0, io.SEEK_END)
+    return read_range, handle.tell()
+
+def preview_sample(data: bytes, schema_version: str, rows: int) -> Dict[str, Any]:
+    """
+    Run the ingest steps on a sampled CSV
+    
+    Schema validation, alias mapping, DNC filter, quarantine rules,
+    normalize/score, the health check and feed detection, in the order an
+    ingest job runs them - on the sample only, so health figures are
+    approximate.
+    
+    Returns:
+        Dict with schema, feed, quarantine, health and the first `rows` scored rows
+    """
+    df = pd.read_csv(io.BytesIO(data), encoding='utf-8-sig', on_bad_lines='skip')
+    valid, message = validate_schema(df, schema_version)
+    renames = resolver_for().rename_map(df.columns)
+    columns = {col: renames.get(col, col) for col in df.columns}
+    df = apply_alias_mapping(df)
+    df = apply_dnc_filter(df)
+    
+    parsed = parse_sources(df)
+    df, quarantined = quarantine_rows(df, parsed)
+    sources = {}
+    df = normalize_and_score(df, sources=sources, parsed=parsed)
+    health = sample_health_check(df, sources)
+    feed_type = detect_feed_type(data=df)
+    
+    return {
+        "schema": {
+            "valid": valid,
+            "message": message,
+            "columns": columns
+        },
+        "feed": feed_type,
+        "quarantine": {"rows": len(quarantined), "reasons": reason_counts(quarantined)},
+        "health": health,
+        "sample_rows": len(df) + len(quarantined),
+        # to_json turns NaN/NaT and numpy scalars into plain JSON values
+        "rows": json.loads(df.head(rows).to_json(orient="records", date_format="iso"))
+    }
 
 # ==================== BACKGROUND JOB PROCESSING ====================
 
 async def process_job(job_id: str, file_url: str, market: str, schema_version: str, 
-                     alias_map: Dict, chunk_rows: int):
+                     alias_map: Optional[Dict], chunk_rows: int):
     """Background task to process ingestion job"""
     
     try:
@@ -549,45 +897,68 @@ async def process_job(job_id: str, file_url: str, market: str, schema_version: s
         temp_file.write_bytes(response.content)
         print(f"  ✓ Downloaded {len(response.content)} bytes")
         
-        # Validate schema
-        df_sample = pd.read_csv(temp_file, nrows=5)
-        valid, message = validate_schema(df_sample, schema_version)
-        if not valid:
-            raise ValueError(message)
-        print(f"  ✓ Schema validation passed")
+        # Known header layout: skip validation and discovery
+        schema_cache = SchemaCache()
+        header = read_csv(temp_file, nrows=0, encoding='utf-8-sig')
+        fingerprint = schema_cache.lookup(header.columns, alias_map, schema_version)
+        if fingerprint is not None:
+            fingerprint.seed_date_formats()
+            print(f"  ✓ Known vendor layout {fingerprint.key} - using cached schema")
+        else:
+            # Validate schema
+            valid, message = validate_schema(header, schema_version, alias_map)
+            if not valid:
+                raise ValueError(message)
+            print(f"  ✓ Schema validation passed")
         
-        # Process in chunks
+        # New layouts are read projected to the columns their feed outputs (any feed's, with a feed_type column)
+        plan = read_plan(header.columns, header_feed(header.columns), alias_map)
+        
+        # Process in chunks (single pass: each feed's CSV is written as its chunks are scored)
         print(f"  → Processing file (chunk_rows={chunk_rows})...")
-        results = process_file_in_chunks(temp_file, chunk_rows, job_id)
+        run_date = datetime.now()
+        spills = {}
+        profile = ReadProfile() if fingerprint is None else None
+        try:
+            results = process_file_in_chunks(temp_file, chunk_rows, job_id, today=run_date,
+                                             alias_map=alias_map, fingerprint=fingerprint, read_kwargs=plan,
+                                             spills=spills, profile=profile)
+        except SchemaDrift as e:
+            print(f"  ⚠ Vendor layout {fingerprint.key} no longer fits its cached dtypes ({e}) - rediscovering")
+            schema_cache.evict(fingerprint.key)
+            fingerprint = None
+            valid, message = validate_schema(header, schema_version, alias_map)
+            if not valid:
+                raise ValueError(message)
+            spills = {}
+            profile = ReadProfile()
+            results = process_file_in_chunks(temp_file, chunk_rows, job_id, today=run_date,
+                                             alias_map=alias_map, read_kwargs=plan,
+                                             spills=spills, profile=profile)
         
-        # Load full processed data
-        df = pd.read_csv(temp_file, encoding='utf-8-sig')
-        df = apply_alias_mapping(df, alias_map)
-        df = apply_dnc_filter(df)
-        df = normalize_and_score(df)
+        # Remember this layout's discovery for the next file with the same header
+        if fingerprint is None:
+            fingerprint = learn_fingerprint(header.columns, profile, schema_version, alias_map)
+            schema_cache.store(fingerprint)
+            print(f"  ✓ Cached vendor layout {fingerprint.key} "
+                  f"({len(fingerprint.usecols)} of {len(fingerprint.columns)} columns read)")
         
-        # Generate outputs per feed
+        # Render each feed's PDF from its report sample (medians and cover counts from the full feed)
         print(f"  → Generating outputs per feed...")
         feed_outputs = {}
         
-        for feed_type, count in results["feeds"].items():
-            feed_df = df[df.apply(lambda row: detect_feed_type(data=pd.DataFrame([row])) == feed_type, axis=1)]
-            
-            # Save feed CSV
-            feed_csv = OUTPUT_DIR / f"{job_id}_{feed_type}_output.csv"
-            feed_df.to_csv(feed_csv, index=False, encoding='utf-8-sig')
-            
-            # Generate PDF
+        for feed_type, spill in spills.items():
             feed_pdf = OUTPUT_DIR / f"{job_id}_{feed_type}_report.pdf"
-            render_pdf(feed_df, feed_pdf, market_name=market, quarter=4, year=2025)
+            render_pdf(apply_dtype_plan(spill.sample.frame()), feed_pdf, market_name=market,
+                       quarter=4, year=2025, sketches=spill.health.sketches, counts=spill.health.counts)
             
             feed_outputs[feed_type] = {
-                "csv": str(feed_csv),
+                "csv": str(spill.out_path),
                 "pdf": str(feed_pdf),
-                "count": count
+                "count": spill.rows
             }
             
-            print(f"    ✓ {feed_type}: {count} rows → CSV + PDF")
+            print(f"    ✓ {feed_type}: {spill.rows} rows → CSV + PDF")
         
         # Update job status
         JOBS[job_id]["status"] = JobStatus.COMPLETED
@@ -652,6 +1023,7 @@ async def ingest_file(request: IngestRequest, background_tasks: BackgroundTasks)
         "created_at": datetime.now().isoformat(),
         "counts": None,
         "outputs": None,
+        "health": None,
         "error": None,
         "progress": 0
     }
@@ -663,12 +1035,75 @@ async def ingest_file(request: IngestRequest, background_tasks: BackgroundTasks)
         str(request.file_url),
         request.market,
         request.schema_version,
-        request.alias_map or DEFAULT_ALIAS_MAP,
+        request.alias_map,
         request.chunk_rows
     )
     
     return {"job_id": job_id}
 
+@app.post("/ingest/preview")
+async def preview_ingest(
+    file_url: Optional[str] = Query(None, description="CSV URL (use this or a multipart 'file')"),
+    file: Optional[UploadFile] = File(None, description="Uploaded CSV"),
+    schema_version: str = Query("v2.0"),
+    sample_kb: int = Query(PREVIEW_SAMPLE_KB, ge=1, le=64 * 1024, description="Bytes sampled, in KB"),
+    mode: str = Query("head", description="head (first sample_kb) or stratified (byte ranges across the file)"),
+    rows: int = Query(PREVIEW_ROWS, ge=0, le=1000, description="Scored rows returned")
+):
+    """
+    Preview an ingest from a small sample of the file
+    
+    Reads only `sample_kb` of the file - its head, or PREVIEW_STRATA evenly
+    spaced byte ranges - and runs schema validation, alias mapping, feed
+    detection, quarantine rules, scoring and the health check on it, so an
+    operator can check a multi-GB file before submitting it to /ingest.
+    Stratified mode falls back to the head when the server doesn't support
+    byte ranges.
+    
+    Returns:
+        {
+            "sample": {"mode": "stratified", "bytes": 262144, "total_bytes": 5368709120,
+                       "rows": 2950, "estimated_total_rows": 60416000},
+            "schema": {"valid": true, "message": "Schema valid", "columns": {"EstValue": "property_value", ...}},
+            "feed": "core_equity",
+            "quarantine": {"rows": 12, "reasons": {"ZIP_INVALID": 12}},
+            "health": {...18 checks on the sample...},
+            "rows": [{...scored row...}, ...]
+        }
+    """
+    if (file_url is None) == (file is None):
+        raise HTTPException(status_code=400, detail="Provide either file_url or a file upload")
+    if mode not in PREVIEW_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode: {mode} (expected one of {', '.join(PREVIEW_MODES)})")
+    
+    def sample():
+        try:
+            read_range, total_bytes = url_range_reader(file_url) if file_url else upload_range_reader(file)
+            strata = PREVIEW_STRATA if mode == "stratified" and total_bytes is not None else 1
+            data = sample_csv_bytes(read_range, sample_kb * 1024, total_bytes, strata)
+        except (requests.RequestException, ValueError) as e:
+            raise HTTPException(status_code=502, detail=f"Could not read the file: {e}")
+        try:
+            preview = preview_sample(data, schema_version, rows)
+        except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid CSV sample: {e}")
+        
+        sample_rows = preview.pop("sample_rows")
+        estimate = round(total_bytes * sample_rows / len(data)) if total_bytes and data else None
+        return {
+            "sample": {
+                "mode": "stratified" if strata > 1 else "head",
+                "bytes": len(data),
+                "total_bytes": total_bytes,
+                "rows": sample_rows,
+                "estimated_total_rows": estimate
+            },
+            **preview
+        }
+    
+    # Network reads and scoring are blocking: keep them off the event loop
+    return await run_in_threadpool(sample)
+
 @app.get("/job/{job_id}")
 def get_job_status(job_id: str):
     """
@@ -699,6 +1134,7 @@ def get_job_status(job_id: str):
         "completed_at": job.get("completed_at"),
         "progress": job.get("progress", 0),
         "counts": job.get("counts"),
+        "health": job.get("health"),
         "error": job.get("error")
     }
 
@@ -770,6 +1206,75 @@ def get_report(
     else:
         raise HTTPException(status_code=400, detail="Only PDF format supported")
 
+@app.post("/v1/calculate")
+def calculate_metrics(
+    loan: float = Query(..., description="Total loan balance"),
+    value: float = Query(..., description="Property value"),
+    loan_date: Optional[str] = Query(None, description="Last loan date (ISO format)"),
+    equity_delta: float = Query(0, description="Equity change over 90 days")
+):
+    """
+    Calculate APS metrics for a single property (low-latency path)
+    
+    loan_date follows the batch rule: blank means no date, anything but a
+    YYYY-MM-DD date is rejected with a 422.
+    
+    Returns:
+        Calculated metrics: ltv, equity_pct, aps_score, churn_index, etc.
+    
+    Example:
+        POST /v1/calculate?loan=200000&value=400000&equity_delta=5000
+    """
+    loan_date = (loan_date or "").strip() or None
+    if loan_date is not None and not valid_loan_date(loan_date):
+        raise HTTPException(status_code=422, detail=LOAN_DATE_ERROR)
+    return metrics.score_property(loan, value, loan_date, equity_delta)
+
+@app.post("/v1/calculate/batch")
+async def calculate_batch(request: Request):
+    """
+    Calculate APS metrics for many properties in one request
+    
+    The body format follows Content-Type, and results come back in the same format:
+    - application/json: [{"loan": 200000, "value": 400000, "loan_date": "2023-01-15", "equity_delta": 5000}, ...]
+    - application/x-ndjson: one property object per line
+    - text/csv: header row loan,value,loan_date,equity_delta
+    
+    Up to CALCULATE_BATCH_MAX properties per request. An invalid property
+    doesn't fail the batch: its result carries an "error" instead of metrics.
+    
+    Returns:
+        Results streamed in request order, e.g.
+        [
+            {"index": 0, "ltv": 50.0, "equity_pct": 50.0, ..., "velocity": 1.0},
+            {"index": 1, "error": "'value' is required"}
+        ]
+    """
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+    body_format = BATCH_FORMATS.get(content_type, "json")
+    body = await request.body()
+    
+    def score():
+        frame, errors = parse_batch_body(body, body_format)
+        if len(frame) > CALCULATE_BATCH_MAX:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch of {len(frame):,} properties exceeds the {CALCULATE_BATCH_MAX:,} limit"
+            )
+        parsed = validate_batch(frame, errors)
+        results = metrics.calculate_property_metrics(
+            parsed["loan"], parsed["value"], parsed["loan_date"], parsed["equity_delta"]
+        )
+        return results, errors
+    
+    # Parsing and scoring are CPU-bound: keep them off the event loop
+    results, errors = await run_in_threadpool(score)
+    
+    return StreamingResponse(
+        stream_batch_results(results, errors, body_format),
+        media_type=BATCH_MEDIA_TYPES[body_format]
+    )
+
 # ==================== LEGACY ENDPOINTS (Backward Compatibility) ====================
 
 @app.get("/v1/pulse")
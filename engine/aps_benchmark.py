@@ -0,0 +1,1116 @@
+# aps_benchmark.py - APS Engine Performance Benchmarks
+"""
+Benchmarks for the APS engine hot paths on synthetic vendor data
+
+Usage:
+    py -m engine.aps_benchmark scoring
+    py -m engine.aps_benchmark scoring --rows 10000 100000 1000000
+    py -m engine.aps_benchmark money
+    py -m engine.aps_benchmark dates
+    py -m engine.aps_benchmark parallel --workers 8
+    py -m engine.aps_benchmark memory
+    py -m engine.aps_benchmark dtypes
+    py -m engine.aps_benchmark reader
+    py -m engine.aps_benchmark models
+    py -m engine.aps_benchmark metrics
+    py -m engine.aps_benchmark lookup
+    py -m engine.aps_benchmark latency
+    py -m engine.aps_benchmark health
+    py -m engine.aps_benchmark sketch
+    py -m engine.aps_benchmark dedupe
+    py -m engine.aps_benchmark quarantine
+    py -m engine.aps_benchmark preview
+    py -m engine.aps_benchmark aliases
+    py -m engine.aps_benchmark fingerprint
+    py -m engine.aps_benchmark projection
+    py -m engine.aps_benchmark ingest
+    py -m engine.aps_benchmark routing
+    py -m engine.aps_benchmark all
+"""
+
+import argparse
+import math
+import multiprocessing
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource  # POSIX only - peak RSS is skipped on Windows
+except ImportError:
+    resource = None
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from engine.aps_scoring import calculate_aps_score, assign_tier, calculate_cci, py_round, SCORE_COLUMNS
+from engine.aps_config import MODELS_DIR
+from engine.aps_models import evaluate_models, compile_model
+from engine import aps_metrics
+from engine.aps_parsers import parse_money, parse_dates, header_signature, DATE_FORMAT_CACHE
+from engine.aps_normalize import normalize_and_score, parse_sources
+from engine.aps_healthcheck import HealthPartial, health_check, health_partial, health_report
+from engine.aps_sketch import DEFAULT_EXACT_LIMIT, QuantileSketch, column_median
+from engine.aps_dedupe import DuplicateIndex, record_keys
+from engine.aps_quarantine import load_rules, quarantine_rows, reason_counts
+from engine.aps_aliases import HeaderResolver, load_alias_map, RESOLVER_CACHE
+from engine.aps_schema import ReadProfile, SchemaCache, learn_fingerprint, read_plan
+from engine.aps_feed_config import FEED_TYPES, detect_feed_type, feed_groups
+from engine.aps_dtypes import widen
+from engine.aps_parallel import normalize_and_score_parallel, resolve_workers
+from engine.aps_dtypes import apply_dtype_plan, bytes_per_row
+from engine.aps_io import read_csv, resolve_engine, sample_csv_bytes
+from engine.aps_config import PREVIEW_SAMPLE_KB, PREVIEW_STRATA
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+
+# ==================== SYNTHETIC DATA ====================
+
+def make_vendor_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate a raw vendor frame shaped like input/test_feeds/*.csv
+
+    Args:
+        rows: Number of records
+        seed: Random seed
+
+    Returns:
+        DataFrame with raw vendor columns (dates as MM/DD/YYYY strings)
+    """
+    rng = np.random.default_rng(seed)
+    ids = pd.Series(np.arange(rows)).astype(str)
+
+    values = rng.integers(150_000, 1_200_000, rows)
+    balances = (values * rng.uniform(0.05, 0.95, rows)).astype(np.int64)
+    days_ago = rng.integers(0, 25 * 365, rows)
+    loan_dates = pd.Timestamp('2025-10-01') - pd.to_timedelta(days_ago, unit='D')
+
+    return pd.DataFrame({
+        'Owner Name': 'Owner ' + ids,
+        'Mail Address': ids + ' Test St',
+        'Property Address': ids + ' Main St',
+        'City': rng.choice(['Raleigh', 'Cary', 'Durham'], rows),
+        'State': 'NC',
+        'ZIP': rng.choice([27601, 27609, 27613, 27519, 27701], rows),
+        'EstValue': values,
+        'TotalLoanBal': balances,
+        'LastLoanDate': pd.Series(loan_dates).dt.strftime('%m/%d/%Y'),
+        'feed_type': 'core_equity'
+    })
+
+def make_wide_vendor_frame(rows: int, extra_columns: int = 40, seed: int = 42) -> pd.DataFrame:
+    """
+    make_vendor_frame plus vendor columns no feed outputs (a typical full export)
+
+    Args:
+        rows: Number of records
+        extra_columns: Unused text/number columns appended
+        seed: Random seed
+
+    Returns:
+        DataFrame with raw vendor columns
+    """
+    rng = np.random.default_rng(seed)
+    df = make_vendor_frame(rows, seed)
+    # Leading-zero ZIPs, which an inferred int64 read turns into 4 digits
+    df['ZIP'] = rng.choice(['02134', '07030', '27601', '27609'], rows)
+    extras = {}
+    for i in range(extra_columns):
+        if i % 2:
+            extras[f'Vendor Code {i}'] = rng.choice(['A1', 'B2', 'C3', 'D4'], rows)
+        else:
+            extras[f'Vendor Metric {i}'] = rng.integers(0, 10_000, rows)
+    return pd.concat([df, pd.DataFrame(extras)], axis=1)
+
+def make_score_inputs(rows: int, seed: int = 42) -> dict:
+    """Generate the normalized columns the scoring kernel consumes"""
+    rng = np.random.default_rng(seed)
+    ltv = np.round(rng.uniform(0, 100, rows), 2)
+    equity = np.round(100 - ltv, 2)
+    values = rng.integers(150_000, 1_200_000, rows).astype(np.float64)
+
+    return {
+        'Equity %': equity,
+        'LTV %': ltv,
+        'Equity_Dollars': np.round(values * (equity / 100), 0),
+        'Loan_Age_Mo': rng.integers(0, 300, rows)
+    }
+
+# ==================== TIMING ====================
+
+def time_call(fn, repeat: int = 3) -> float:
+    """Best wall-clock time of `repeat` calls, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def print_row(label: str, rows: int, seconds: float):
+    """Print one benchmark result line"""
+    rate = rows / seconds if seconds > 0 else float('inf')
+    print(f"  {label:<34} {rows:>10,} rows  {seconds * 1000:>10.1f} ms  {rate:>14,.0f} rows/sec")
+
+# ==================== BENCHMARKS ====================
+
+def legacy_score_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Row-wise reference: the three df.apply(axis=1) passes"""
+    out = pd.DataFrame(index=df.index)
+    out['APS_Score (v2.0)'] = df.apply(
+        lambda r: calculate_aps_score(r['Equity %'], r['Loan_Age_Mo'], r['LTV %']), axis=1)
+    tier_input = df.assign(**{'APS_Score (v2.0)': out['APS_Score (v2.0)']})
+    out['APS_Tier'] = tier_input.apply(
+        lambda r: assign_tier(r['APS_Score (v2.0)'], r['LTV %'], r['Equity_Dollars']), axis=1)
+    out['CCI'] = df.apply(
+        lambda r: calculate_cci(r['Equity %'], r['LTV %'], r['Loan_Age_Mo']), axis=1)
+    return out
+
+def bench_scoring(rows_list, legacy_max: int):
+    """Compiled aps-v2.0 model vs. row-wise apply"""
+    print("=" * 80)
+    print("APS v2.0 SCORING KERNEL (score, tier, CCI)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        inputs = make_score_inputs(rows)
+
+        seconds = time_call(lambda: evaluate_models([inputs], rows, ['aps-v2.0']))
+        print_row('compiled model (aps-v2.0)', rows, seconds)
+
+        if rows <= legacy_max:
+            # normalize_and_score rows are mixed-dtype (object), so round() sees Python floats
+            frame = pd.DataFrame(inputs).astype(object)
+            legacy = legacy_score_frame(frame)
+            seconds = time_call(lambda: legacy_score_frame(frame), repeat=1)
+            print_row('row-wise apply', rows, seconds)
+
+            scores = evaluate_models([inputs], rows, ['aps-v2.0'])
+            for col in SCORE_COLUMNS:
+                if not np.array_equal(legacy[col].to_numpy(), scores[col]):
+                    raise AssertionError(f"{col} differs from row-wise reference at {rows} rows")
+            print(f"  ✓ identical output at {rows:,} rows")
+
+def legacy_parse_money(series: pd.Series) -> pd.Series:
+    """Reference: the replace/strip/to_numeric chain normalize_and_score used"""
+    return pd.to_numeric(series.astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
+
+def bench_money(rows_list, legacy_max: int):
+    """Money parser vs. the replace/strip/to_numeric chain"""
+    print("=" * 80)
+    print("MONEY PARSER (EstValue / TotalLoanBal)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        values = make_vendor_frame(rows)['EstValue']
+        formats = {
+            'numeric dtype': values,
+            'plain strings': values.astype(str),
+            'vendor "$1,234"': values.map('${:,}'.format),
+            'vendor "$1,234.56"': (values / 7).map('${:,.2f}'.format)
+        }
+
+        for label, column in formats.items():
+            seconds = time_call(lambda: parse_money(column))
+            print_row(f'parse_money {label}', rows, seconds)
+
+            if rows <= legacy_max:
+                seconds = time_call(lambda: legacy_parse_money(column))
+                print_row(f'legacy chain {label}', rows, seconds)
+
+                expected = legacy_parse_money(column).to_numpy(dtype=np.float64)
+                if not np.array_equal(expected, parse_money(column), equal_nan=True):
+                    raise AssertionError(f"parse_money differs from legacy chain ({label})")
+        print()
+
+def bench_dates(rows_list, legacy_max: int):
+    """Cached-format date parsing vs. per-element format inference"""
+    print("=" * 80)
+    print("LOAN DATE PARSING (LastLoanDate)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        df = make_vendor_frame(rows)
+        dates = df['LastLoanDate']
+        signature = header_signature(df.columns)
+
+        def cold():
+            DATE_FORMAT_CACHE.clear()
+            return parse_dates(dates, signature, 'LastLoanDate')
+
+        seconds = time_call(cold)
+        print_row('parse_dates (detect format)', rows, seconds)
+        seconds = time_call(lambda: parse_dates(dates, signature, 'LastLoanDate'))
+        print_row('parse_dates (cached format)', rows, seconds)
+
+        if rows <= legacy_max:
+            seconds = time_call(lambda: pd.to_datetime(dates, errors='coerce'))
+            print_row('pd.to_datetime (no format)', rows, seconds)
+
+            expected = pd.to_datetime(dates, errors='coerce').to_numpy(dtype='datetime64[ns]')
+            if not np.array_equal(expected, parse_dates(dates, signature, 'LastLoanDate').to_numpy()):
+                raise AssertionError("parse_dates differs from pd.to_datetime")
+        print()
+
+def bench_parallel(rows_list, legacy_max: int, workers: int = None):
+    """Process-pool normalize_and_score vs. a single process"""
+    workers = resolve_workers(workers)
+    print("=" * 80)
+    print(f"PARALLEL NORMALIZE & SCORE ({workers} workers)")
+    print("=" * 80)
+
+    today = datetime.now()
+    for rows in rows_list:
+        df = make_vendor_frame(rows)
+
+        seconds = time_call(lambda: normalize_and_score(df.copy(), today=today), repeat=1)
+        print_row('single process', rows, seconds)
+        seconds = time_call(lambda: normalize_and_score_parallel(df.copy(), today=today,
+                                                                 workers=workers, min_rows=0), repeat=1)
+        print_row(f'process pool ({workers} workers)', rows, seconds)
+
+        if rows <= legacy_max:
+            expected = normalize_and_score(df.copy(), today=today)
+            actual = normalize_and_score_parallel(df.copy(), today=today, workers=workers, min_rows=0)
+            pd.testing.assert_frame_equal(expected, actual)
+            print(f"  ✓ identical output at {rows:,} rows")
+        print()
+
+# Hard-coded aps_api alias map the legacy ingest chain renamed with (before the alias map JSON)
+LEGACY_ALIAS_MAP = {
+    "property_address": ["Address", "Property Address", "Street Address", "Property_Address"],
+    "city": ["City", "City Name", "Municipality"],
+    "state": ["State", "ST", "State Code"],
+    "zip": ["ZIP", "Zip Code", "Postal Code", "ZipCode"],
+    "owner_name": ["Owner Name", "Owner", "Owner OO", "OwnerName"],
+    "loan_date": ["LastLoanDate", "Loan Date", "Last Loan Date", "Loan 1 Date"],
+    "loan_balance": ["TotalLoanBal", "Loan Balance", "Total Loan Balance"],
+    "property_value": ["EstValue", "Property Value", "Est Value", "AVM"],
+    "ltv": ["LTV %", "LTV", "Loan to Value"],
+    "equity": ["Equity %", "Equity Pct", "Equity Percentage"]
+}
+
+def legacy_ingest_chain(df: pd.DataFrame) -> pd.DataFrame:
+    """Reference: copying rename, two DNC/consent filters, temp-column normalize + drop"""
+    from engine.aps_metrics import months_elapsed
+
+    reverse_map = {alias: name for name, aliases in LEGACY_ALIAS_MAP.items() for alias in aliases}
+    df = df.rename(columns={col: reverse_map[col] for col in df.columns if col in reverse_map})
+    df = df[df['dnc_flag'] != True]
+    df = df[df['consent'] != False]
+
+    df['_property_value'] = parse_money(df['property_value'])
+    df['_loan_balance'] = parse_money(df['loan_balance'])
+    df['_loan_date'] = parse_dates(df['loan_date'], header_signature(df.columns), 'loan_date')
+    df['LTV %'] = ((df['_loan_balance'] / df['_property_value']) * 100).round(2)
+    df['LTV %'] = df['LTV %'].fillna(0).clip(0, 100)
+    df['Equity %'] = (100 - df['LTV %']).round(2)
+    df['Equity_Dollars'] = (df['_property_value'] * (df['Equity %'] / 100)).round(0)
+    df['Loan_Age_Mo'] = months_elapsed(df['_loan_date'])
+    scores = evaluate_models([df], len(df), ['aps-v2.0'])
+    for col in SCORE_COLUMNS:
+        df[col] = scores[col]
+    return df.drop(columns=['_property_value', '_loan_balance', '_loan_date'])
+
+def copy_free_ingest_chain(df: pd.DataFrame) -> pd.DataFrame:
+    """Current chain: in-place rename, one folded DNC/consent filter, in-place normalize"""
+    from engine.aps_api import apply_alias_mapping, apply_dnc_filter
+    return normalize_and_score(apply_dnc_filter(apply_alias_mapping(df)))
+
+INGEST_CHAINS = {
+    'legacy (copying)': legacy_ingest_chain,
+    'copy-free': copy_free_ingest_chain
+}
+
+def measure_chain(name: str, rows: int) -> dict:
+    """
+    Run one ingest chain in this process and report its memory peaks
+
+    Runs in a fresh child process per chain so high-water marks don't leak
+    between runs.
+    """
+    df = make_vendor_frame(rows)
+    df['dnc_flag'] = np.arange(rows) % 50 == 0
+    df['consent'] = np.arange(rows) % 40 != 0
+    import engine.aps_api  # FastAPI and the alias map load outside the measured region, for both chains
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    INGEST_CHAINS[name](df)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    peak_rss = None
+    if resource is not None:
+        # ru_maxrss is KiB on Linux
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {'peak_alloc': peak, 'peak_rss': peak_rss}
+
+def bench_memory(rows_list, legacy_max: int):
+    """Peak memory of the alias -> DNC -> normalize chain, copying vs. copy-free"""
+    print("=" * 80)
+    print("INGEST CHAIN MEMORY (alias mapping -> DNC/consent -> normalize_and_score)")
+    print("=" * 80)
+
+    ctx = multiprocessing.get_context('spawn')
+    for rows in rows_list:
+        for name in INGEST_CHAINS:
+            with ctx.Pool(1) as pool:
+                result = pool.apply(measure_chain, (name, rows))
+            rss = f"{result['peak_rss'] / 1e6:>9.1f} MB RSS" if result['peak_rss'] else "     RSS n/a"
+            print(f"  {name:<34} {rows:>10,} rows  {result['peak_alloc'] / 1e6:>9.1f} MB above input  {rss}")
+        print()
+
+def zip_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+    """The ZIP rollup shape used by calculate_market_aggregates and the page builders"""
+    return df.groupby('ZIP', observed=True).agg({
+        'Equity_Dollars': 'median',
+        'LTV %': 'median',
+        'APS_Score (v2.0)': 'median',
+        'Loan_Age_Mo': 'median'
+    })
+
+def bench_dtypes(rows_list, legacy_max: int):
+    """Scored-frame footprint and ZIP groupby speed, default vs. compact dtypes"""
+    print("=" * 80)
+    print("COMPACT DTYPE PLAN (categoricals, float32, int16)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        scored = normalize_and_score(make_vendor_frame(rows))
+        scored['ZIP'] = scored['ZIP'].astype(str)
+        compact = apply_dtype_plan(scored.copy())
+
+        for label, frame in [('default dtypes', scored), ('compact dtypes', compact)]:
+            seconds = time_call(lambda: zip_aggregates(frame))
+            print_row(f'ZIP groupby, {label}', rows, seconds)
+            print(f"  {'':<34} {bytes_per_row(frame):>10,.0f} bytes/row  "
+                  f"{frame.memory_usage(deep=True).sum() / 1e6:>10.1f} MB")
+        print()
+
+def bench_reader(rows_list, legacy_max: int):
+    """CSV read time per engine (pandas C parser vs. pyarrow when installed)"""
+    print("=" * 80)
+    print("CSV READER ENGINES")
+    print("=" * 80)
+
+    engines = ['c'] + (['pyarrow'] if resolve_engine('auto') == 'pyarrow' else [])
+    if len(engines) == 1:
+        print("  ℹ pyarrow not installed - timing the C reader only")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            csv_path = f"{tmp}/vendor_{rows}.csv"
+            make_vendor_frame(rows).to_csv(csv_path, index=False, encoding='utf-8-sig')
+
+            for engine in engines:
+                seconds = time_call(lambda: read_csv(csv_path, engine=engine, encoding='utf-8-sig'))
+                print_row(f'read_csv ({engine})', rows, seconds)
+                seconds = time_call(lambda: read_csv(csv_path, engine=engine, dtype=str, keep_default_na=False))
+                print_row(f'read_csv dtype=str ({engine})', rows, seconds)
+            print()
+
+def bench_models(rows_list, legacy_max: int):
+    """Shadow scoring: two models in one pass vs. one pass per model"""
+    print("=" * 80)
+    print("SCORING MODEL REGISTRY (aps-v2.0 + aps-ts-v1.0 shadow)")
+    print("=" * 80)
+
+    production, shadow = ['aps-v2.0'], ['aps-v2.0', 'aps-ts-v1.0']
+    for rows in rows_list:
+        inputs = make_score_inputs(rows)
+
+        seconds = time_call(lambda: evaluate_models([inputs], rows, production))
+        print_row('aps-v2.0 only', rows, seconds)
+        seconds = time_call(lambda: [evaluate_models([inputs], rows, [m]) for m in shadow])
+        print_row('v2.0 + ts-1.0, separate passes', rows, seconds)
+        seconds = time_call(lambda: evaluate_models([inputs], rows, shadow))
+        print_row('v2.0 + ts-1.0, one pass', rows, seconds)
+
+        if rows <= legacy_max:
+            # TypeScript port, one call per row on 0-1 ratios
+            ltv = inputs['LTV %'] / 100
+            equity = inputs['Equity %'] / 100
+            expected = py_round([
+                aps_metrics.aps_score(l, e, a) for l, e, a in zip(ltv, equity, inputs['Loan_Age_Mo'])
+            ], 1)
+            actual = evaluate_models([inputs], rows, ['aps-ts-v1.0'])['APS_Score (ts-1.0)']
+            if not np.array_equal(expected, actual):
+                raise AssertionError(f"aps-ts-v1.0 differs from aps_metrics.aps_score at {rows} rows")
+            print(f"  ✓ aps-ts-v1.0 identical to aps_metrics.aps_score at {rows:,} rows")
+        print()
+
+METRIC_COLUMNS = ['ltv', 'aps_score', 'churn_index', 'cycle_phase', 'velocity']
+
+def bench_metrics(rows_list, legacy_max: int):
+    """TypeScript-parity metrics: one call per row vs. one frame-level pass"""
+    print("=" * 80)
+    print("COMPREHENSIVE METRICS (row calls vs calculate_comprehensive_metrics_frame)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        df = make_vendor_frame(rows)
+        df['LastLoanDate'] = pd.to_datetime(df['LastLoanDate'], format='%m/%d/%Y').dt.strftime('%Y-%m-%d')
+        df['equity_delta_90d'] = np.random.default_rng(7).normal(0, 25_000, rows).round(0)
+        source = df[['EstValue', 'TotalLoanBal', 'LastLoanDate', 'equity_delta_90d']]
+
+        seconds = time_call(lambda: aps_metrics.calculate_comprehensive_metrics_frame(source.copy(), '2025-10-01'))
+        print_row('frame-level', rows, seconds)
+
+        if rows <= legacy_max:
+            start = time.perf_counter()
+            expected = pd.DataFrame([
+                aps_metrics.calculate_comprehensive_metrics(row, '2025-10-01') for _, row in source.iterrows()
+            ])
+            print_row('row-wise (legacy)', rows, time.perf_counter() - start)
+
+            actual = aps_metrics.calculate_comprehensive_metrics_frame(source.copy(), '2025-10-01')
+            for col in METRIC_COLUMNS:
+                if not np.array_equal(expected[col].to_numpy(), actual[col].to_numpy()):
+                    raise AssertionError(f"Frame-level {col} differs from the row-wise metrics at {rows} rows")
+            print(f"  ✓ Frame-level metrics identical to row-wise at {rows:,} rows")
+        print()
+
+def bench_lookup(rows_list, legacy_max: int):
+    """Loan-age curves: month lookup tables vs. direct evaluation"""
+    print("=" * 80)
+    print(f"LOAN-AGE LOOKUP TABLES (0-{aps_metrics.AGE_LOOKUP_MONTHS} months)")
+    print("=" * 80)
+
+    # aps-v2.0 as shipped (age curves tabulated) and with the lookup removed
+    with open(MODELS_DIR / 'aps_v2.0.yaml', 'r', encoding='utf-8') as f:
+        spec = yaml.safe_load(f)
+    tabulated = compile_model(spec)
+    spec['inputs']['loan_age'].pop('lookup')
+    direct = compile_model(spec)
+
+    for rows in rows_list:
+        inputs = make_score_inputs(rows)
+        ages = inputs['Loan_Age_Mo']
+
+        seconds = time_call(lambda: aps_metrics._age_decay_curve(ages))
+        print_row('age decay, np.exp', rows, seconds)
+        seconds = time_call(lambda: aps_metrics.age_decay(ages))
+        print_row('age decay, table', rows, seconds)
+        seconds = time_call(lambda: aps_metrics._cycle_phase_curve(ages))
+        print_row('cycle phase, np.select', rows, seconds)
+        seconds = time_call(lambda: aps_metrics.cycle_phase(ages))
+        print_row('cycle phase, table', rows, seconds)
+        seconds = time_call(lambda: direct.evaluate([inputs], rows))
+        print_row('aps-v2.0, direct age curves', rows, seconds)
+        seconds = time_call(lambda: tabulated.evaluate([inputs], rows))
+        print_row('aps-v2.0, tabulated age curves', rows, seconds)
+
+        expected, actual = direct.evaluate([inputs], rows), tabulated.evaluate([inputs], rows)
+        for col in tabulated.columns:
+            if not np.array_equal(expected[col], actual[col]):
+                raise AssertionError(f"Tabulated aps-v2.0 {col} differs from direct evaluation at {rows} rows")
+        if not np.array_equal(aps_metrics._cycle_phase_curve(ages), aps_metrics.cycle_phase(ages)):
+            raise AssertionError(f"Cycle phase table differs from the curve at {rows} rows")
+        if rows <= legacy_max:
+            # The decay table is built with math.exp, so it matches the scalar path exactly
+            if not np.array_equal([math.exp(-age / 36) for age in ages.tolist()], aps_metrics.age_decay(ages)):
+                raise AssertionError(f"Age decay table differs from math.exp at {rows} rows")
+        print(f"  ✓ Tables identical to direct evaluation at {rows:,} rows")
+        print()
+
+# In-process latency budget for one score_property call
+LATENCY_P99_BUDGET_MS = 1.0
+
+def bench_latency(rows_list, legacy_max: int):
+    """Single-property fast path: per-call latency percentiles (rows = calls)"""
+    print("=" * 80)
+    print(f"SINGLE-PROPERTY LATENCY (score_property, p99 budget {LATENCY_P99_BUDGET_MS} ms)")
+    print("=" * 80)
+
+    for calls in rows_list:
+        rng = np.random.default_rng(11)
+        loans = rng.uniform(0, 900_000, calls).round(0).tolist()
+        values = rng.uniform(-1_000, 1_200_000, calls).round(0).tolist()
+        deltas = rng.normal(0, 20_000, calls).round(0).tolist()
+        loan_dates = (pd.Timestamp('1980-01-01') + pd.to_timedelta(rng.integers(0, 17_000, calls), unit='D')).strftime('%Y-%m-%d').tolist()
+        loan_dates[::10] = [None] * len(loan_dates[::10])
+
+        timings = np.empty(calls)
+        results = []
+        for i in range(calls):
+            start = time.perf_counter()
+            result = aps_metrics.score_property(loans[i], values[i], loan_dates[i], deltas[i])
+            timings[i] = time.perf_counter() - start
+            results.append(result)
+
+        p50, p99, worst = np.percentile(timings, [50, 99, 100]) * 1000
+        print(f"  {calls:>10,} calls  p50 {p50 * 1000:>7.1f} µs  p99 {p99 * 1000:>7.1f} µs  max {worst * 1000:>9.1f} µs")
+
+        # Same numbers as the batch kernel
+        today = datetime.now().isoformat()[:10]
+        dates = pd.to_datetime(pd.Series(loan_dates, dtype=object), format='ISO8601').to_numpy()
+        batch = aps_metrics.calculate_property_metrics(loans, values, dates, deltas, today)
+        for field in aps_metrics.PROPERTY_METRICS:
+            if not np.array_equal([result[field] for result in results], batch[field]):
+                raise AssertionError(f"score_property {field} differs from calculate_property_metrics")
+        print(f"  ✓ Identical to calculate_property_metrics over {calls:,} properties")
+
+        if p99 >= LATENCY_P99_BUDGET_MS:
+            raise AssertionError(f"p99 {p99:.3f} ms exceeds the {LATENCY_P99_BUDGET_MS} ms budget")
+        print(f"  ✓ p99 under {LATENCY_P99_BUDGET_MS} ms")
+        print()
+
+def legacy_health_scans(df: pd.DataFrame) -> dict:
+    """Reference: the per-check frame scans of the previous health_check (counts only)"""
+    n = len(df)
+    loan_dates = parse_dates(df['LastLoanDate'], header_signature(df.columns), 'LastLoanDate')
+    value_numeric = pd.to_numeric(df['EstValue'], errors='coerce')
+    return {
+        'address': df['Property Address'].notna().sum(),
+        'zip': df['ZIP'].astype(str).str.match(r'^\d{5}$').sum(),
+        'value': ((value_numeric >= 50000) & (value_numeric <= 10000000)).sum(),
+        'value_median': value_numeric.median(),
+        'ltv': ((df['LTV %'] >= 0) & (df['LTV %'] <= 100)).sum(),
+        'ltv_median': widen(df['LTV %']).median(),
+        'equity': (abs((df['Equity %'] + df['LTV %']) - 100) < 1).sum(),
+        'dates': loan_dates.notna().sum(),
+        'age': ((df['Loan_Age_Mo'] >= 0) & (df['Loan_Age_Mo'] <= 360)).sum(),
+        'age_median': df['Loan_Age_Mo'].median(),
+        'duplicates': df.duplicated(subset=['Property Address', 'ZIP'], keep=False).sum(),
+        'missing': sum(df[col].isna().sum() for col in ['Property Address', 'ZIP', 'EstValue', 'TotalLoanBal', 'LastLoanDate']),
+        'score': ((df['APS_Score (v2.0)'] >= 0) & (df['APS_Score (v2.0)'] <= 100)).sum(),
+        'score_median': widen(df['APS_Score (v2.0)']).median(),
+        'tiers': df['APS_Tier'].isin(['Platinum', 'Gold', 'Silver', 'Nurture']).sum(),
+        'tier_dist': df['APS_Tier'].value_counts().to_dict(),
+        'cci': ((df['CCI'] >= 0) & (df['CCI'] <= 100)).sum(),
+        'cci_median': widen(df['CCI']).median(),
+        'state': df['State'].astype(str).str.match(r'^[A-Z]{2}$').sum(),
+        'refi': ((df['LTV %'] <= 80) & (df['Loan_Age_Mo'] >= 18)).sum(),
+        'owner': df['Owner Name'].notna().sum(),
+        'recent': (loan_dates >= '2020-01-01').sum(),
+        'rows': n
+    }
+
+# Chunk sizes for the merged-partial health check (small chunks stress the duplicate key merge)
+HEALTH_CHUNK_ROWS = 100_000
+HEALTH_SMALL_CHUNK_ROWS = 2_000
+
+def bench_health(rows_list, legacy_max: int):
+    """18-point health check: per-check rescans vs. single pass over normalized arrays"""
+    print("=" * 80)
+    print("HEALTH CHECK (per-check scans vs single pass with normalized source arrays)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        raw = make_vendor_frame(rows).astype({'ZIP': str})
+        sources = {}
+        df = apply_dtype_plan(normalize_and_score(raw, sources=sources))
+
+        seconds = time_call(lambda: legacy_health_scans(df))
+        print_row('per-check scans (legacy)', rows, seconds)
+        seconds = time_call(lambda: health_check(df))
+        print_row('single pass, own parse', rows, seconds)
+        seconds = time_call(lambda: health_check(df, sources))
+        print_row('single pass, normalized arrays', rows, seconds)
+
+        if health_check(df, sources) != health_check(df):
+            raise AssertionError(f"health_check with normalized arrays differs at {rows} rows")
+        print(f"  ✓ Same report with and without the normalized arrays at {rows:,} rows")
+
+        def chunked(chunk_rows=HEALTH_CHUNK_ROWS):
+            total = HealthPartial()
+            for start in range(0, rows, chunk_rows):
+                chunk = df.iloc[start:start + chunk_rows]
+                total.merge(health_partial(chunk, {name: values[start:start + chunk_rows]
+                                                   for name, values in sources.items()}))
+            return health_report(total)
+
+        seconds = time_call(chunked)
+        print_row(f'merged {HEALTH_CHUNK_ROWS:,}-row partials', rows, seconds)
+        seconds = time_call(lambda: chunked(HEALTH_SMALL_CHUNK_ROWS))
+        print_row(f'merged {HEALTH_SMALL_CHUNK_ROWS:,}-row partials', rows, seconds)
+
+        # Counts are exact in any case; medians only while the sketches are exact
+        whole, merged = health_check(df, sources), chunked()
+        small = chunked(HEALTH_SMALL_CHUNK_ROWS)
+        if any(whole[name]['message'] != part[name]['message'] for part in (merged, small) for name in whole):
+            raise AssertionError(f"merged partial counts differ at {rows} rows")
+        drift = {name: (whole[name]['value'], merged[name]['value'])
+                 for name in whole if whole[name]['value'] != merged[name]['value']}
+        if drift and rows <= DEFAULT_EXACT_LIMIT:
+            raise AssertionError(f"merged partial medians differ at {rows} rows: {drift}")
+        print(f"  ✓ Same counts from merged partials; median drift: {drift or 'none'}")
+        print()
+
+# Report stages that each take the same column medians (health check, aggregates, cover page)
+MEDIAN_STAGES = 3
+SKETCH_COLUMNS = ['LTV %', 'Equity %', 'Equity_Dollars', 'Loan_Age_Mo']
+
+def bench_sketch(rows_list, legacy_max: int):
+    """Report medians: a full median per stage vs one shared sketch per column"""
+    print("=" * 80)
+    print(f"QUANTILE SKETCHES ({MEDIAN_STAGES} report stages, {len(SKETCH_COLUMNS)} median columns)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        df = apply_dtype_plan(normalize_and_score(make_vendor_frame(rows)))
+
+        def per_stage():
+            for _ in range(MEDIAN_STAGES):
+                for col in SKETCH_COLUMNS:
+                    widen(df[col]).median()
+
+        def shared():
+            sketches = {}
+            for _ in range(MEDIAN_STAGES):
+                for col in SKETCH_COLUMNS:
+                    column_median(df, col, sketches)
+
+        seconds = time_call(per_stage)
+        print_row('Series.median per stage', rows, seconds)
+        seconds = time_call(shared)
+        print_row('shared sketch', rows, seconds)
+
+        values = np.sort(df['Equity_Dollars'].to_numpy(dtype=np.float64))
+        sketch = QuantileSketch().update(values[np.random.default_rng(0).permutation(len(values))])
+        qs = np.linspace(0.01, 0.99, 99)
+        # Distance from q to the rank interval of the returned value (ties span several ranks)
+        estimates = sketch.quantiles(qs)
+        low = np.searchsorted(values, estimates, side='left') / len(values)
+        high = np.searchsorted(values, estimates, side='right') / len(values)
+        error = np.max(np.maximum(0, np.maximum(low - qs, qs - high)))
+        if error > sketch.rank_error + 1 / len(values):
+            raise AssertionError(f"rank error {error:.4f} above the {sketch.rank_error:.4f} bound at {rows} rows")
+        mode = 'exact' if sketch.exact else f'{len(sketch.to_bytes()):,} bytes serialized'
+        print(f"  ✓ Rank error {error:.4%} (bound {sketch.rank_error:.2%}, {mode})")
+        print()
+
+# Chunk size for the duplicate index benchmark
+DEDUPE_CHUNK_ROWS = 100_000
+
+def make_resent_frame(previous: pd.DataFrame) -> pd.DataFrame:
+    """
+    Next week's vendor file: the newer half of `previous` re-formatted
+    (upper case, 'STREET', string ZIPs), as many new records, and 1% of
+    rows repeated within the file
+    """
+    rows = len(previous)
+    resent = previous.iloc[rows // 2:].assign(**{
+        'Property Address': previous['Property Address'].iloc[rows // 2:].str.upper().str.replace('ST', 'STREET'),
+        'ZIP': previous['ZIP'].iloc[rows // 2:].astype(str)
+    })
+    fresh = make_vendor_frame(rows - rows // 2, seed=7)
+    fresh['Property Address'] = (pd.Series(np.arange(rows, rows + len(fresh))).astype(str) + ' Main St').to_numpy()
+    current = pd.concat([resent, fresh], ignore_index=True)
+    return pd.concat([current, current.iloc[:rows // 100]], ignore_index=True)
+
+def bench_dedupe(rows_list, legacy_max: int):
+    """Duplicate flags against an earlier job: in-memory concat + duplicated vs the persistent index"""
+    print("=" * 80)
+    print(f"DUPLICATE INDEX (resent file vs one earlier job, {DEDUPE_CHUNK_ROWS:,}-row chunks)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            previous = make_vendor_frame(rows)
+            current = make_resent_frame(previous)
+            path = Path(tmp) / f"index_{rows}.npz"
+
+            seconds = time_call(lambda: record_keys(current), repeat=1)
+            print_row('record keys (normalize + hash)', len(current), seconds)
+
+            session = DuplicateIndex(path).session('previous')
+            session.check(previous)
+            start = time.perf_counter()
+            session.commit()
+            print_row('commit earlier job to disk', rows, time.perf_counter() - start)
+
+            if rows <= legacy_max:
+                # Reference: both files in memory, raw duplicated() (misses re-formatted rows)
+                seconds = time_call(lambda: pd.concat([previous, current]).duplicated(
+                    subset=['Property Address', 'ZIP'], keep='first'), repeat=1)
+                print_row('concat + duplicated (legacy)', len(current), seconds)
+
+            def check_chunks():
+                session = DuplicateIndex(path).session('current')
+                for start in range(0, len(current), DEDUPE_CHUNK_ROWS):
+                    session.check(current.iloc[start:start + DEDUPE_CHUNK_ROWS])
+                return session.counts
+
+            seconds = time_call(check_chunks, repeat=1)
+            print_row('index check per chunk', len(current), seconds)
+
+            counts = check_chunks()
+            # The repeated rows come from the resent half, so they were ingested before too
+            expected = {'within_job': rows // 100, 'previously_ingested': rows - rows // 2 + rows // 100}
+            for name, count in expected.items():
+                if counts[name] != count:
+                    raise AssertionError(f"{name} duplicates: {counts[name]:,}, expected {count:,}")
+            print(f"  ✓ {counts['within_job']:,} within job, {counts['previously_ingested']:,} previously ingested "
+                  f"({path.stat().st_size / max(1, rows):.1f} bytes/key on disk)")
+            print()
+
+# Share of rows broken by each injected defect in the quarantine benchmark
+QUARANTINE_DEFECTS = {
+    'VALUE_MISSING': ('EstValue', ''),
+    'BALANCE_UNPARSEABLE': ('TotalLoanBal', 'n/a'),
+    'LOAN_DATE_UNPARSEABLE': ('LastLoanDate', '13/45/20'),
+    'ZIP_INVALID': ('ZIP', 'N/A'),
+    'STATE_INVALID': ('State', 'North Carolina')
+}
+QUARANTINE_DEFECT_RATE = 0.01
+
+def make_dirty_frame(rows: int, seed: int = 42) -> tuple:
+    """
+    Vendor frame read as strings, with QUARANTINE_DEFECT_RATE of rows broken per defect
+
+    Returns:
+        (DataFrame, dict of expected row counts per reason code)
+    """
+    rng = np.random.default_rng(seed)
+    df = make_vendor_frame(rows, seed).astype(str)
+    expected = {}
+    for code, (col, bad_value) in QUARANTINE_DEFECTS.items():
+        hit = rng.random(rows) < QUARANTINE_DEFECT_RATE
+        df.loc[hit, col] = bad_value
+        expected[code] = int(hit.sum())
+    return df, expected
+
+def legacy_validate_rows(df: pd.DataFrame) -> pd.Series:
+    """Row-wise reference: one Python function call per row"""
+    def validate(row):
+        reasons = []
+        try:
+            float(str(row['EstValue']).replace('$', '').replace(',', ''))
+        except ValueError:
+            reasons.append('VALUE_MISSING')
+        if row['TotalLoanBal']:
+            try:
+                float(str(row['TotalLoanBal']).replace('$', '').replace(',', ''))
+            except ValueError:
+                reasons.append('BALANCE_UNPARSEABLE')
+        if row['LastLoanDate'] and pd.isna(pd.to_datetime(row['LastLoanDate'], format='%m/%d/%Y', errors='coerce')):
+            reasons.append('LOAN_DATE_UNPARSEABLE')
+        if not str(row['ZIP']).isdigit():
+            reasons.append('ZIP_INVALID')
+        if len(str(row['State'])) != 2:
+            reasons.append('STATE_INVALID')
+        return '|'.join(reasons)
+    return df.apply(validate, axis=1)
+
+def bench_quarantine(rows_list, legacy_max: int):
+    """Quarantine rules: row-wise validation vs compiled masks, and their cost on top of scoring"""
+    print("=" * 80)
+    print(f"QUARANTINE RULES ({QUARANTINE_DEFECT_RATE:.0%} of rows broken per defect)")
+    print("=" * 80)
+    load_rules()  # compile once, outside the timings
+
+    for rows in rows_list:
+        df, expected = make_dirty_frame(rows)
+
+        if rows <= legacy_max:
+            seconds = time_call(lambda: legacy_validate_rows(df), repeat=1)
+            print_row('row-wise validate (legacy)', rows, seconds)
+
+        seconds = time_call(lambda: quarantine_rows(df))
+        print_row('compiled rule masks', rows, seconds)
+
+        seconds = time_call(lambda: normalize_and_score(df.copy()))
+        print_row('score every row', rows, seconds)
+
+        def quarantine_then_score():
+            parsed = parse_sources(df)
+            clean, _ = quarantine_rows(df, parsed)
+            return normalize_and_score(clean, parsed=parsed)
+
+        seconds = time_call(quarantine_then_score)
+        print_row('quarantine + score clean rows', rows, seconds)
+
+        clean, quarantined = quarantine_rows(df)
+        counts = reason_counts(quarantined)
+        for code, count in expected.items():
+            if counts.get(code, 0) != count:
+                raise AssertionError(f"{code}: {counts.get(code, 0):,} rows, expected {count:,}")
+        if len(clean) + len(quarantined) != rows:
+            raise AssertionError(f"split lost rows: {len(clean):,} + {len(quarantined):,} != {rows:,}")
+        print(f"  ✓ {len(quarantined):,} rows quarantined, reason counts match the injected defects")
+        print()
+
+def bench_preview(rows_list, legacy_max: int):
+    """Ingest preview: full read + score + health vs a sampled head / stratified read"""
+    from engine.aps_api import preview_sample  # pulls in FastAPI, only needed here
+
+    print("=" * 80)
+    print(f"INGEST PREVIEW ({PREVIEW_SAMPLE_KB} KB sample, {PREVIEW_STRATA} byte ranges when stratified)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            path = Path(tmp) / f"vendor_{rows}.csv"
+            make_vendor_frame(rows).to_csv(path, index=False)
+            size = path.stat().st_size
+
+            if rows <= legacy_max:
+                def full_pass():
+                    sources = {}
+                    df = normalize_and_score(read_csv(path), sources=sources)
+                    return health_check(df, sources)
+                seconds = time_call(full_pass, repeat=1)
+                print_row('full read + score + health', rows, seconds)
+
+            with open(path, 'rb') as handle:
+                def read_range(offset, length):
+                    handle.seek(offset)
+                    return handle.read(length)
+
+                for label, strata in [('head sample preview', 1), ('stratified sample preview', PREVIEW_STRATA)]:
+                    def preview():
+                        data = sample_csv_bytes(read_range, PREVIEW_SAMPLE_KB * 1024, size, strata)
+                        return data, preview_sample(data, 'v2.0', 20)
+                    seconds = time_call(preview)
+                    data, result = preview()
+                    estimate = size * result['sample_rows'] / len(data)
+                    print_row(label, rows, seconds)
+                    print(f"    {result['sample_rows']:,} sampled rows, ~{estimate:,.0f} rows estimated "
+                          f"({estimate / rows - 1:+.1%}), feed {result['feed']}")
+            print()
+
+def legacy_alias_renames(columns, alias_map: dict) -> dict:
+    """Reference: reverse map rebuilt per call, exact header spelling only"""
+    reverse_map = {}
+    for standard_name, aliases in alias_map.items():
+        for alias in aliases:
+            reverse_map[alias] = standard_name
+    return {col: reverse_map[col] for col in columns if col in reverse_map}
+
+def bench_aliases(rows_list, legacy_max: int):
+    """Header resolution per chunk: exact reverse map vs the compiled resolver (cold and cached)"""
+    alias_map = load_alias_map()
+    # Vendor spellings of varying case/punctuation plus unrelated columns, like a real export
+    headers = ['SITE_ADDR', 'site city', 'STATE CODE', 'Zip-Code', 'Owner_1_Full_Name',
+               'Est. Value $', 'Total Loan Bal', 'Last Loan Date', 'LTV Pct', 'Equity_Pct']
+    headers += [f"Vendor Field {i}" for i in range(50)]
+
+    print("=" * 80)
+    print(f"HEADER ALIASES ({len(headers)} columns, resolved once per 10,000-row chunk)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        chunks = max(1, rows // 10_000)
+        if rows <= legacy_max:
+            seconds = time_call(lambda: [legacy_alias_renames(headers, alias_map) for _ in range(chunks)])
+            print_row('legacy exact reverse map', rows, seconds)
+        seconds = time_call(lambda: [HeaderResolver(alias_map).rename_map(headers)], repeat=1)
+        print_row('resolver, cold (compile + fuzzy)', rows, seconds)
+        resolver = HeaderResolver(alias_map)
+        resolver.rename_map(headers)
+        seconds = time_call(lambda: [resolver.rename_map(headers) for _ in range(chunks)])
+        print_row('resolver, cached', rows, seconds)
+        print()
+
+    legacy = legacy_alias_renames(headers, alias_map)
+    resolved = HeaderResolver(alias_map).rename_map(headers)
+    print(f"  ✓ legacy map renames {len(legacy)} headers, resolver renames {len(resolved)}: "
+          f"{', '.join(sorted(resolved.values()))}")
+    print()
+
+def bench_fingerprint(rows_list, legacy_max: int):
+    """Per-job layout discovery: validation, alias/date/feed detection and an untyped read vs a fingerprint hit"""
+    from engine.aps_api import validate_schema, apply_alias_mapping  # pulls in FastAPI, only needed here
+
+    print("=" * 80)
+    print("SCHEMA FINGERPRINTS (read + alias mapping + source parsing, new vs known header)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SchemaCache(Path(tmp) / "schema_fingerprints.json")
+        for rows in rows_list:
+            path = Path(tmp) / f"vendor_{rows}.csv"
+            make_vendor_frame(rows).to_csv(path, index=False)
+
+            def discover():
+                RESOLVER_CACHE.clear()
+                DATE_FORMAT_CACHE.clear()
+                valid, message = validate_schema(read_csv(path, nrows=5))
+                df = apply_alias_mapping(read_csv(path, encoding='utf-8-sig'))
+                return df, parse_sources(df)
+
+            seconds = time_call(discover, repeat=1)
+            print_row('new layout: full discovery', rows, seconds)
+
+            if rows <= legacy_max:
+                df, _ = discover()
+                seconds = time_call(lambda: feed_groups(df), repeat=1)
+                print_row('new layout: feed routing', rows, seconds)
+
+            raw = read_csv(path, encoding='utf-8-sig')
+            profile = ReadProfile()
+            profile.add(raw)
+            normalize_and_score(apply_alias_mapping(raw.copy(deep=False)))
+            cache.store(learn_fingerprint(raw.columns, profile, 'v2.0'))
+
+            def known():
+                DATE_FORMAT_CACHE.clear()
+                fingerprint = cache.lookup(read_csv(path, nrows=0, encoding='utf-8-sig').columns, None, 'v2.0')
+                fingerprint.seed_date_formats()
+                df = read_csv(path, encoding='utf-8-sig', **fingerprint.read_kwargs())
+                df.rename(columns=fingerprint.rename, inplace=True)
+                return df, parse_sources(df)
+
+            seconds = time_call(known)
+            print_row('known layout: fingerprint hit', rows, seconds)
+
+            _, expected = discover()
+            _, parsed = known()
+            for name, values in expected.items():
+                if not np.array_equal(np.asarray(values), np.asarray(parsed[name]), equal_nan=True):
+                    raise AssertionError(f"{name}: typed read parses differently")
+            print(f"  ✓ parsed sources match, {len(cache)} layouts cached")
+            print()
+
+def bench_projection(rows_list, legacy_max: int):
+    """Inferred full-width read vs a typed read projected to the feed's output columns"""
+    print("=" * 80)
+    print("PROJECTED READS (vendor export with 40 columns no feed outputs)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            path = Path(tmp) / f"wide_{rows}.csv"
+            make_wide_vendor_frame(rows).to_csv(path, index=False)
+            header = read_csv(path, nrows=0).columns
+
+            seconds = time_call(lambda: read_csv(path), repeat=1)
+            full = read_csv(path)
+            print_row(f'all {len(header)} columns, inferred', rows, seconds)
+            print(f"    {bytes_per_row(full):,.0f} bytes/row, ZIP {full['ZIP'].dtype} "
+                  f"({(full['ZIP'].astype(str).str.len() < 5).mean():.0%} lost leading zeros)")
+
+            for feed in ['core_equity', 'lender_engagement']:
+                plan = read_plan(header, feed)
+                seconds = time_call(lambda: read_csv(path, **plan))
+                df = read_csv(path, **plan)
+                print_row(f'{feed}: {len(plan["usecols"])} columns, typed', rows, seconds)
+                print(f"    {bytes_per_row(df):,.0f} bytes/row, ZIP {df['ZIP'].dtype}, State {df['State'].dtype}")
+                if not df['ZIP'].str.len().eq(5).all():
+                    raise AssertionError("typed read lost ZIP leading zeros")
+            print()
+
+def bench_ingest(rows_list, legacy_max: int, chunk_rows: int = 100_000):
+    """Chunk pass + full re-read for the feed outputs vs one pass spilling each chunk to the feed's CSV"""
+    from engine.aps_stream import FeedSpill, iter_scored_chunks
+
+    print("=" * 80)
+    print(f"INGEST JOBS (count pass + re-read vs single pass, {chunk_rows:,}-row chunks)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            path = Path(tmp) / f"vendor_{rows}.csv"
+            make_vendor_frame(rows).to_csv(path, index=False)
+            today = datetime(2025, 1, 1)
+
+            def two_pass():
+                count = sum(len(chunk) for chunk in iter_scored_chunks(path, chunk_rows, today))
+                df = normalize_and_score(read_csv(path, encoding='utf-8-sig'), today=today)
+                df.to_csv(Path(tmp) / "two_pass.csv", index=False, encoding='utf-8-sig')
+                return count
+
+            def single_pass():
+                spill = FeedSpill(Path(tmp) / "single_pass.csv")
+                sources = {}
+                for chunk in iter_scored_chunks(path, chunk_rows, today, sources=sources):
+                    spill.add(chunk, health_partial(chunk, sources))
+                spill.close()
+                return spill.rows
+
+            for label, fn in [('count pass + re-read', two_pass), ('single pass + spill', single_pass)]:
+                if label.startswith('count') and rows > legacy_max:
+                    continue
+                seconds = time_call(fn, repeat=1)
+                tracemalloc.start()
+                fn()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print_row(label, rows, seconds)
+                print(f"    peak {peak / 1024 / 1024:,.1f} MB traced")
+
+            if rows <= legacy_max:
+                if (Path(tmp) / "two_pass.csv").read_bytes() != (Path(tmp) / "single_pass.csv").read_bytes():
+                    raise AssertionError("single-pass feed CSV differs from the re-read output")
+                print("  ✓ feed CSVs identical")
+            print()
+
+def bench_routing(rows_list, legacy_max: int):
+    """Per-row detect_feed_type (one-row DataFrame per row, once per feed) vs one vectorized groupby"""
+    print("=" * 80)
+    print(f"FEED ROUTING (file mixing {len(FEED_TYPES)} feed types)")
+    print("=" * 80)
+
+    for rows in rows_list:
+        df = make_vendor_frame(rows)
+        df['feed_type'] = np.random.default_rng(7).choice(list(FEED_TYPES) + [''], rows)
+        timed_legacy = rows <= min(legacy_max, 20_000)  # the legacy router manages ~340 rows/sec
+
+        if timed_legacy:
+            def legacy():
+                return {feed: df[df.apply(lambda row: detect_feed_type(data=pd.DataFrame([row])) == feed, axis=1)]
+                        for feed in FEED_TYPES}
+
+            seconds = time_call(legacy, repeat=1)
+            print_row('legacy: per-row, per-feed apply', rows, seconds)
+
+        seconds = time_call(lambda: {feed: df.iloc[positions] for feed, positions in feed_groups(df).items()})
+        print_row('vectorized: one groupby', rows, seconds)
+
+        if timed_legacy:
+            expected = legacy()
+            split = {feed: df.iloc[positions] for feed, positions in feed_groups(df).items()}
+            for feed, frame in expected.items():
+                if not frame.equals(split.get(feed, frame.iloc[:0])):
+                    raise AssertionError(f"{feed}: vectorized routing differs")
+            print(f"  ✓ feed splits match ({', '.join(f'{f} {len(split[f]):,}' for f in split)})")
+        print()
+
+BENCHMARKS = {
+    'scoring': bench_scoring,
+    'money': bench_money,
+    'dates': bench_dates,
+    'parallel': bench_parallel,
+    'memory': bench_memory,
+    'dtypes': bench_dtypes,
+    'reader': bench_reader,
+    'models': bench_models,
+    'metrics': bench_metrics,
+    'lookup': bench_lookup,
+    'latency': bench_latency,
+    'health': bench_health,
+    'sketch': bench_sketch,
+    'dedupe': bench_dedupe,
+    'quarantine': bench_quarantine,
+    'preview': bench_preview,
+    'aliases': bench_aliases,
+    'fingerprint': bench_fingerprint,
+    'projection': bench_projection,
+    'ingest': bench_ingest,
+    'routing': bench_routing
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="APS engine benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['all'])
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--legacy-max', type=int, default=100_000,
+                        help="Largest row count to also time the legacy path on")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Process count for the parallel benchmark (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    names = sorted(BENCHMARKS) if args.benchmark == 'all' else [args.benchmark]
+    for name in names:
+        if name == 'parallel':
+            bench_parallel(args.rows, args.legacy_max, args.workers)
+        else:
+            BENCHMARKS[name](args.rows, args.legacy_max)
+
+if __name__ == "__main__":
+    main()
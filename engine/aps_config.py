@@ -14,6 +14,7 @@
 
 
 # APS Config - Paths and Feed Configuration
+import os
 from pathlib import Path
 
 # Directory Configuration
@@ -31,4 +32,50 @@ REQUIRED_HEADERS = [
     "Equity %", "LTV %", "Loan_Age_Mo", "APS_Score (v2.0)", "APS_Tier", "CCI"
 ]
 
+# Streaming Mode (files above the threshold are scored chunk by chunk)
+STREAM_CHUNK_ROWS = 100_000
+STREAM_THRESHOLD_MB = 500
+
+# CSV Reader Engine: auto | pyarrow | c (auto = pyarrow when installed)
+CSV_ENGINE = os.environ.get('APS_CSV_ENGINE', 'auto')
+
+# Scoring Models (scoring_models/*.yaml; shadow models score alongside production)
+MODELS_DIR = ENGINE_DIR.parent / "scoring_models"
+SCORING_MODEL = 'aps-v2.0'
+SHADOW_MODELS = [m.strip() for m in os.environ.get('APS_SHADOW_MODELS', '').split(',') if m.strip()]
+
+# Parallel Scoring (frames below the row threshold stay single-process)
+PARALLEL_MIN_ROWS = 250_000
+PARALLEL_WORKERS = None  # None = one worker per CPU core
+
+# Batch /v1/calculate (properties per request, items per streamed response chunk)
+CALCULATE_BATCH_MAX = 50_000
+CALCULATE_STREAM_ROWS = 1_000
+
+# Quantile Sketches (medians: exact up to the value limit, then within the rank error)
+SKETCH_EXACT_LIMIT = 100_000
+SKETCH_RANK_ERROR = 0.005
+
+# Duplicate Index (record keys of every ingested job, for cross-file duplicate flags)
+DUPLICATE_INDEX_PATH = OUTPUT_DIR / "duplicate_index.npz"
+
+# Quarantine Rules (rows failing them skip scoring; None disables validation)
+QUARANTINE_RULES = ENGINE_DIR.parent / "quarantine_rules" / "aps_quarantine.yaml"
+
+# Vendor Header Aliases (canonical field -> vendor headers; unseen headers fuzzy-match above the cutoff)
+ALIAS_MAP_FILE = ENGINE_DIR.parent / "aliases" / "vendor_alias_map.json"
+ALIAS_FUZZY_CUTOFF = 0.85
+
+# Schema Fingerprints (header hash -> mapping, read dtypes, date formats, feed; oldest dropped past the limit)
+SCHEMA_CACHE_PATH = OUTPUT_DIR / "schema_fingerprints.json"
+SCHEMA_CACHE_MAX_ENTRIES = 500
+
+# Projected Reads (only the columns the feed outputs are read; False keeps every vendor column)
+PROJECTED_READS = True
+
+# Ingest Preview (bytes sampled from the file, byte ranges for stratified mode, rows returned)
+PREVIEW_SAMPLE_KB = 256
+PREVIEW_STRATA = 8
+PREVIEW_ROWS = 20
+
 # ==================== FEED CONFIGURATIONS ====================
\ No newline at end of file
@@ -0,0 +1,291 @@
+# aps_dedupe.py - Persistent Duplicate Index
+"""
+Hash-based duplicate detection across chunks and ingestion jobs
+Every record gets a 64-bit key: the hash of its APN when one is present,
+otherwise of its normalized property address + 5-digit ZIP. Keys from
+finished jobs live in a sorted on-disk index (DUPLICATE_INDEX_PATH), so each
+chunk of a new job is checked with vectorized binary searches, both against
+earlier chunks of the same job and against previously ingested files.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.aps_config import DUPLICATE_INDEX_PATH
+
+# Either naming (vendor headers or alias-mapped standard names)
+ADDRESS_COLUMNS = ['Property Address', 'property_address']
+ZIP_COLUMNS = ['ZIP', 'zip']
+APN_COLUMNS = ['APN', 'apn']
+
+# check() mask -> output column the flags are written to
+FLAG_COLUMNS = {
+    'within_job': 'Duplicate_Within_Job',
+    'previously_ingested': 'Duplicate_Previously_Ingested'
+}
+
+# Separate SipHash keys keep APN and address keys from colliding by construction.
+# Changing either invalidates every stored index.
+ADDRESS_HASH_KEY = 'aps-dedupe-addr0'
+APN_HASH_KEY = 'aps-dedupe-apn00'
+
+# Street suffixes and directions folded to their USPS abbreviations
+STREET_ABBREVIATIONS = {
+    'STREET': 'ST', 'AVENUE': 'AVE', 'ROAD': 'RD', 'DRIVE': 'DR', 'LANE': 'LN',
+    'COURT': 'CT', 'BOULEVARD': 'BLVD', 'PLACE': 'PL', 'CIRCLE': 'CIR',
+    'TERRACE': 'TER', 'PARKWAY': 'PKWY', 'HIGHWAY': 'HWY', 'TRAIL': 'TRL',
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W'
+}
+_ABBREVIATE = STREET_ABBREVIATIONS.get
+_NON_ALNUM = re.compile(r'[^A-Z0-9 ]')
+
+# Index commits are serialized (background jobs can finish concurrently)
+_COMMIT_LOCK = threading.Lock()
+
+# ==================== KEYS ====================
+
+def _first_column(df: pd.DataFrame, names: list) -> Optional[str]:
+    """First of `names` present in df"""
+    return next((name for name in names if name in df.columns), None)
+
+def _normalize_unique(series: pd.Series, normalize) -> pd.Series:
+    """Apply a string normalizer once per distinct value"""
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return pd.Series(np.nan, index=series.index, dtype='str')
+    normalized = normalize(pd.Series(uniques, dtype='str')).to_numpy(dtype=object)
+    return pd.Series(np.where(codes >= 0, normalized[codes], None), index=series.index, dtype='str')
+
+def _canonical_address(text: str) -> str:
+    """One address: upper case, punctuation to spaces, single spaces, abbreviations"""
+    text = text.upper()
+    if not text.replace(' ', '').isalnum():
+        text = _NON_ALNUM.sub(' ', text)
+    words = text.split()
+    return ' '.join(map(_ABBREVIATE, words, words))
+
+def normalize_address(series: pd.Series) -> pd.Series:
+    """
+    Canonical street address: upper case, punctuation dropped, suffixes abbreviated
+
+    Example:
+        >>> normalize_address(pd.Series(['12 Main Street.', '12  MAIN ST']))
+        0    12 MAIN ST
+        1    12 MAIN ST
+    """
+    # Plain string methods per distinct value beat chained regex passes over the column
+    return _normalize_unique(series, lambda text: pd.Series(
+        list(map(_canonical_address, text.to_numpy(dtype=object))), dtype='str'))
+
+def normalize_zip(series: pd.Series) -> pd.Series:
+    """5-digit ZIP (ZIP+4 cut, leading zeros restored for numeric ZIPs)"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        series = pd.to_numeric(series, errors='coerce').round().astype('Int64')
+    def normalize(text):
+        digits = text.str.replace(r'\D', '', regex=True)
+        return digits.where(digits != '').str.zfill(5).str[:5]
+    return _normalize_unique(series, normalize)
+
+def normalize_apn(series: pd.Series) -> pd.Series:
+    """Parcel number with separators dropped (123-456-78 == 12345678)"""
+    return _normalize_unique(series, lambda text: text.str.upper().str.replace(r'[^A-Z0-9]', '', regex=True))
+
+def record_keys(df: pd.DataFrame) -> tuple:
+    """
+    64-bit duplicate keys per row
+
+    APN when present, otherwise normalized address + ZIP. Rows with neither
+    get no key.
+
+    Args:
+        df: Raw, alias-mapped or scored DataFrame
+
+    Returns:
+        (uint64 keys, bool mask of rows that have a key)
+    """
+    keys = np.zeros(len(df), dtype=np.uint64)
+    valid = np.zeros(len(df), dtype=bool)
+
+    address_col = _first_column(df, ADDRESS_COLUMNS)
+    zip_col = _first_column(df, ZIP_COLUMNS)
+    if address_col and zip_col:
+        address = normalize_address(df[address_col])
+        zips = normalize_zip(df[zip_col])
+        has_address = (address.fillna('') != '').to_numpy() & zips.notna().to_numpy()
+        hashed = pd.util.hash_pandas_object(pd.DataFrame({'address': address, 'zip': zips}),
+                                            index=False, hash_key=ADDRESS_HASH_KEY)
+        keys[has_address] = hashed.to_numpy()[has_address]
+        valid |= has_address
+
+    apn_col = _first_column(df, APN_COLUMNS)
+    if apn_col:
+        apn = normalize_apn(df[apn_col])
+        has_apn = (apn.fillna('') != '').to_numpy()
+        hashed = pd.util.hash_pandas_object(apn, index=False, hash_key=APN_HASH_KEY)
+        keys[has_apn] = hashed.to_numpy()[has_apn]
+        valid |= has_apn
+
+    return keys, valid
+
+# ==================== SORTED RUNS ====================
+
+def _sorted_unique(keys: np.ndarray) -> np.ndarray:
+    """Sorted unique keys (a plain sort + neighbour compare beats np.unique on uint64)"""
+    keys = np.sort(keys)
+    if len(keys) == 0:
+        return keys
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+def _contains(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Vectorized membership test against a sorted unique key array"""
+    if len(sorted_keys) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return sorted_keys[positions] == keys
+
+def _add_run(runs: List[np.ndarray], keys: np.ndarray):
+    """
+    Append a sorted run, merging neighbours of similar size
+
+    Run sizes stay geometric, so there are O(log n) runs to search and
+    each key is re-sorted O(log n) times over a whole job.
+    """
+    runs.append(keys)
+    while len(runs) > 1 and len(runs[-2]) <= 2 * len(runs[-1]):
+        last = runs.pop()
+        runs[-1] = _sorted_unique(np.concatenate([runs[-1], last]))
+
+# ==================== INDEX ====================
+
+class DuplicateIndex:
+    """
+    Sorted on-disk index of the record keys of every committed job
+
+    Stored as one .npz file: sorted unique uint64 keys, the job each key was
+    first ingested in (position in `jobs`) and the job ids.
+
+    Example:
+        >>> session = DuplicateIndex().session(job_id)
+        >>> for chunk in chunks:
+        ...     flags = session.check(chunk)
+        >>> session.commit()
+    """
+
+    def __init__(self, path: Path = DUPLICATE_INDEX_PATH):
+        self.path = Path(path)
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.first_job = np.empty(0, dtype=np.int32)
+        self.jobs = []
+        if self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def load(self):
+        """Read the index from disk"""
+        with np.load(self.path, allow_pickle=False) as data:
+            self.keys = data['keys']
+            self.first_job = data['first_job']
+            self.jobs = data['jobs'].tolist()
+
+    def save(self):
+        """Write the index atomically (temp file, then rename)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix('.tmp.npz')
+        np.savez(temp, keys=self.keys, first_job=self.first_job, jobs=np.array(self.jobs, dtype=str))
+        os.replace(temp, self.path)
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """True where a key was ingested by a committed job"""
+        return _contains(self.keys, keys)
+
+    def first_seen(self, keys: np.ndarray) -> np.ndarray:
+        """Job id that first ingested each key (None for new keys)"""
+        found = self.contains(keys)
+        jobs = np.array(self.jobs + [None], dtype=object)
+        positions = np.searchsorted(self.keys, keys[found])
+        result = np.full(len(keys), None, dtype=object)
+        result[found] = jobs[self.first_job[positions]]
+        return result
+
+    def add(self, keys: np.ndarray, job_id: str):
+        """Merge a job's sorted unique keys into the index (in memory)"""
+        new_keys = keys[~self.contains(keys)]
+        if len(new_keys) == 0:
+            return
+        if job_id not in self.jobs:
+            self.jobs.append(job_id)
+        merged = np.concatenate([self.keys, new_keys])
+        order = np.argsort(merged, kind='stable')
+        self.keys = merged[order]
+        self.first_job = np.concatenate([
+            self.first_job, np.full(len(new_keys), self.jobs.index(job_id), dtype=np.int32)
+        ])[order]
+
+    def session(self, job_id: str) -> 'DedupeSession':
+        """Start checking the chunks of one job"""
+        return DedupeSession(self, job_id)
+
+class DedupeSession:
+    """
+    Per-job duplicate checks, chunk by chunk
+
+    Keys of the chunks seen so far are kept as sorted runs; commit() adds
+    them to the persistent index once the job has finished.
+    """
+
+    def __init__(self, index: DuplicateIndex, job_id: str):
+        self.index = index
+        self.job_id = job_id
+        self.runs = []
+        self.counts = {'keyed_rows': 0, 'within_job': 0, 'previously_ingested': 0}
+
+    def check(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Flag the duplicates in one chunk
+
+        Args:
+            df: Chunk (raw, alias-mapped or scored)
+
+        Returns:
+            Dict of bool masks aligned with df rows:
+            - within_job: key already seen earlier in this job (first occurrence unflagged)
+            - previously_ingested: key ingested by an earlier, committed job
+        """
+        keys, valid = record_keys(df)
+        chunk_keys = keys[valid]
+
+        earlier = np.zeros(len(chunk_keys), dtype=bool)
+        for run in self.runs:
+            earlier |= _contains(run, chunk_keys)
+        earlier |= pd.Series(chunk_keys).duplicated(keep='first').to_numpy()
+
+        within_job = np.zeros(len(df), dtype=bool)
+        within_job[valid] = earlier
+        previously_ingested = np.zeros(len(df), dtype=bool)
+        previously_ingested[valid] = self.index.contains(chunk_keys)
+
+        if len(chunk_keys):
+            _add_run(self.runs, _sorted_unique(chunk_keys))
+        self.counts['keyed_rows'] += int(valid.sum())
+        self.counts['within_job'] += int(within_job.sum())
+        self.counts['previously_ingested'] += int(previously_ingested.sum())
+
+        return {'within_job': within_job, 'previously_ingested': previously_ingested}
+
+    def commit(self):
+        """Add this job's keys to the index on disk (re-read first, so concurrent jobs aren't lost)"""
+        keys = _sorted_unique(np.concatenate([np.empty(0, dtype=np.uint64)] + self.runs))
+
+        with _COMMIT_LOCK:
+            if self.index.path.exists():
+                self.index.load()
+            self.index.add(keys, self.job_id)
+            self.index.save()
@@ -0,0 +1,99 @@
+# aps_dtypes.py - Compact Dtype Plan for Scored Frames
+"""
+Downcasts a scored frame right after normalize_and_score
+Low-cardinality strings -> category, percentages/scores -> float32,
+loan age -> int16. Scored CSV output is unchanged by the plan.
+"""
+
+import numpy as np
+import pandas as pd
+
+# ==================== DTYPE PLAN ====================
+
+# Low-cardinality string columns (raw and alias-mapped names)
+CATEGORY_COLUMNS = ['City', 'State', 'ZIP', 'APS_Tier', 'feed_type', 'city', 'state', 'zip']
+
+# float32 columns -> decimals they are rounded to (used to widen them back exactly)
+FLOAT32_COLUMNS = {
+    'LTV %': 2,
+    'Equity %': 2,
+    'APS_Score (v2.0)': 1,
+    'CCI': 1
+}
+
+INT16_COLUMNS = ['Loan_Age_Mo']
+
+# Skip the category cast when unique values exceed this share of rows
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+def apply_dtype_plan(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the compact dtype plan in place
+
+    Columns that are missing, already compact, or don't fit the target
+    dtype (high-cardinality strings, out-of-range ages) are left alone.
+
+    Args:
+        df: Scored DataFrame
+
+    Returns:
+        The same DataFrame with compact dtypes
+
+    Example:
+        >>> df = apply_dtype_plan(normalize_and_score(df))
+    """
+    for col in CATEGORY_COLUMNS:
+        if col not in df.columns or isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        if df[col].nunique() <= max(1, len(df) * CATEGORY_MAX_UNIQUE_RATIO):
+            df[col] = df[col].astype('category')
+
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns and pd.api.types.is_float_dtype(df[col].dtype):
+            df[col] = df[col].astype(np.float32)
+
+    limits = np.iinfo(np.int16)
+    for col in INT16_COLUMNS:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col].dtype):
+            if len(df) == 0 or limits.min <= df[col].min() <= df[col].max() <= limits.max:
+                df[col] = df[col].astype(np.int16)
+
+    return df
+
+def widen(series: pd.Series) -> pd.Series:
+    """
+    float64 view of a plan column for exact aggregates
+
+    float32 percentages and scores are re-rounded to their stored decimals,
+    so medians and DB values match the float64 pipeline (61.3, not 61.2999).
+
+    Args:
+        series: Column of a scored frame
+
+    Returns:
+        float64 Series (other columns are returned unchanged)
+    """
+    if series.dtype != np.float32:
+        return series
+    return series.astype(np.float64).round(FLOAT32_COLUMNS.get(series.name, 6))
+
+# ==================== MEMORY REPORT ====================
+
+def bytes_per_row(df: pd.DataFrame) -> float:
+    """Deep memory footprint per row (strings included)"""
+    return df.memory_usage(deep=True).sum() / max(1, len(df))
+
+def memory_report(before: float, df: pd.DataFrame) -> str:
+    """
+    One-line before/after footprint
+
+    Args:
+        before: bytes_per_row() of the frame before the plan
+        df: Frame after the plan
+
+    Returns:
+        e.g. "601 → 448 bytes/row (-25.4%)"
+    """
+    after = bytes_per_row(df)
+    change = (after - before) / before * 100 if before else 0
+    return f"{before:,.0f} → {after:,.0f} bytes/row ({change:+.1f}%)"
@@ -4,7 +4,13 @@ APS Market Intelligence - Feed Type Router
 Dynamically generates different 7-page layouts based on feed type
 """
 
-# Feed Type Registry
+import numpy as np
+
+# Canonical input fields every feed reads (scoring, health check, quarantine rules)
+SCORING_FIELDS = ["property_address", "city", "state", "zip",
+                  "property_value", "loan_balance", "loan_date"]
+
+# Feed Type Registry (output_fields: canonical fields carried into the feed's outputs)
 FEED_TYPES = {
     "core_equity": {
         "name": "APS Core Equity Feed",
@@ -19,6 +25,7 @@ FEED_TYPES = {
             "sample_data"
         ],
         "color_theme": "teal",
+        "output_fields": SCORING_FIELDS + ["owner_name", "mailing_address"],
         "keywords": ["core", "equity", "refi"]
     },
     
@@ -35,6 +42,7 @@ FEED_TYPES = {
             "sample_data"
         ],
         "color_theme": "yellow",
+        "output_fields": SCORING_FIELDS + ["owner_name", "mailing_address", "sale_date", "sale_price"],
         "keywords": ["transaction", "momentum", "velocity"]
     },
     
@@ -51,6 +59,7 @@ FEED_TYPES = {
             "sample_data"
         ],
         "color_theme": "red",
+        "output_fields": SCORING_FIELDS + ["owner_name", "mailing_address", "loan_rate", "loan_type"],
         "keywords": ["churn", "predictive", "forecast"]
     },
     
@@ -67,6 +76,7 @@ FEED_TYPES = {
             "sample_data"
         ],
         "color_theme": "blue",
+        "output_fields": SCORING_FIELDS + ["sale_date", "sale_price", "property_type", "beds", "baths", "sqft"],
         "keywords": ["market", "activity", "dom", "listing"]
     },
     
@@ -83,6 +93,7 @@ FEED_TYPES = {
             "sample_data"
         ],
         "color_theme": "orange",
+        "output_fields": SCORING_FIELDS + ["lender", "loan_rate", "loan_type"],
         "keywords": ["lender", "engagement", "rate", "volume"]
     }
 }
@@ -103,6 +114,9 @@ def detect_feed_type(csv_path=None, filename=None, data=None):
     2. Filename keywords
     3. CSV column structure
     
+    A feed_type column is read from its first row only; use
+    route_feed_types / feed_groups for files that mix feed types.
+    
     Returns: feed_type_key (str)
     """
     
@@ -147,6 +161,49 @@ def detect_feed_type(csv_path=None, filename=None, data=None):
     # Default fallback
     return "core_equity"
 
+def route_feed_types(data, filename=None) -> np.ndarray:
+    """
+    Feed type of every row at once (vectorized detect_feed_type)
+    
+    Rows with a known feed_type value keep it; every other row gets the
+    filename / column structure fallback, which is the same for the whole
+    frame and so is detected once.
+    
+    Args:
+        data: DataFrame (raw or scored), may mix feed types
+        filename: Optional source filename for the keyword fallback
+    
+    Returns:
+        Object array of feed type keys, one per row
+    """
+    columns = [col for col in data.columns if col != 'feed_type']
+    fallback = detect_feed_type(filename=filename, data=data.iloc[:0][columns])
+    
+    if 'feed_type' not in data.columns:
+        return np.full(len(data), fallback, dtype=object)
+    
+    values = data['feed_type']
+    return np.where(values.isin(list(FEED_TYPES)).to_numpy(), values.to_numpy(dtype=object), fallback)
+
+def feed_groups(data, filename=None) -> dict:
+    """
+    Split a frame's rows by feed type with a single groupby
+    
+    Args:
+        data: DataFrame, may mix feed types
+        filename: Optional source filename for the keyword fallback
+    
+    Returns:
+        Dict of feed type -> row positions (int arrays, file order), feeds
+        in order of first appearance
+    
+    Example:
+        >>> for feed, positions in feed_groups(df).items():
+        ...     rows = df.iloc[positions]
+    """
+    feeds = route_feed_types(data, filename)
+    return data.groupby(feeds, sort=False).indices
+
 def get_feed_config(feed_type):
     """
     Get configuration for a specific feed type
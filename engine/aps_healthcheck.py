@@ -1,16 +1,285 @@
 # 18-Point Health Check - Complete Implementation
+"""
+Single-pass health check engine
+Money and date columns come from normalization's parsed source arrays
+(normalize_and_score(df, sources=...)) instead of being parsed again, and
+every check reads shared NumPy arrays and masks instead of rescanning the frame.
+Checks are computed as mergeable partial statistics (health_partial), so
+chunked ingestion can build the report chunk by chunk (health_report).
+"""
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-def health_check(df):
+from engine.aps_parsers import parse_money, parse_dates, header_signature
+from engine.aps_dtypes import widen
+from engine.aps_sketch import QuantileSketch, merge_sketches, DEFAULT_EXACT_LIMIT
+
+VALID_TIERS = ['Platinum', 'Gold', 'Silver', 'Nurture']
+CRITICAL_COLUMNS = ['Property Address', 'ZIP', 'EstValue', 'TotalLoanBal', 'LastLoanDate']
+FRESHNESS_CUTOFF = np.datetime64('2020-01-01')
+
+# Engine column -> canonical field name of alias-mapped frames (API ingest)
+CANONICAL_COLUMNS = {
+    'Property Address': 'property_address',
+    'ZIP': 'zip',
+    'State': 'state',
+    'Owner Name': 'owner_name',
+    'EstValue': 'property_value',
+    'TotalLoanBal': 'loan_balance',
+    'LastLoanDate': 'loan_date'
+}
+
+# ==================== SHARED ARRAYS ====================
+
+def _matches(series: pd.Series, pattern: str) -> np.ndarray:
     """
-    18-Point comprehensive data quality health check
-    Returns dict with check name and status (PASS/WARN/FAIL + details)
+    Regex match per row, tested once per distinct value
+    
+    Same result as series.astype(str).str.match(pattern) with missing
+    values counted as non-matching.
+    """
+    codes, uniques = pd.factorize(series)
+    hits = np.asarray(pd.Index(uniques).astype(str).str.match(pattern, na=False), dtype=bool)
+    if not len(hits):
+        return np.zeros(len(codes), dtype=bool)
+    return (codes >= 0) & hits[np.maximum(codes, 0)]
+
+def _numbers(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Column as a NumPy array (float32/int16 plan columns are not copied)"""
+    return df[col].to_numpy()
+
+# ==================== PARTIAL STATISTICS ====================
+
+def _engine_names(columns) -> dict:
+    """Engine column name -> the frame's column (engine name first, then canonical field)"""
+    names = {col: col for col in columns}
+    for col, field in CANONICAL_COLUMNS.items():
+        if col not in names and field in names:
+            names[col] = field
+    return names
+
+def _duplicate_keys(df: pd.DataFrame, address_col: str = 'Property Address', zip_col: str = 'ZIP') -> tuple:
+    """
+    (unique key hashes, row counts) of the Property Address + ZIP pairs
+    
+    Numeric ZIPs are hashed in their string form, so chunks whose ZIP column
+    was inferred as int in one and str in another still share keys.
+    """
+    zips = df[zip_col]
+    if pd.api.types.is_numeric_dtype(zips.dtype):
+        numbers = zips.to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.all(np.isnan(numbers) | (numbers == np.round(numbers))):
+            zips = zips.astype('Int64')
+        zips = zips.astype(str)
+    keys = pd.util.hash_pandas_object(
+        pd.DataFrame({'address': df[address_col], 'zip': zips}),
+        index=False
+    ).to_numpy()
+    return np.unique(keys, return_counts=True)
+
+def _sum_key_counts(runs: list) -> tuple:
+    """Merge (sorted keys, row counts) runs into one, summing the counts of equal keys"""
+    keys = np.concatenate([run[0] for run in runs])
+    counts = np.concatenate([run[1] for run in runs])
+    order = np.argsort(keys, kind='stable')
+    keys, counts = keys[order], counts[order]
+    if len(keys) == 0:
+        return keys, counts
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.add.reduceat(counts, starts)
+
+def _add_key_run(runs: list, run: tuple):
+    """
+    Append a (keys, counts) run, merging neighbours of similar size
+    
+    Same scheme as aps_dedupe._add_run: each key is re-merged O(log n)
+    times over a whole job, not once per merged partial.
+    """
+    runs.append(run)
+    while len(runs) > 1 and len(runs[-2][0]) <= 2 * len(runs[-1][0]):
+        last = runs.pop()
+        runs[-1] = _sum_key_counts([runs[-1], last])
+
+class HealthPartial:
+    """
+    Mergeable statistics behind the 18-point health check
+    
+    Holds counts, per-key duplicate counts, tier counts and quantile
+    sketches for the medians (keyed by column; 'property_value' for the
+    parsed value column). Partials of separate chunks merge into the
+    partial of the whole input, and health_report turns any partial into
+    the usual check dict. Duplicate keys are kept as sorted (keys, counts)
+    runs of geometric size, so merging many chunks stays O(n log n). A
+    partial built with hash_keys=False counts its duplicates directly and
+    cannot be merged.
+    
+    Example:
+        >>> total = HealthPartial()
+        >>> for chunk in chunks:
+        ...     total.merge(health_partial(chunk))
+        >>> checks = health_report(total)
+    """
+    
+    def __init__(self):
+        self.columns = None
+        self.counts = {}
+        self.sketches = {}
+        self.tiers = {}
+        self.duplicate_runs = []
+        self.duplicate_rows = None
+    
+    def merge(self, other: 'HealthPartial') -> 'HealthPartial':
+        """Fold another partial into this one (in place)"""
+        if other.columns is None:
+            return self
+        if self.duplicate_rows is not None or other.duplicate_rows is not None:
+            raise ValueError("Partials built with hash_keys=False cannot be merged")
+        self.columns = other.columns if self.columns is None else self.columns & other.columns
+        
+        for name, count in other.counts.items():
+            self.counts[name] = self.counts.get(name, 0) + count
+        for name, sketch in other.sketches.items():
+            if name in self.sketches:
+                self.sketches[name].merge(sketch)
+            else:
+                self.sketches[name] = merge_sketches([sketch])
+        for tier, count in other.tiers.items():
+            self.tiers[tier] = self.tiers.get(tier, 0) + count
+        
+        for run in other.duplicate_runs:
+            _add_key_run(self.duplicate_runs, run)
+        return self
+    
+    def duplicates(self) -> int:
+        """Rows whose Property Address + ZIP pair occurs more than once"""
+        if self.duplicate_rows is not None:
+            return self.duplicate_rows
+        if not self.duplicate_runs:
+            return 0
+        if len(self.duplicate_runs) > 1:
+            self.duplicate_runs = [_sum_key_counts(self.duplicate_runs)]
+        counts = self.duplicate_runs[0][1]
+        return int(counts[counts > 1].sum())
+
+def health_partial(df, sources=None, exact_limit: int = DEFAULT_EXACT_LIMIT,
+                   hash_keys: bool = True) -> HealthPartial:
+    """
+    Health statistics for one frame or chunk
+    
+    Args:
+        df: Scored DataFrame (or chunk)
+        sources: Parsed source arrays from normalize_and_score(df, sources=...)
+                 (property_value, loan_date); parsed here when not given
+        exact_limit: Values the median sketches keep exactly
+        hash_keys: Keep per-key duplicate counts so the partial can be merged;
+                   False counts duplicates within df only (faster)
+    
+    Returns:
+        HealthPartial
+    """
+    partial = HealthPartial()
+    # Alias-mapped frames ('property_address', 'zip', ...) are checked under the engine names
+    names = _engine_names(df.columns)
+    columns = frozenset(names)
+    partial.columns = columns
+    sources = sources or {}
+    counts = partial.counts
+    counts['total_records'] = len(df)
+    
+    def sketch(values):
+        return QuantileSketch(exact_limit=exact_limit).update(values)
+    
+    # Presence masks, shared by the completeness checks and the missing-value count
+    present = {col: df[names[col]].notna().to_numpy() for col in CRITICAL_COLUMNS + ['Owner Name'] if col in names}
+    counts['missing_critical'] = sum(int(len(df) - present[col].sum()) for col in CRITICAL_COLUMNS if col in present)
+    if 'Property Address' in present:
+        counts['address_complete'] = int(present['Property Address'].sum())
+    if 'Owner Name' in present:
+        counts['owner_present'] = int(present['Owner Name'].sum())
+    
+    if 'ZIP' in names:
+        counts['valid_zips'] = int(_matches(df[names['ZIP']], r'^\d{5}$').sum())
+    if 'State' in names:
+        counts['valid_states'] = int(_matches(df[names['State']], r'^[A-Z]{2}$').sum())
+    
+    # Parsed money/date arrays (from normalization when available)
+    value_col = names.get('EstValue')
+    if value_col is not None:
+        property_value = sources.get('property_value')
+        if property_value is None:
+            property_value = parse_money(df[value_col])
+        property_value = np.asarray(property_value, dtype=np.float64)
+        counts['valid_values'] = int(((property_value >= 50000) & (property_value <= 10000000)).sum())
+        partial.sketches['property_value'] = sketch(property_value)
+    
+    date_col = names.get('LastLoanDate')
+    if date_col is not None:
+        loan_dates = sources.get('loan_date')
+        if loan_dates is None:
+            loan_dates = parse_dates(df[date_col], header_signature(df.columns), date_col)
+        loan_dates = np.asarray(loan_dates, dtype='datetime64[ns]')
+        counts['valid_dates'] = int((~np.isnat(loan_dates)).sum())
+        counts['recent_loans'] = int((loan_dates >= FRESHNESS_CUTOFF).sum())
+    
+    ltv = _numbers(df, 'LTV %') if 'LTV %' in columns else None
+    ages = _numbers(df, 'Loan_Age_Mo') if 'Loan_Age_Mo' in columns else None
+    
+    if ltv is not None:
+        counts['ltv_valid'] = int(((ltv >= 0) & (ltv <= 100)).sum())
+        partial.sketches['LTV %'] = sketch(widen(df['LTV %']).to_numpy(dtype=np.float64))
+        if 'Equity %' in columns:
+            counts['equity_accuracy'] = int((np.abs((_numbers(df, 'Equity %') + ltv) - 100) < 1).sum())
+    
+    if ages is not None:
+        counts['reasonable_age'] = int(((ages >= 0) & (ages <= 360)).sum())
+        partial.sketches['Loan_Age_Mo'] = sketch(ages.astype(np.float64))
+        if ltv is not None:
+            counts['refi_eligible'] = int(((ltv <= 80) & (ages >= 18)).sum())
+    
+    if 'Property Address' in names and 'ZIP' in names:
+        if hash_keys:
+            partial.duplicate_runs = [_duplicate_keys(df, names['Property Address'], names['ZIP'])]
+        else:
+            partial.duplicate_rows = int(df.duplicated(subset=[names['Property Address'], names['ZIP']], keep=False).sum())
+    
+    if 'APS_Score (v2.0)' in columns:
+        scores = _numbers(df, 'APS_Score (v2.0)')
+        counts['valid_scores'] = int(((scores >= 0) & (scores <= 100)).sum())
+        partial.sketches['APS_Score (v2.0)'] = sketch(widen(df['APS_Score (v2.0)']).to_numpy(dtype=np.float64))
+    
+    if 'APS_Tier' in columns:
+        partial.tiers = {tier: int(count) for tier, count in df['APS_Tier'].value_counts().items()}
+    
+    if 'CCI' in columns:
+        cci = _numbers(df, 'CCI')
+        counts['valid_cci'] = int(((cci >= 0) & (cci <= 100)).sum())
+        partial.sketches['CCI'] = sketch(widen(df['CCI']).to_numpy(dtype=np.float64))
+    
+    return partial
+
+# ==================== REPORT ====================
+
+def health_report(partial: HealthPartial) -> dict:
+    """
+    18-point check dict from (merged) partial statistics
+    
+    Args:
+        partial: HealthPartial of a whole frame, or of every chunk merged
+    
+    Returns:
+        Dict with check name and status (PASS/WARN/FAIL + details)
     """
     
     checks = {}
-    total_records = len(df)
+    counts = partial.counts
+    sketches = partial.sketches
+    columns = partial.columns or frozenset()
+    total_records = counts.get('total_records', 0)
+    has_dates = 'LastLoanDate' in columns or 'loan_date' in columns
+    
+    def pct(count):
+        return (count / total_records * 100) if total_records > 0 else 0
     
     # ===== 1. Record Count Check =====
     checks['1_Record_Count'] = {
@@ -20,9 +289,9 @@ def health_check(df):
     }
     
     # ===== 2. Address Completeness =====
-    if 'Property Address' in df.columns:
-        address_complete = df['Property Address'].notna().sum()
-        address_pct = (address_complete / total_records * 100) if total_records > 0 else 0
+    if 'Property Address' in columns:
+        address_complete = counts['address_complete']
+        address_pct = pct(address_complete)
         checks['2_Address_Completeness'] = {
             'status': 'PASS' if address_pct >= 95 else 'WARN' if address_pct >= 80 else 'FAIL',
             'value': f'{address_pct:.1f}%',
@@ -32,9 +301,9 @@ def health_check(df):
         checks['2_Address_Completeness'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
     
     # ===== 3. ZIP Code Validity =====
-    if 'ZIP' in df.columns:
-        valid_zips = df['ZIP'].astype(str).str.match(r'^\d{5}$').sum()
-        zip_pct = (valid_zips / total_records * 100) if total_records > 0 else 0
+    if 'ZIP' in columns:
+        valid_zips = counts['valid_zips']
+        zip_pct = pct(valid_zips)
         checks['3_ZIP_Validity'] = {
             'status': 'PASS' if zip_pct >= 95 else 'WARN' if zip_pct >= 80 else 'FAIL',
             'value': f'{zip_pct:.1f}%',
@@ -44,12 +313,10 @@ def health_check(df):
         checks['3_ZIP_Validity'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
     
     # ===== 4. Property Value Range Check =====
-    value_col = 'EstValue' if 'EstValue' in df.columns else 'property_value'
-    if value_col in df.columns:
-        value_numeric = pd.to_numeric(df[value_col], errors='coerce')
-        valid_values = ((value_numeric >= 50000) & (value_numeric <= 10000000)).sum()
-        value_pct = (valid_values / total_records * 100) if total_records > 0 else 0
-        median_value = value_numeric.median()
+    if 'property_value' in sketches:
+        valid_values = counts['valid_values']
+        value_pct = pct(valid_values)
+        median_value = sketches['property_value'].median()
         checks['4_Property_Value_Range'] = {
             'status': 'PASS' if value_pct >= 90 else 'WARN' if value_pct >= 70 else 'FAIL',
             'value': f'${median_value:,.0f}' if not pd.isna(median_value) else 'N/A',
@@ -59,10 +326,10 @@ def health_check(df):
         checks['4_Property_Value_Range'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
     
     # ===== 5. LTV Range Check (0-100%) =====
-    if 'LTV %' in df.columns:
-        ltv_valid = ((df['LTV %'] >= 0) & (df['LTV %'] <= 100)).sum()
-        ltv_pct = (ltv_valid / total_records * 100) if total_records > 0 else 0
-        median_ltv = df['LTV %'].median()
+    if 'LTV %' in columns:
+        ltv_valid = counts['ltv_valid']
+        ltv_pct = pct(ltv_valid)
+        median_ltv = sketches['LTV %'].median()
         checks['5_LTV_Range'] = {
             'status': 'PASS' if ltv_pct >= 95 else 'WARN' if ltv_pct >= 80 else 'FAIL',
             'value': f'{median_ltv:.1f}%' if not pd.isna(median_ltv) else 'N/A',
@@ -72,9 +339,9 @@ def health_check(df):
         checks['5_LTV_Range'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
     
     # ===== 6. Equity % Accuracy Check =====
-    if 'Equity %' in df.columns and 'LTV %' in df.columns:
-        equity_accuracy = (abs((df['Equity %'] + df['LTV %']) - 100) < 1).sum()
-        equity_pct = (equity_accuracy / total_records * 100) if total_records > 0 else 0
+    if 'Equity %' in columns and 'LTV %' in columns:
+        equity_accuracy = counts['equity_accuracy']
+        equity_pct = pct(equity_accuracy)
         checks['6_Equity_Accuracy'] = {
             'status': 'PASS' if equity_pct >= 95 else 'WARN' if equity_pct >= 80 else 'FAIL',
             'value': f'{equity_pct:.1f}%',
@@ -84,10 +351,9 @@ def health_check(df):
         checks['6_Equity_Accuracy'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Required columns missing'}
     
     # ===== 7. Loan Date Format Check =====
-    date_col = 'LastLoanDate' if 'LastLoanDate' in df.columns else 'loan_date'
-    if date_col in df.columns:
-        valid_dates = pd.to_datetime(df[date_col], errors='coerce').notna().sum()
-        date_pct = (valid_dates / total_records * 100) if total_records > 0 else 0
+    if has_dates:
+        valid_dates = counts['valid_dates']
+        date_pct = pct(valid_dates)
         checks['7_Loan_Date_Format'] = {
             'status': 'PASS' if date_pct >= 90 else 'WARN' if date_pct >= 70 else 'FAIL',
             'value': f'{date_pct:.1f}%',
@@ -97,10 +363,10 @@ def health_check(df):
         checks['7_Loan_Date_Format'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
     
     # ===== 8. Loan Age Reasonableness =====
-    if 'Loan_Age_Mo' in df.columns:
-        reasonable_age = ((df['Loan_Age_Mo'] >= 0) & (df['Loan_Age_Mo'] <= 360)).sum()
-        age_pct = (reasonable_age / total_records * 100) if total_records > 0 else 0
-        median_age = df['Loan_Age_Mo'].median()
+    if 'Loan_Age_Mo' in columns:
+        reasonable_age = counts['reasonable_age']
+        age_pct = pct(reasonable_age)
+        median_age = sketches['Loan_Age_Mo'].median()
         checks['8_Loan_Age_Reasonable'] = {
             'status': 'PASS' if age_pct >= 95 else 'WARN' if age_pct >= 80 else 'FAIL',
             'value': f'{median_age:.0f} mo' if not pd.isna(median_age) else 'N/A',
@@ -110,9 +376,9 @@ def health_check(df):
         checks['8_Loan_Age_Reasonable'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
     
     # ===== 9. Duplicate Detection =====
-    if 'Property Address' in df.columns and 'ZIP' in df.columns:
-        duplicates = df.duplicated(subset=['Property Address', 'ZIP'], keep=False).sum()
-        dup_pct = (duplicates / total_records * 100) if total_records > 0 else 0
+    if 'Property Address' in columns and 'ZIP' in columns:
+        duplicates = partial.duplicates()
+        dup_pct = pct(duplicates)
         checks['9_Duplicate_Detection'] = {
             'status': 'PASS' if dup_pct == 0 else 'WARN' if dup_pct < 5 else 'FAIL',
             'value': f'{duplicates}',
@@ -122,13 +388,9 @@ def health_check(df):
         checks['9_Duplicate_Detection'] = {'status': 'WARN', 'value': 'N/A', 'message': 'Cannot check - missing columns'}
     
     # ===== 10. Missing Value Count =====
-    missing_critical = 0
-    critical_cols = ['Property Address', 'ZIP', 'EstValue', 'TotalLoanBal', 'LastLoanDate']
-    for col in critical_cols:
-        if col in df.columns:
-            missing_critical += df[col].isna().sum()
+    missing_critical = counts['missing_critical']
     
-    missing_pct = (missing_critical / (total_records * len(critical_cols)) * 100) if total_records > 0 else 0
+    missing_pct = (missing_critical / (total_records * len(CRITICAL_COLUMNS)) * 100) if total_records > 0 else 0
     checks['10_Missing_Values'] = {
         'status': 'PASS' if missing_pct < 5 else 'WARN' if missing_pct < 15 else 'FAIL',
         'value': f'{missing_critical}',
@@ -136,10 +398,10 @@ def health_check(df):
     }
     
     # ===== 11. APS Score Distribution =====
-    if 'APS_Score (v2.0)' in df.columns:
-        valid_scores = ((df['APS_Score (v2.0)'] >= 0) & (df['APS_Score (v2.0)'] <= 100)).sum()
-        score_pct = (valid_scores / total_records * 100) if total_records > 0 else 0
-        median_score = df['APS_Score (v2.0)'].median()
+    if 'APS_Score (v2.0)' in columns:
+        valid_scores = counts['valid_scores']
+        score_pct = pct(valid_scores)
+        median_score = sketches['APS_Score (v2.0)'].median()
         checks['11_APS_Score_Distribution'] = {
             'status': 'PASS' if score_pct >= 95 else 'WARN',
             'value': f'{median_score:.1f}' if not pd.isna(median_score) else 'N/A',
@@ -149,10 +411,11 @@ def health_check(df):
         checks['11_APS_Score_Distribution'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
     
     # ===== 12. Tier Assignment Coverage =====
-    if 'APS_Tier' in df.columns:
-        valid_tiers = df['APS_Tier'].isin(['Platinum', 'Gold', 'Silver', 'Nurture']).sum()
-        tier_pct = (valid_tiers / total_records * 100) if total_records > 0 else 0
-        tier_dist = df['APS_Tier'].value_counts().to_dict()
+    if 'APS_Tier' in columns:
+        # Most common first, like value_counts (ties keep first-seen order)
+        tier_dist = dict(sorted(partial.tiers.items(), key=lambda item: -item[1]))
+        valid_tiers = sum(int(tier_dist.get(tier, 0)) for tier in VALID_TIERS)
+        tier_pct = pct(valid_tiers)
         checks['12_Tier_Assignment'] = {
             'status': 'PASS' if tier_pct >= 95 else 'WARN',
             'value': f'{tier_pct:.1f}%',
@@ -162,10 +425,10 @@ def health_check(df):
         checks['12_Tier_Assignment'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
     
     # ===== 13. CCI Index Validity =====
-    if 'CCI' in df.columns:
-        valid_cci = ((df['CCI'] >= 0) & (df['CCI'] <= 100)).sum()
-        cci_pct = (valid_cci / total_records * 100) if total_records > 0 else 0
-        median_cci = df['CCI'].median()
+    if 'CCI' in columns:
+        valid_cci = counts['valid_cci']
+        cci_pct = pct(valid_cci)
+        median_cci = sketches['CCI'].median()
         checks['13_CCI_Validity'] = {
             'status': 'PASS' if cci_pct >= 95 else 'WARN',
             'value': f'{median_cci:.1f}' if not pd.isna(median_cci) else 'N/A',
@@ -175,9 +438,9 @@ def health_check(df):
         checks['13_CCI_Validity'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Column missing'}
     
     # ===== 14. State Code Format =====
-    if 'State' in df.columns:
-        valid_states = df['State'].astype(str).str.match(r'^[A-Z]{2}$').sum()
-        state_pct = (valid_states / total_records * 100) if total_records > 0 else 0
+    if 'State' in columns:
+        valid_states = counts['valid_states']
+        state_pct = pct(valid_states)
         checks['14_State_Code_Format'] = {
             'status': 'PASS' if state_pct >= 95 else 'WARN',
             'value': f'{state_pct:.1f}%',
@@ -187,9 +450,9 @@ def health_check(df):
         checks['14_State_Code_Format'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
     
     # ===== 15. Refi Eligibility Count =====
-    if 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
-        refi_eligible = ((df['LTV %'] <= 80) & (df['Loan_Age_Mo'] >= 18)).sum()
-        refi_pct = (refi_eligible / total_records * 100) if total_records > 0 else 0
+    if 'LTV %' in columns and 'Loan_Age_Mo' in columns:
+        refi_eligible = counts['refi_eligible']
+        refi_pct = pct(refi_eligible)
         checks['15_Refi_Eligibility'] = {
             'status': 'PASS' if refi_pct >= 50 else 'WARN' if refi_pct >= 25 else 'INFO',
             'value': f'{refi_pct:.1f}%',
@@ -199,9 +462,9 @@ def health_check(df):
         checks['15_Refi_Eligibility'] = {'status': 'FAIL', 'value': 'N/A', 'message': 'Required columns missing'}
     
     # ===== 16. Owner Name Completeness =====
-    if 'Owner Name' in df.columns:
-        owner_present = df['Owner Name'].notna().sum()
-        owner_pct = (owner_present / total_records * 100) if total_records > 0 else 0
+    if 'Owner Name' in columns:
+        owner_present = counts['owner_present']
+        owner_pct = pct(owner_present)
         checks['16_Owner_Name_Present'] = {
             'status': 'PASS' if owner_pct >= 90 else 'WARN' if owner_pct >= 70 else 'FAIL',
             'value': f'{owner_pct:.1f}%',
@@ -211,11 +474,9 @@ def health_check(df):
         checks['16_Owner_Name_Present'] = {'status': 'FAIL', 'value': '0%', 'message': 'Column missing'}
     
     # ===== 17. Data Freshness Check =====
-    date_col = 'LastLoanDate' if 'LastLoanDate' in df.columns else 'loan_date'
-    if date_col in df.columns:
-        loan_dates = pd.to_datetime(df[date_col], errors='coerce')
-        recent_loans = (loan_dates >= '2020-01-01').sum()
-        recent_pct = (recent_loans / total_records * 100) if total_records > 0 else 0
+    if has_dates:
+        recent_loans = counts['recent_loans']
+        recent_pct = pct(recent_loans)
         checks['17_Data_Freshness'] = {
             'status': 'PASS' if recent_pct >= 70 else 'WARN' if recent_pct >= 40 else 'INFO',
             'value': f'{recent_pct:.1f}%',
@@ -246,4 +507,27 @@ def health_check(df):
         'message': f'Pass:{pass_count} Warn:{warn_count} Fail:{fail_count}'
     }
     
-    return checks
\ No newline at end of file
+    return checks
+
+def health_check(df, sources=None, sketches=None):
+    """
+    18-Point comprehensive data quality health check
+    Returns dict with check name and status (PASS/WARN/FAIL + details)
+    
+    Args:
+        df: Scored DataFrame
+        sources: Parsed source arrays from normalize_and_score(df, sources=...)
+                 (property_value, loan_date); parsed here when not given
+        sketches: Optional dict that receives the median sketches by column,
+                  so later stages (aggregates, cover page) reuse them
+    
+    Example:
+        >>> sources, sketches = {}, {}
+        >>> df = normalize_and_score(df, sources=sources)
+        >>> checks = health_check(df, sources, sketches)
+    """
+    # Whole frame in hand: duplicates counted in place
+    partial = health_partial(df, sources, hash_keys=False)
+    if sketches is not None:
+        sketches.update(partial.sketches)
+    return health_report(partial)
@@ -0,0 +1,271 @@
+# aps_io.py - Pluggable CSV Reader Layer
+"""
+Single entry point for every CSV ingest read
+Engines:
+- pyarrow: multithreaded Arrow CSV reader, Arrow-backed string columns
+- c: the default pandas C parser
+- auto: pyarrow when it is installed, otherwise c
+Set CSV_ENGINE in aps_config (or the APS_CSV_ENGINE env var) per deployment.
+"""
+
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.aps_config import CSV_ENGINE
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional
+    pa = None
+    pa_csv = None
+
+CSV_ENGINES = ['auto', 'pyarrow', 'c']
+
+# read_csv options the Arrow path knows how to translate
+ARROW_OPTIONS = {'encoding', 'dtype', 'keep_default_na', 'usecols'}
+
+# Read dtypes the Arrow path can declare (str = Arrow string, category = dictionary)
+ARROW_DTYPES = {str, 'str', 'float64', 'category'}
+
+# Arrow block size for streamed (chunked) reads
+ARROW_BLOCK_BYTES = 8 << 20
+
+# Arrow-backed strings with NaN missing values (the pandas 3 default str dtype)
+ARROW_STRING = None
+if pa is not None:
+    try:
+        ARROW_STRING = pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:  # pandas < 2.3
+        ARROW_STRING = pd.StringDtype('pyarrow')
+
+# ==================== ENGINE SELECTION ====================
+
+def resolve_engine(engine: Optional[str] = None) -> str:
+    """
+    Reader engine for this deployment
+
+    Args:
+        engine: 'auto', 'pyarrow' or 'c' (default: CSV_ENGINE)
+
+    Returns:
+        'pyarrow' or 'c'
+    """
+    engine = (engine or CSV_ENGINE).lower()
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine: {engine} (expected one of {', '.join(CSV_ENGINES)})")
+
+    if engine == 'pyarrow' and pa is None:
+        print("  ⚠ pyarrow not installed - using the pandas C reader")
+        return 'c'
+    if engine == 'auto':
+        return 'pyarrow' if pa is not None else 'c'
+    return engine
+
+def _arrow_supports(kwargs: dict) -> bool:
+    """True when every read option can be expressed as Arrow read options"""
+    if set(kwargs) - ARROW_OPTIONS:
+        return False
+    dtype = kwargs.get('dtype')
+    if isinstance(dtype, dict):
+        return all(value in ARROW_DTYPES for value in dtype.values())
+    return dtype is None or dtype is str
+
+def _fixed_types(kwargs: dict) -> bool:
+    """True when every column read gets an explicit type (the Arrow stream reader can't widen later)"""
+    dtype = kwargs.get('dtype')
+    if dtype is str:
+        return True
+    usecols = kwargs.get('usecols')
+    return isinstance(dtype, dict) and usecols is not None and all(col in dtype for col in usecols)
+
+def _arrow_type(dtype):
+    """Arrow type of a read dtype"""
+    if dtype == 'float64':
+        return pa.float64()
+    if dtype == 'category':
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+# ==================== PUBLIC API ====================
+
+def read_csv(path: Path, engine: Optional[str] = None, **kwargs) -> pd.DataFrame:
+    """
+    Read a whole CSV through the configured engine
+
+    Head reads (nrows) and options Arrow can't express use the C parser.
+
+    Args:
+        path: CSV file
+        engine: Override the deployment engine
+        **kwargs: pd.read_csv options (encoding, dtype, keep_default_na, usecols, nrows, ...)
+
+    Returns:
+        DataFrame
+
+    Example:
+        >>> df = read_csv(csv_path, encoding='utf-8-sig')
+    """
+    if resolve_engine(engine) == 'pyarrow' and _arrow_supports(kwargs):
+        return _arrow_read(path, kwargs)
+    return pd.read_csv(path, **kwargs)
+
+def iter_csv(path: Path, chunk_rows: int, engine: Optional[str] = None, **kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV in chunks of `chunk_rows` rows through the configured engine
+
+    The Arrow streaming reader fixes column types from its first block, so
+    it is only used when every column read has an explicit dtype (dtype=str,
+    or a dtype map covering usecols); otherwise chunks come from the C
+    parser, which infers types per chunk.
+
+    Args:
+        path: CSV file
+        chunk_rows: Rows per chunk
+        engine: Override the deployment engine
+        **kwargs: pd.read_csv options
+
+    Yields:
+        DataFrame per chunk (RangeIndex continues across chunks)
+    """
+    if resolve_engine(engine) == 'pyarrow' and _arrow_supports(kwargs) and _fixed_types(kwargs):
+        yield from _arrow_iter(path, chunk_rows, kwargs)
+        return
+
+    with pd.read_csv(path, chunksize=chunk_rows, **kwargs) as reader:
+        yield from reader
+
+# ==================== ARROW BACKEND ====================
+
+def _arrow_encoding(encoding: Optional[str]) -> str:
+    """Arrow codec name (Arrow skips a UTF-8 BOM on its own)"""
+    if encoding is None or encoding.lower().replace('-', '').replace('_', '') in ('utf8', 'utf8sig'):
+        return 'utf8'
+    return encoding
+
+def _read_header(path: Path, encoding: str) -> list:
+    """Column names from the first row"""
+    return list(pd.read_csv(path, nrows=0, encoding=encoding).columns)
+
+def _arrow_options(path: Path, kwargs: dict):
+    """Translate pd.read_csv options into Arrow read/convert options"""
+    encoding = kwargs.get('encoding')
+    read_options = pa_csv.ReadOptions(encoding=_arrow_encoding(encoding), block_size=ARROW_BLOCK_BYTES)
+
+    keep_default_na = kwargs.get('keep_default_na', True)
+    convert = {
+        'strings_can_be_null': keep_default_na,
+        'quoted_strings_can_be_null': keep_default_na
+    }
+    if not keep_default_na:
+        convert['null_values'] = []
+
+    usecols = kwargs.get('usecols')
+    if usecols is not None:
+        convert['include_columns'] = list(usecols)
+
+    dtype = kwargs.get('dtype')
+    if dtype is str:
+        columns = usecols if usecols is not None else _read_header(path, encoding or 'utf-8-sig')
+        convert['column_types'] = {col: pa.string() for col in columns}
+    elif isinstance(dtype, dict):
+        convert['column_types'] = {col: _arrow_type(value) for col, value in dtype.items()}
+
+    return read_options, pa_csv.ConvertOptions(**convert)
+
+def _to_pandas(table) -> pd.DataFrame:
+    """Arrow table -> pandas, keeping string columns Arrow-backed"""
+    return table.to_pandas(types_mapper={pa.string(): ARROW_STRING}.get)
+
+def _arrow_read(path: Path, kwargs: dict) -> pd.DataFrame:
+    """Whole-file multithreaded Arrow read"""
+    read_options, convert_options = _arrow_options(path, kwargs)
+    table = pa_csv.read_csv(path, read_options=read_options, convert_options=convert_options)
+    return _to_pandas(table)
+
+def _arrow_iter(path: Path, chunk_rows: int, kwargs: dict) -> Iterator[pd.DataFrame]:
+    """Streamed Arrow read, re-cut into fixed-size row chunks"""
+    read_options, convert_options = _arrow_options(path, kwargs)
+    reader = pa_csv.open_csv(path, read_options=read_options, convert_options=convert_options)
+
+    pending = []
+    pending_rows = 0
+    start = 0
+
+    def emit(table):
+        nonlocal start
+        chunk = _to_pandas(table)
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        return chunk
+
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows < chunk_rows:
+            continue
+
+        table = pa.Table.from_batches(pending, schema=reader.schema)
+        offset = 0
+        while pending_rows - offset >= chunk_rows:
+            yield emit(table.slice(offset, chunk_rows))
+            offset += chunk_rows
+        rest = table.slice(offset)
+        pending = rest.to_batches() if rest.num_rows else []
+        pending_rows = rest.num_rows
+
+    if pending_rows:
+        yield emit(pa.Table.from_batches(pending, schema=reader.schema))
+
+# ==================== BYTE SAMPLES ====================
+
+def _whole_lines(block: bytes, skip_first: bool, at_end: bool) -> bytes:
+    """Trim a byte range to complete lines (a partial first / last line is dropped)"""
+    if skip_first:
+        newline = block.find(b'\n')
+        block = block[newline + 1:] if newline >= 0 else b''
+    if not at_end:
+        newline = block.rfind(b'\n')
+        block = block[:newline + 1] if newline >= 0 else b''
+    return block
+
+def sample_csv_bytes(read_range: Callable[[int, int], bytes], sample_bytes: int,
+                     total_bytes: Optional[int] = None, strata: int = 1) -> bytes:
+    """
+    A small CSV built from byte ranges of a large one, without reading it all
+
+    With strata > 1 and a known size, `strata` evenly spaced ranges
+    share the byte budget (the first one holds the header); otherwise the
+    head of the file is read. Lines cut at a range edge are dropped, so a
+    quoted field with embedded newlines can still cut a row short - read
+    the sample with on_bad_lines='skip'.
+
+    Args:
+        read_range: (offset, length) -> bytes, e.g. an HTTP Range request or seek + read
+        sample_bytes: Byte budget
+        total_bytes: File size, when known
+        strata: Number of byte ranges for a stratified sample
+
+    Returns:
+        CSV bytes: header + complete lines
+
+    Example:
+        >>> data = sample_csv_bytes(lambda start, n: f.seek(start) or f.read(n), 256 << 10, size, strata=8)
+        >>> df = pd.read_csv(io.BytesIO(data), on_bad_lines='skip')
+    """
+    if total_bytes is not None and total_bytes <= sample_bytes:
+        return read_range(0, total_bytes)
+    if strata <= 1 or total_bytes is None:
+        head = read_range(0, sample_bytes)
+        return _whole_lines(head, False, len(head) < sample_bytes)
+
+    block_bytes = sample_bytes // strata
+    offsets = np.linspace(0, total_bytes - block_bytes, strata).astype(np.int64)
+    blocks = []
+    for i, offset in enumerate(offsets):
+        block = read_range(int(offset), block_bytes)
+        blocks.append(_whole_lines(block, i > 0, offset + block_bytes >= total_bytes))
+    return b''.join(blocks)
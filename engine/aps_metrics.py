@@ -5,44 +5,66 @@ Source: metrics.ts from backend package
 """
 
 import math
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
+import numpy as np
+import pandas as pd
+
+from engine.aps_scoring import py_round
+
 # ==================== UTILITY FUNCTIONS ====================
 
-def clip(v: float, lo: float, hi: float) -> float:
+def clip(v, lo: float, hi: float):
     """
     Clip value between min and max bounds
     
     Args:
-        v: Value to clip
+        v: Value to clip (scalar, array or Series)
         lo: Lower bound
         hi: Upper bound
     
     Returns:
-        Clipped value
+        Clipped value (float64 array for batch inputs)
+        NaN clips to hi, exactly like max(lo, min(hi, v))
     
     Example:
         >>> clip(150, 0, 100)
         100
     """
+    if _is_batch(v):
+        v = np.asarray(v, dtype=np.float64)
+        return np.maximum(lo, np.where(v < hi, v, hi))
     return max(lo, min(hi, v))
 
-def months_between(iso_a: Optional[str], iso_b: Optional[str]) -> int:
+def _floor_zero(v):
+    """max(0, v) with the same NaN handling for batch inputs (NaN -> 0)"""
+    if _is_batch(v):
+        v = np.asarray(v, dtype=np.float64)
+        return np.where(v > 0, v, 0.0)
+    return max(0, v)
+
+def months_between(iso_a, iso_b):
     """
     Calculate months between two ISO date strings
     
     Args:
-        iso_a: ISO date string (YYYY-MM-DD)
-        iso_b: ISO date string (YYYY-MM-DD)
+        iso_a: ISO date string (YYYY-MM-DD), or an array/Series of them
+        iso_b: ISO date string (YYYY-MM-DD), or an array/Series of them
     
     Returns:
         Number of months between dates (always >= 0)
+        int64 array when either argument is a batch (broadcast)
     
     Example:
         >>> months_between('2025-01-01', '2024-01-01')
         12
     """
+    if _is_batch(iso_a) or _is_batch(iso_b):
+        a_idx, a_valid = month_index(np.atleast_1d(iso_a))
+        b_idx, b_valid = month_index(np.atleast_1d(iso_b))
+        return np.where(a_valid & b_valid, np.maximum(a_idx - b_idx, 0), 0)
+    
     if not iso_a or not iso_b:
         return 0
     
@@ -60,34 +82,107 @@ def months_between(iso_a: Optional[str], iso_b: Optional[str]) -> int:
     except (ValueError, IndexError):
         return 0
 
+# ==================== BATCH DATE KERNEL ====================
+
+def _is_batch(value) -> bool:
+    """True for array-like inputs that take the vectorized path"""
+    return isinstance(value, (np.ndarray, pd.Series, pd.Index, list, tuple))
+
+def _any_batch(*values) -> bool:
+    """True when any argument is array-like (the others broadcast against it)"""
+    return any(_is_batch(value) for value in values)
+
+def month_index(dates):
+    """
+    Absolute month number (months since 1970-01) for each date
+    
+    Only the year and month parts are used, matching months_between.
+    
+    Args:
+        dates: datetime64 array/Series, or ISO strings / datetimes
+               (first 10 chars are parsed, like months_between)
+    
+    Returns:
+        (int64 month index array, bool valid mask) - invalid dates index 0
+    """
+    values = np.asarray(dates)
+    if not np.issubdtype(values.dtype, np.datetime64):
+        text = pd.Series(values, dtype=object).astype(str).str[:10]
+        values = pd.to_datetime(text, format='ISO8601', errors='coerce').to_numpy()
+    
+    months = values.astype('datetime64[M]')
+    valid = ~np.isnat(months)
+    return np.where(valid, months.astype(np.int64), 0), valid
+
+def months_elapsed(dates, today: Optional[datetime] = None) -> np.ndarray:
+    """
+    Whole months from each date to one reference date (vectorized loan age)
+    
+    Args:
+        dates: datetime64 array/Series (or anything month_index accepts)
+        today: Reference date, taken once per run (default: now)
+    
+    Returns:
+        int64 array of months (>= 0); missing dates give 0
+    
+    Example:
+        >>> months_elapsed(np.array(['2023-01-15'], dtype='datetime64[D]'), datetime(2025, 1, 1))
+        array([24])
+    """
+    if today is None:
+        today = datetime.now()
+    
+    today_idx = (today.year - 1970) * 12 + (today.month - 1)
+    idx, valid = month_index(dates)
+    return np.where(valid, np.maximum(today_idx - idx, 0), 0)
+
+def _coalesce(primary, fallback):
+    """Per-element `primary or fallback` for batch date inputs"""
+    if primary is None:
+        return fallback
+    if fallback is None:
+        return primary
+    
+    primary = np.asarray(primary, dtype=object)
+    missing = pd.isna(primary) | (primary == '')
+    return np.where(missing, np.asarray(fallback, dtype=object), primary)
+
 # ==================== CORE METRICS ====================
 
-def ltv(loan: float, value: float) -> float:
+def ltv(loan, value):
     """
     Calculate Loan-to-Value ratio
     
     Args:
-        loan: Total loan balance
-        value: Property value
+        loan: Total loan balance (scalar or array)
+        value: Property value (scalar or array)
     
     Returns:
         LTV ratio (0-2, clipped)
         Returns 2 if value <= 0
+        float64 array when either argument is a batch (broadcast)
     
     Example:
         >>> ltv(200000, 400000)
         0.5
     """
+    if _any_batch(loan, value):
+        loan = np.asarray(loan, dtype=np.float64)
+        value = np.asarray(value, dtype=np.float64)
+        positive = ~(value <= 0)
+        ratio = np.divide(loan, value, out=np.zeros(np.broadcast(loan, value).shape), where=positive)
+        return np.where(positive, clip(ratio, 0, 2), 2.0)
+    
     if value <= 0:
         return 2.0
     return clip(loan / value, 0, 2)
 
-def equity_pct(ltv_val: float) -> float:
+def equity_pct(ltv_val):
     """
     Calculate equity percentage from LTV
     
     Args:
-        ltv_val: LTV ratio (0-1 typically)
+        ltv_val: LTV ratio (0-1 typically), scalar or array
     
     Returns:
         Equity percentage (0-1)
@@ -96,15 +191,17 @@ def equity_pct(ltv_val: float) -> float:
         >>> equity_pct(0.7)
         0.3
     """
+    if _is_batch(ltv_val):
+        return _floor_zero(1 - np.asarray(ltv_val, dtype=np.float64))
     return max(0, 1 - ltv_val)
 
-def equity_dollars(value: float, loan: float) -> float:
+def equity_dollars(value, loan):
     """
     Calculate equity in dollars
     
     Args:
-        value: Property value
-        loan: Total loan balance
+        value: Property value (scalar or array)
+        loan: Total loan balance (scalar or array)
     
     Returns:
         Equity amount in dollars
@@ -113,6 +210,8 @@ def equity_dollars(value: float, loan: float) -> float:
         >>> equity_dollars(400000, 200000)
         200000.0
     """
+    if _any_batch(value, loan):
+        return _floor_zero(np.asarray(value, dtype=np.float64) - np.asarray(loan, dtype=np.float64))
     return max(0, value - loan)
 
 def loan_age_months(today_iso: str, last_refi: Optional[str] = None, 
@@ -122,20 +221,21 @@ def loan_age_months(today_iso: str, last_refi: Optional[str] = None,
     
     Args:
         today_iso: Today's date (ISO format)
-        last_refi: Last refinance date (optional)
-        orig: Original loan date (optional)
+        last_refi: Last refinance date (optional, scalar or array)
+        orig: Original loan date (optional, scalar or array)
     
     Returns:
-        Loan age in months
+        Loan age in months (int64 array for batch inputs)
     
     Example:
         >>> loan_age_months('2025-01-01', last_refi='2023-01-01')
         24
     """
+    if _is_batch(last_refi) or _is_batch(orig):
+        return months_between(today_iso, _coalesce(last_refi, orig))
     return months_between(today_iso, last_refi or orig)
 
-def aps_score(ltv_val: float, equity_pct_val: float, loan_age: int, 
-              equity_dollars_delta: float = 0) -> float:
+def aps_score(ltv_val, equity_pct_val, loan_age, equity_dollars_delta=0):
     """
     Calculate APS composite score (0-100)
     
@@ -146,6 +246,8 @@ def aps_score(ltv_val: float, equity_pct_val: float, loan_age: int,
     - Subtract 20 * exp(-loan_age/36)
     - Add bonus: 10 * (0.5 * (tanh(equity_delta/25000) + 1))
     
+    Any argument may be an array/Series; the others broadcast against it.
+    
     Args:
         ltv_val: LTV ratio (0-1)
         equity_pct_val: Equity percentage (0-1)
@@ -153,12 +255,25 @@ def aps_score(ltv_val: float, equity_pct_val: float, loan_age: int,
         equity_dollars_delta: Change in equity over 90 days (default 0)
     
     Returns:
-        APS score (0-100)
+        APS score (0-100), float64 array for batch inputs
     
     Example:
         >>> aps_score(0.7, 0.3, 24, 5000)
         42.1
     """
+    if _any_batch(ltv_val, equity_pct_val, loan_age, equity_dollars_delta):
+        decay = age_decay(np.asarray(loan_age))
+        ltv_val, equity_pct_val, equity_dollars_delta = (
+            np.asarray(v, dtype=np.float64)
+            for v in (ltv_val, equity_pct_val, equity_dollars_delta)
+        )
+        score = (100.0
+                 - 40 * clip(ltv_val, 0, 1)
+                 - 30 * clip(1 - equity_pct_val, 0, 1)
+                 - 20 * decay
+                 + 10 * (0.5 * (np.tanh(equity_dollars_delta / 25000) + 1)))
+        return clip(score, 0, 100)
+    
     score = 100.0
     
     # LTV penalty (0-40 points)
@@ -168,7 +283,7 @@ def aps_score(ltv_val: float, equity_pct_val: float, loan_age: int,
     score -= 30 * clip(1 - equity_pct_val, 0, 1)
     
     # Loan age penalty (0-20 points, exponential decay)
-    score -= 20 * math.exp(-loan_age / 36)
+    score -= 20 * age_decay(loan_age)
     
     # Equity growth bonus (0-10 points)
     bonus = 10 * (0.5 * (math.tanh(equity_dollars_delta / 25000) + 1))
@@ -176,18 +291,18 @@ def aps_score(ltv_val: float, equity_pct_val: float, loan_age: int,
     
     return clip(score, 0, 100)
 
-def churn_index(cycle_phase_01: float, velocity_01: float) -> float:
+def churn_index(cycle_phase_01, velocity_01):
     """
     Calculate churn probability index
     
     Combines cycle phase (where in equity cycle) with velocity (market speed)
     
     Args:
-        cycle_phase_01: Equity cycle phase (0-1)
-        velocity_01: Market velocity (0-1)
+        cycle_phase_01: Equity cycle phase (0-1), scalar or array
+        velocity_01: Market velocity (0-1), scalar or array
     
     Returns:
-        Churn index (0-100)
+        Churn index (0-100), float64 array for batch inputs
     
     Formula: 100 * (0.35 * velocity + 0.65 * cycle_phase)
     
@@ -195,24 +310,28 @@ def churn_index(cycle_phase_01: float, velocity_01: float) -> float:
         >>> churn_index(0.8, 0.6)
         73.0
     """
+    if _any_batch(cycle_phase_01, velocity_01):
+        cycle_phase_01 = np.asarray(cycle_phase_01, dtype=np.float64)
+        velocity_01 = np.asarray(velocity_01, dtype=np.float64)
+    
     return clip(
         100 * (0.35 * clip(velocity_01, 0, 1) + 
                0.65 * clip(cycle_phase_01, 0, 1)),
         0, 100
     )
 
-def velocity_index(refi_now: float, refi_90: float) -> float:
+def velocity_index(refi_now, refi_90):
     """
     Calculate market velocity index
     
     Measures refinance activity change over 90 days
     
     Args:
-        refi_now: Current refinance count
-        refi_90: Refinance count 90 days ago
+        refi_now: Current refinance count (scalar or array)
+        refi_90: Refinance count 90 days ago (scalar or array)
     
     Returns:
-        Velocity index (0-100)
+        Velocity index (0-100), float64 array for batch inputs
         - 50 = neutral (no change)
         - >50 = increasing activity
         - <50 = decreasing activity
@@ -221,6 +340,12 @@ def velocity_index(refi_now: float, refi_90: float) -> float:
         >>> velocity_index(120, 100)
         60.0
     """
+    if _any_batch(refi_now, refi_90):
+        refi_now = np.asarray(refi_now, dtype=np.float64)
+        refi_90 = np.asarray(refi_90, dtype=np.float64)
+        ratio = clip((refi_now - refi_90) / np.maximum(1, refi_90), -1, 1)
+        return np.where(refi_90 <= 0, 50.0, (ratio + 1) * 50)
+    
     if refi_90 <= 0:
         return 50.0
     
@@ -230,6 +355,111 @@ def velocity_index(refi_now: float, refi_90: float) -> float:
     # Convert to 0-100 scale (50 = neutral)
     return (ratio + 1) * 50
 
+def _cycle_phase_curve(loan_age):
+    """Cycle phase evaluated branch by branch (see cycle_phase)"""
+    if _is_batch(loan_age):
+        loan_age = np.asarray(loan_age, dtype=np.float64)
+        return np.select(
+            [loan_age < 18, loan_age <= 36],
+            [loan_age / 18 * 0.5, 0.5 + (loan_age - 18) / 18 * 0.5],
+            default=np.maximum(0.3, 1.0 - (loan_age - 36) / 60 * 0.7)
+        )
+    
+    if loan_age < 18:
+        return loan_age / 18 * 0.5
+    if loan_age <= 36:
+        return 0.5 + (loan_age - 18) / 18 * 0.5
+    return max(0.3, 1.0 - (loan_age - 36) / 60 * 0.7)
+
+def _age_decay_curve(loan_age):
+    """exp(-loan_age / 36) evaluated directly (see age_decay)"""
+    if _is_batch(loan_age):
+        return np.exp(-np.asarray(loan_age, dtype=np.float64) / 36)
+    return math.exp(-loan_age / 36)
+
+def delta_velocity(equity_delta):
+    """
+    Velocity (0-1) from the 90-day equity delta
+    
+    Args:
+        equity_delta: Equity change over 90 days (scalar or array)
+    
+    Returns:
+        Velocity (0-1), float64 array for batch inputs
+    """
+    if _is_batch(equity_delta):
+        equity_delta = np.asarray(equity_delta, dtype=np.float64)
+    return clip((equity_delta + 5) / 10, 0, 1)
+
+# ==================== LOAN-AGE LOOKUP TABLES ====================
+
+# Loan age is a whole number of months: the loan-age curves are tabulated
+# over 0..AGE_LOOKUP_MONTHS once (with the scalar functions, so table
+# values equal a direct call) and evaluated by indexing.
+AGE_LOOKUP_MONTHS = 600
+
+_AGE_DECAY = [_age_decay_curve(month) for month in range(AGE_LOOKUP_MONTHS + 1)]
+_CYCLE_PHASE = [_cycle_phase_curve(month) for month in range(AGE_LOOKUP_MONTHS + 1)]
+
+AGE_DECAY_TABLE = np.array(_AGE_DECAY)
+CYCLE_PHASE_TABLE = np.array(_CYCLE_PHASE)
+
+def _age_lookup(loan_age, values: list, table: np.ndarray, curve):
+    """
+    Table value for whole-month ages in range, the curve for anything else
+    
+    Args:
+        loan_age: Loan age in months (scalar or array)
+        values: Table as Python floats (scalar path)
+        table: Same table as a float64 array (batch path)
+        curve: Direct evaluation for fractional/out-of-range ages
+    """
+    if _is_batch(loan_age):
+        ages = np.asarray(loan_age)
+        if np.issubdtype(ages.dtype, np.integer) and (
+                ages.size == 0 or (ages.min() >= 0 and ages.max() <= AGE_LOOKUP_MONTHS)):
+            return table[ages]
+        return curve(ages)
+    
+    if isinstance(loan_age, (int, np.integer)) and 0 <= loan_age <= AGE_LOOKUP_MONTHS:
+        return values[loan_age]
+    return curve(loan_age)
+
+def age_decay(loan_age):
+    """
+    Loan-age decay term of aps_score: exp(-loan_age / 36)
+    
+    Args:
+        loan_age: Loan age in months (scalar or array)
+    
+    Returns:
+        Decay (0-1], float64 array for batch inputs
+    
+    Example:
+        >>> age_decay(36)
+        0.36787944117144233
+    """
+    return _age_lookup(loan_age, _AGE_DECAY, AGE_DECAY_TABLE, _age_decay_curve)
+
+def cycle_phase(loan_age):
+    """
+    Equity cycle phase from loan age
+    
+    Rises to 0.5 at 18 months and 1.0 at 36 months, then decays
+    towards a 0.3 floor.
+    
+    Args:
+        loan_age: Loan age in months (scalar or array)
+    
+    Returns:
+        Cycle phase (0-1), float64 array for batch inputs
+    
+    Example:
+        >>> cycle_phase(27)
+        0.75
+    """
+    return _age_lookup(loan_age, _CYCLE_PHASE, CYCLE_PHASE_TABLE, _cycle_phase_curve)
+
 # ==================== INTEGRATION WITH EXISTING SYSTEM ====================
 
 def calculate_comprehensive_metrics(df_row, today_iso: str = None) -> dict:
@@ -272,17 +502,12 @@ def calculate_comprehensive_metrics(df_row, today_iso: str = None) -> dict:
     
     # Calculate churn metrics
     # Cycle phase based on loan age (0-1, peaks at 18-36 months)
-    if loan_age < 18:
-        cycle_phase = loan_age / 18 * 0.5
-    elif loan_age <= 36:
-        cycle_phase = 0.5 + (loan_age - 18) / 18 * 0.5
-    else:
-        cycle_phase = max(0.3, 1.0 - (loan_age - 36) / 60 * 0.7)
+    phase = cycle_phase(loan_age)
     
-    # Velocity from equity delta
-    velocity = clip((equity_delta + 5) / 10, 0, 1)  # Normalize to 0-1
+    # Velocity from equity delta, normalized to 0-1
+    velocity = delta_velocity(equity_delta)
     
-    churn_val = churn_index(cycle_phase, velocity)
+    churn_val = churn_index(phase, velocity)
     
     return {
         'ltv': round(ltv_val, 4),
@@ -291,7 +516,208 @@ def calculate_comprehensive_metrics(df_row, today_iso: str = None) -> dict:
         'loan_age_months': loan_age,
         'aps_score': round(aps_score_val, 1),
         'churn_index': round(churn_val, 1),
-        'cycle_phase': round(cycle_phase, 2),
+        'cycle_phase': round(phase, 2),
+        'velocity': round(velocity, 2)
+    }
+
+def _first_present(df: pd.DataFrame, primary: str, fallback: str, numeric: bool = True):
+    """
+    Column-wise `row.get(primary) or row.get(fallback)`
+    
+    Falls back where the primary value is missing, empty or zero.
+    
+    Returns:
+        Array (float64 when numeric, else object), or None when neither column exists
+    """
+    def column(name):
+        if name not in df.columns:
+            return None
+        values = df[name]
+        return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64) if numeric else values.to_numpy(dtype=object)
+    
+    first, second = column(primary), column(fallback)
+    if numeric:
+        first = np.zeros(len(df)) if first is None else first
+        if second is None:
+            return first
+        return np.where((first == 0) | np.isnan(first), second, first)
+    return _coalesce(first, second)
+
+def calculate_comprehensive_metrics_frame(df: pd.DataFrame, today_iso: str = None) -> pd.DataFrame:
+    """
+    calculate_comprehensive_metrics over a whole DataFrame in one vectorized pass
+    
+    Reads the same columns as the row version (TotalLoanBal/_loan_balance,
+    EstValue/_property_value, LastLoanDate/_loan_date, equity_delta_90d)
+    and adds the ltv, aps_score, churn_index, cycle_phase and velocity
+    columns, rounded like the row version.
+    
+    Args:
+        df: Vendor DataFrame (columns are modified in place)
+        today_iso: Today's date (ISO format, optional)
+    
+    Returns:
+        The same DataFrame with the metric columns added
+    
+    Example:
+        >>> df = calculate_comprehensive_metrics_frame(df, '2025-01-01')
+        >>> df[['ltv', 'aps_score', 'churn_index']].head()
+    """
+    if today_iso is None:
+        today_iso = datetime.now().isoformat()[:10]
+    
+    loan = _first_present(df, 'TotalLoanBal', '_loan_balance')
+    value = _first_present(df, 'EstValue', '_property_value')
+    last_loan_date = _first_present(df, 'LastLoanDate', '_loan_date', numeric=False)
+    if 'equity_delta_90d' in df.columns:
+        equity_delta = pd.to_numeric(df['equity_delta_90d'], errors='coerce').to_numpy(dtype=np.float64)
+    else:
+        equity_delta = np.zeros(len(df))
+    
+    ltv_val = ltv(loan, value)
+    if last_loan_date is None:
+        loan_age = np.zeros(len(df), dtype=np.int64)
+    else:
+        loan_age = loan_age_months(today_iso, last_loan_date)
+    
+    phase = cycle_phase(loan_age)
+    velocity = delta_velocity(equity_delta)
+    
+    df['ltv'] = py_round(ltv_val, 4)
+    df['aps_score'] = py_round(aps_score(ltv_val, equity_pct(ltv_val), loan_age, equity_delta), 1)
+    df['churn_index'] = py_round(churn_index(phase, velocity), 1)
+    df['cycle_phase'] = py_round(phase, 2)
+    df['velocity'] = py_round(velocity, 2)
+    return df
+
+# Output order of /v1/calculate
+PROPERTY_METRICS = [
+    'ltv', 'equity_pct', 'equity_dollars', 'loan_age_months',
+    'aps_score', 'churn_index', 'cycle_phase', 'velocity'
+]
+
+def calculate_property_metrics(loan, value, loan_date=None, equity_delta=0,
+                               today_iso: str = None) -> dict:
+    """
+    /v1/calculate metrics for many properties in one vectorized call
+    
+    Args:
+        loan: Total loan balances (array)
+        value: Property values (array)
+        loan_date: Last loan dates (ISO strings or datetime64, optional);
+                   missing dates give a loan age of 0
+        equity_delta: Equity change over 90 days (array or scalar)
+        today_iso: Today's date (ISO format, optional)
+    
+    Returns:
+        Dict of PROPERTY_METRICS -> array, rounded like /v1/calculate
+        (ltv and equity_pct as percentages)
+    
+    Example:
+        >>> calculate_property_metrics(np.array([200000.]), np.array([400000.]))['ltv']
+        array([50.])
+    """
+    if today_iso is None:
+        today_iso = datetime.now().isoformat()[:10]
+    
+    loan = np.asarray(loan, dtype=np.float64)
+    value = np.asarray(value, dtype=np.float64)
+    n = np.broadcast(loan, value).shape
+    equity_delta = np.broadcast_to(np.asarray(equity_delta, dtype=np.float64), n)
+    
+    ltv_val = ltv(loan, value)
+    equity_pct_val = equity_pct(ltv_val)
+    if loan_date is None:
+        loan_age = np.zeros(n, dtype=np.int64)
+    else:
+        loan_age = np.broadcast_to(loan_age_months(today_iso, np.atleast_1d(loan_date)), n)
+    
+    phase = cycle_phase(loan_age)
+    velocity = delta_velocity(equity_delta)
+    
+    return {
+        'ltv': py_round(ltv_val * 100, 2),
+        'equity_pct': py_round(equity_pct_val * 100, 2),
+        'equity_dollars': py_round(equity_dollars(value, loan), 2),
+        'loan_age_months': loan_age,
+        'aps_score': py_round(aps_score(ltv_val, equity_pct_val, loan_age, equity_delta), 1),
+        'churn_index': py_round(churn_index(phase, velocity), 1),
+        'cycle_phase': py_round(phase, 2),
+        'velocity': py_round(velocity, 2)
+    }
+
+# ==================== SINGLE-PROPERTY FAST PATH ====================
+
+# (date, absolute month index) of today, refreshed when the date changes
+_TODAY_MONTH = (None, 0)
+
+def _today_month_index() -> int:
+    """Month index (year * 12 + month) of today, computed once per day"""
+    global _TODAY_MONTH
+    today = date.today()
+    if _TODAY_MONTH[0] != today:
+        _TODAY_MONTH = (today, today.year * 12 + today.month)
+    return _TODAY_MONTH[1]
+
+def score_property(loan: float, value: float, loan_date: Optional[str] = None,
+                   equity_delta: float = 0.0) -> dict:
+    """
+    Low-latency /v1/calculate for one property
+    
+    Plain floats and the loan-age tables only: no pandas/NumPy calls and
+    one date parse. Same arithmetic, clipping and rounding as the
+    metric functions above, inlined.
+    
+    Args:
+        loan: Total loan balance
+        value: Property value
+        loan_date: Last loan date (ISO format, optional)
+        equity_delta: Equity change over 90 days
+    
+    Returns:
+        Dict of PROPERTY_METRICS (ltv and equity_pct as percentages)
+    
+    Example:
+        >>> score_property(200000, 400000, '2023-01-15', 5000)['ltv']
+        50.0
+    """
+    # ltv / equity_pct / equity_dollars
+    ltv_val = 2.0 if value <= 0 else max(0, min(2, loan / value))
+    equity_pct_val = max(0, 1 - ltv_val)
+    equity_dollars_val = max(0, value - loan)
+    
+    # Loan age in whole months (invalid or missing dates count as 0, like months_between)
+    loan_age = 0
+    if loan_date:
+        try:
+            start = datetime.fromisoformat(loan_date[:10])
+            loan_age = max(0, _today_month_index() - (start.year * 12 + start.month))
+        except (ValueError, TypeError):
+            loan_age = 0
+    
+    in_table = loan_age <= AGE_LOOKUP_MONTHS
+    decay = _AGE_DECAY[loan_age] if in_table else _age_decay_curve(loan_age)
+    phase = _CYCLE_PHASE[loan_age] if in_table else _cycle_phase_curve(loan_age)
+    
+    # aps_score, term by term in the same order
+    score = 100.0
+    score -= 40 * max(0, min(1, ltv_val))
+    score -= 30 * max(0, min(1, 1 - equity_pct_val))
+    score -= 20 * decay
+    score += 10 * (0.5 * (math.tanh(equity_delta / 25000) + 1))
+    score = max(0, min(100, score))
+    
+    velocity = max(0, min(1, (equity_delta + 5) / 10))
+    churn = max(0, min(100, 100 * (0.35 * max(0, min(1, velocity)) + 0.65 * max(0, min(1, phase)))))
+    
+    return {
+        'ltv': round(ltv_val * 100, 2),
+        'equity_pct': round(equity_pct_val * 100, 2),
+        'equity_dollars': round(equity_dollars_val, 2),
+        'loan_age_months': loan_age,
+        'aps_score': round(score, 1),
+        'churn_index': round(churn, 1),
+        'cycle_phase': round(phase, 2),
         'velocity': round(velocity, 2)
     }
 
@@ -329,5 +755,11 @@ if __name__ == "__main__":
     print(f"   velocity_index(120, 100) = {velocity:.1f}")
     print(f"   Expected: 60.0")
     
+    # Test 6: Array inputs
+    print("\n6. Array Inputs:")
+    scores = aps_score(np.array([0.7, 0.5]), np.array([0.3, 0.5]), 24, 5000)
+    print(f"   aps_score([0.7, 0.5], [0.3, 0.5], 24, 5000) = {np.round(scores, 1)}")
+    print(f"   Expected: [{aps_score(0.7, 0.3, 24, 5000):.1f} {aps_score(0.5, 0.5, 24, 5000):.1f}]")
+    
     print("\n" + "=" * 50)
     print("✓ All tests completed")
\ No newline at end of file
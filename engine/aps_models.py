@@ -0,0 +1,366 @@
+# aps_models.py - Scoring Model Registry
+"""
+Declarative scoring models (scoring_models/*.yaml) compiled to vectorized evaluators
+Each model declares its inputs, weighted score components (step pipelines
+with piecewise curves), tier rules and extra indexes such as CCI.
+Several models evaluate over the same frame in one pass, sharing input
+columns and identical component pipelines, so a new version can be
+shadow-scored on production volume.
+Integer inputs declared with a lookup range (loan age in months) have their
+component pipelines precomputed over that range and evaluated by indexing.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+
+from engine.aps_config import MODELS_DIR, SCORING_MODEL, SHADOW_MODELS
+from engine.aps_scoring import py_round
+
+COMPARISONS = {
+    'lt': np.less,
+    'le': np.less_equal,
+    'gt': np.greater,
+    'ge': np.greater_equal
+}
+
+UNARY_STEPS = {
+    'exp': np.exp,
+    'tanh': np.tanh
+}
+
+# model id -> CompiledModel (loaded on first use)
+MODEL_REGISTRY = {}
+
+# ==================== STEP COMPILER ====================
+
+def _segment_value(segment: dict, x: np.ndarray):
+    """Value of one piecewise segment over the whole array"""
+    if 'value' in segment:
+        return float(segment['value'])
+
+    (x0, y0), (x1, y1) = segment['start'], segment['end']
+    # y0 + ((x - x0) / span) * rise - same operation order as the scalar curves
+    y = y0 + ((x - x0) / (x1 - x0)) * (y1 - y0)
+    if 'floor' in segment:
+        y = np.maximum(segment['floor'], y)
+    if 'cap' in segment:
+        y = np.minimum(segment['cap'], y)
+    return y
+
+def _compile_piecewise(segments: list):
+    """
+    Piecewise curve: first segment whose bound matches wins
+
+    Every segment but the last needs one bound (lt/le/gt/ge);
+    the last one is unbounded and covers everything else.
+    """
+    if not segments or any(op in segments[-1] for op in COMPARISONS):
+        raise ValueError("piecewise: the last segment must be unbounded")
+    for segment in segments[:-1]:
+        if sum(op in segment for op in COMPARISONS) != 1:
+            raise ValueError(f"piecewise: segment needs exactly one bound: {segment}")
+
+    bounds = [next((op, segment[op]) for op in COMPARISONS if op in segment) for segment in segments[:-1]]
+
+    def evaluate(x):
+        return np.select(
+            [COMPARISONS[op](x, limit) for op, limit in bounds],
+            [_segment_value(segment, x) for segment in segments[:-1]],
+            default=_segment_value(segments[-1], x)
+        )
+    return evaluate
+
+def _compile_step(step):
+    """One pipeline step -> function of an array"""
+    if isinstance(step, str):
+        if step not in UNARY_STEPS:
+            raise ValueError(f"Unknown step: {step}")
+        return UNARY_STEPS[step]
+
+    (op, arg), = step.items()
+    if op == 'add':
+        return lambda x: x + arg
+    if op == 'multiply':
+        return lambda x: x * arg
+    if op == 'divide':
+        return lambda x: x / arg
+    if op == 'clip':
+        lo, hi = arg
+        if lo is None:
+            return lambda x: np.minimum(hi, x)
+        if hi is None:
+            return lambda x: np.maximum(lo, x)
+        return lambda x: np.maximum(lo, np.minimum(hi, x))
+    if op == 'piecewise':
+        return _compile_piecewise(arg)
+    raise ValueError(f"Unknown step: {op}")
+
+def _compile_formula(spec: dict):
+    """
+    Weighted sum of component pipelines, then optional clip and round
+
+    Returns:
+        (list of (input, steps key, pipeline, weight), finish function)
+    """
+    components = []
+    for component in spec['components']:
+        steps = component.get('steps', [])
+        pipeline = [_compile_step(step) for step in steps]
+        key = json.dumps(steps, sort_keys=True)
+        components.append((component['input'], key, pipeline, component.get('weight', 1)))
+
+    base = spec.get('base', 0)
+    clip = spec.get('clip')
+    decimals = spec.get('round')
+
+    def finish(parts):
+        total = base
+        for part in parts:
+            total = total + part
+        total = np.asarray(total, dtype=np.float64)
+        if clip is not None:
+            total = np.maximum(clip[0], np.minimum(clip[1], total))
+        return py_round(total, decimals) if decimals is not None else total
+
+    return components, finish
+
+# ==================== COMPILED MODEL ====================
+
+class CompiledModel:
+    """
+    One scoring model version compiled to array operations
+
+    Example:
+        >>> model = get_model('aps-v2.0')
+        >>> model.columns
+        ['APS_Score (v2.0)', 'APS_Tier', 'CCI']
+    """
+
+    def __init__(self, spec: dict):
+        self.name = spec['name']
+        self.version = str(spec['version'])
+        self.id = f"{self.name}-v{self.version}"
+        self.description = spec.get('description', '')
+        self.inputs = {
+            name: (source['column'], source.get('default'))
+            for name, source in spec['inputs'].items()
+        }
+        # input -> (lo, hi) integer range its component pipelines are tabulated over
+        self.lookups = {
+            name: tuple(int(bound) for bound in source['lookup'])
+            for name, source in spec['inputs'].items() if 'lookup' in source
+        }
+        self._tables = {}
+
+        self.score_column = spec['score']['column']
+        self.score = _compile_formula(spec['score'])
+        self.indexes = [(index['column'], _compile_formula(index)) for index in spec.get('indexes', [])]
+
+        self.tiers = None
+        if 'tiers' in spec:
+            tiers = spec['tiers']
+            rules = [
+                (rule['tier'], [(field, COMPARISONS[op], limit)
+                                for field, ops in rule.items() if field != 'tier'
+                                for op, limit in ops.items()])
+                for rule in tiers['rules']
+            ]
+            names = np.array([tier for tier, _ in rules] + [tiers['default']], dtype=object)
+            self.tiers = (tiers['column'], rules, names)
+
+        self._check_inputs()
+
+    def _check_inputs(self):
+        """Every component and tier condition must reference a declared input"""
+        used = [name for name, _, _, _ in self.score[0]]
+        used += [name for _, (components, _) in self.indexes for name, _, _, _ in components]
+        if self.tiers:
+            used += [field for _, conditions in self.tiers[1] for field, _, _ in conditions if field != 'score']
+        missing = sorted(set(used) - set(self.inputs))
+        if missing:
+            raise ValueError(f"Model {self.id}: undeclared inputs {', '.join(missing)}")
+
+    @property
+    def columns(self) -> List[str]:
+        """Output columns, in the order they are added to a frame"""
+        columns = [self.score_column]
+        if self.tiers:
+            columns.append(self.tiers[0])
+        return columns + [column for column, _ in self.indexes]
+
+    def evaluate(self, sources: list, n_rows: int, cache: Optional[dict] = None) -> Dict[str, np.ndarray]:
+        """
+        Score whole columns
+
+        Args:
+            sources: Mappings/DataFrames searched in order for input columns
+            n_rows: Row count (for defaulted inputs)
+            cache: Shared per-pass cache of inputs and component pipelines
+
+        Returns:
+            Dict of output column -> array
+        """
+        cache = {} if cache is None else cache
+        outputs = {}
+
+        score = self._formula(self.score, sources, n_rows, cache)
+        outputs[self.score_column] = score
+
+        if self.tiers:
+            column, rules, names = self.tiers
+            conditions = []
+            for _, checks in rules:
+                matched = np.ones(n_rows, dtype=bool)
+                for field, compare, limit in checks:
+                    values = score if field == 'score' else self._input(field, sources, n_rows, cache)
+                    matched &= compare(values, limit)
+                conditions.append(matched)
+            # Tier code -> shared name objects (no per-row strings)
+            codes = np.select(conditions, np.arange(len(rules), dtype=np.int8), default=len(rules))
+            outputs[column] = names[codes]
+
+        for column, formula in self.indexes:
+            outputs[column] = self._formula(formula, sources, n_rows, cache)
+
+        return outputs
+
+    def _input(self, name: str, sources: list, n_rows: int, cache: dict) -> np.ndarray:
+        """float64 input column, read once per pass"""
+        column, default = self.inputs[name]
+        key = ('input', column, default)
+        if key not in cache:
+            for source in sources:
+                if column in source:
+                    cache[key] = np.asarray(source[column], dtype=np.float64)
+                    break
+            else:
+                if default is None:
+                    raise ValueError(f"Model {self.id}: input column '{column}' not found")
+                cache[key] = np.full(n_rows, float(default))
+        return cache[key]
+
+    def _formula(self, formula, sources: list, n_rows: int, cache: dict) -> np.ndarray:
+        """Evaluate a compiled formula, reusing component pipelines other models already ran"""
+        components, finish = formula
+        parts = []
+        for name, steps_key, pipeline, weight in components:
+            column, default = self.inputs[name]
+            key = ('component', column, default, steps_key)
+            if key not in cache:
+                values = self._lookup(name, steps_key, pipeline, sources) if pipeline and name in self.lookups else None
+                if values is None:
+                    values = self._input(name, sources, n_rows, cache)
+                    for step in pipeline:
+                        values = step(values)
+                cache[key] = values
+            parts.append(cache[key] * weight)
+        return finish(parts)
+
+    def _lookup(self, name: str, steps_key: str, pipeline: list, sources: list) -> Optional[np.ndarray]:
+        """
+        Component pipeline by table indexing
+
+        The table holds the pipeline evaluated once over the input's lookup
+        range, so it matches running the pipeline value by value.
+
+        Returns:
+            Component array, or None when the input column is missing, not
+            integer or outside the range (the pipeline then runs directly)
+        """
+        column, _ = self.inputs[name]
+        source = next((source for source in sources if column in source), None)
+        if source is None:
+            return None
+        values = np.asarray(source[column])
+        if not np.issubdtype(values.dtype, np.integer):
+            return None
+
+        lo, hi = self.lookups[name]
+        if len(values) and (values.min() < lo or values.max() > hi):
+            return None
+
+        table = self._tables.get((name, steps_key))
+        if table is None:
+            table = np.arange(lo, hi + 1, dtype=np.float64)
+            for step in pipeline:
+                table = step(table)
+            self._tables[(name, steps_key)] = table
+        return table[values - lo] if lo else table[values]
+
+# ==================== REGISTRY ====================
+
+def compile_model(spec: dict) -> CompiledModel:
+    """Compile a model spec (parsed YAML) into a vectorized evaluator"""
+    try:
+        return CompiledModel(spec)
+    except KeyError as e:
+        raise ValueError(f"Model spec missing field: {e}") from e
+
+def load_models(models_dir: Path = MODELS_DIR) -> Dict[str, CompiledModel]:
+    """
+    Compile every scoring_models/*.yaml into MODEL_REGISTRY
+
+    Returns:
+        The registry (model id -> CompiledModel)
+    """
+    for path in sorted(Path(models_dir).glob('*.yaml')):
+        with open(path, 'r', encoding='utf-8') as f:
+            model = compile_model(yaml.safe_load(f))
+        MODEL_REGISTRY[model.id] = model
+    return MODEL_REGISTRY
+
+def get_model(model_id: str) -> CompiledModel:
+    """Registered model by id (e.g. 'aps-v2.0')"""
+    if not MODEL_REGISTRY:
+        load_models()
+    if model_id not in MODEL_REGISTRY:
+        raise ValueError(f"Unknown scoring model: {model_id} (available: {', '.join(sorted(MODEL_REGISTRY))})")
+    return MODEL_REGISTRY[model_id]
+
+def active_models() -> List[str]:
+    """Production model followed by the configured shadow models"""
+    return [SCORING_MODEL] + [model_id for model_id in SHADOW_MODELS if model_id != SCORING_MODEL]
+
+def model_columns(model_ids: Optional[List[str]] = None) -> List[str]:
+    """Output columns of the given (default: active) models"""
+    return [column for model_id in (model_ids or active_models()) for column in get_model(model_id).columns]
+
+def model_inputs(model_ids: Optional[List[str]] = None) -> List[str]:
+    """Input columns read by the given (default: active) models"""
+    columns = []
+    for model_id in (model_ids or active_models()):
+        for column, _ in get_model(model_id).inputs.values():
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+def evaluate_models(sources: list, n_rows: int, model_ids: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Evaluate several models over the same columns in one pass
+
+    Inputs and component pipelines shared between models are computed once.
+
+    Args:
+        sources: Mappings/DataFrames searched in order for input columns
+        n_rows: Row count
+        model_ids: Models to run (default: SCORING_MODEL + SHADOW_MODELS)
+
+    Returns:
+        Dict of output column -> array, in model order
+
+    Example:
+        >>> evaluate_models([df], len(df), ['aps-v2.0', 'aps-ts-v1.0'])
+    """
+    cache = {}
+    outputs = {}
+    for model_id in (model_ids or active_models()):
+        scored = get_model(model_id).evaluate(sources, n_rows, cache)
+        clash = set(scored) & set(outputs)
+        if clash:
+            raise ValueError(f"Model {model_id} writes columns another model already wrote: {', '.join(sorted(clash))}")
+        outputs.update(scored)
+    return outputs
@@ -5,129 +5,108 @@ from datetime import datetime
 from pathlib import Path
 import json
 from engine.aps_config import REQUIRED_HEADERS, ENGINE_DIR
+from engine.aps_models import evaluate_models
+from engine.aps_metrics import months_elapsed
+from engine.aps_parsers import parse_money, parse_dates, header_signature
 
-def normalize_and_score(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Main normalization and scoring function
-    Handles both normalized and raw vendor column names
+def parse_sources(df: pd.DataFrame) -> dict:
     """
+    Parse the money/date source columns (either naming convention)
+    
+    Args:
+        df: Raw or alias-mapped vendor DataFrame
     
-    # Create working columns with consistent names
+    Returns:
+        Dict of float64 property_value / loan_balance and datetime64
+        loan_date arrays (zeros / NaT when the column is missing)
+    """
     # Property Value
     if 'EstValue' in df.columns:
-        df['_property_value'] = pd.to_numeric(df['EstValue'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
+        property_value = parse_money(df['EstValue'])
     elif 'property_value' in df.columns:
-        df['_property_value'] = pd.to_numeric(df['property_value'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
+        property_value = parse_money(df['property_value'])
     else:
-        df['_property_value'] = 0
+        property_value = np.zeros(len(df))
     
     # Loan Balance
     if 'TotalLoanBal' in df.columns:
-        df['_loan_balance'] = pd.to_numeric(df['TotalLoanBal'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
+        loan_balance = parse_money(df['TotalLoanBal'])
     elif 'loan_balance' in df.columns:
-        df['_loan_balance'] = pd.to_numeric(df['loan_balance'].astype(str).str.replace('$', '').str.replace(',', '').str.strip(), errors='coerce')
+        loan_balance = parse_money(df['loan_balance'])
     else:
-        df['_loan_balance'] = 0
+        loan_balance = np.zeros(len(df))
     
     # Loan Date
+    signature = header_signature(df.columns)
     if 'LastLoanDate' in df.columns:
-        df['_loan_date'] = pd.to_datetime(df['LastLoanDate'], errors='coerce')
+        loan_date = parse_dates(df['LastLoanDate'], signature, 'LastLoanDate')
     elif 'loan_date' in df.columns:
-        df['_loan_date'] = pd.to_datetime(df['loan_date'], errors='coerce')
+        loan_date = parse_dates(df['loan_date'], signature, 'loan_date')
     else:
-        df['_loan_date'] = pd.NaT
+        loan_date = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+    
+    return {
+        'property_value': property_value,
+        'loan_balance': loan_balance,
+        'loan_date': loan_date
+    }
+
+def normalize_and_score(df: pd.DataFrame, today: datetime = None, sources: dict = None,
+                        parsed: dict = None) -> pd.DataFrame:
+    """
+    Main normalization and scoring function
+    Handles both normalized and raw vendor column names
+    
+    Intermediates (parsed value, balance, loan date) stay local arrays and the
+    derived columns are added to `df` in place, so no frame copy is made.
+    
+    Args:
+        df: Raw or alias-mapped vendor DataFrame (derived columns are added to it)
+        today: Reference date for loan age (default: now). Pass one value
+               for every chunk of a run so all rows age against the same month.
+        sources: Optional dict that receives the parsed source arrays
+                 (see parse_sources), so health_check can reuse them
+        parsed: parse_sources(df) output when the caller already has it
+                (e.g. from the quarantine rules), so nothing is parsed twice
+    
+    Returns:
+        The same DataFrame with LTV, equity, loan age and APS columns
+    """
+    
+    # Parse source columns into local arrays
+    if parsed is None:
+        parsed = parse_sources(df)
+    if sources is not None:
+        sources.update(parsed)
+    property_value = parsed['property_value']
+    loan_balance = parsed['loan_balance']
+    loan_date = parsed['loan_date']
     
-    # Calculate LTV %
-    df['LTV %'] = ((df['_loan_balance'] / df['_property_value']) * 100).round(2)
-    df['LTV %'] = df['LTV %'].fillna(0).clip(0, 100)
+    # Calculate LTV % (missing/zero value -> 0, capped to 0-100)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ltv_pct = np.round((loan_balance / property_value) * 100, 2)
+    ltv_pct = np.clip(np.where(np.isnan(ltv_pct), 0, ltv_pct), 0, 100)
     
     # Calculate Equity %
-    df['Equity %'] = (100 - df['LTV %']).round(2)
+    equity_pct = np.round(100 - ltv_pct, 2)
     
     # Calculate Equity Dollars
-    df['Equity_Dollars'] = (df['_property_value'] * (df['Equity %'] / 100)).round(0)
-    
-    # Calculate Loan Age in Months
-    def calculate_months(loan_date):
-        if pd.isna(loan_date):
-            return 0
-        today = datetime.now()
-        years_diff = today.year - loan_date.year
-        months_diff = today.month - loan_date.month
-        total_months = years_diff * 12 + months_diff
-        return max(0, total_months)
-    
-    df['Loan_Age_Mo'] = df['_loan_date'].apply(calculate_months)
-    
-    # Calculate APS Score v2.0
-    def calculate_aps_score(row):
-        equity_pct = row['Equity %']
-        loan_age = row['Loan_Age_Mo']
-        ltv_pct = row['LTV %']
-        
-        # Equity component (0-100)
-        equity_score = equity_pct
-        
-        # Loan age component (optimal 18-36 months)
-        if loan_age < 18:
-            age_score = (loan_age / 18) * 50
-        elif loan_age <= 36:
-            age_score = 100
-        elif loan_age <= 60:
-            age_score = 100 - ((loan_age - 36) / 24) * 30
-        else:
-            age_score = max(40, 70 - ((loan_age - 60) / 60) * 30)
-        
-        # LTV component (lower is better)
-        ltv_score = 100 - ltv_pct
-        
-        # Weighted combination
-        aps_score = (equity_score * 0.40 + age_score * 0.30 + ltv_score * 0.30)
-        return round(aps_score, 1)
-    
-    df['APS_Score (v2.0)'] = df.apply(calculate_aps_score, axis=1)
-    
-    # Assign APS Tier
-    def assign_tier(row):
-        score = row['APS_Score (v2.0)']
-        ltv = row['LTV %']
-        equity_dollars = row['Equity_Dollars']
-        
-        if score >= 80 and ltv <= 30 and equity_dollars >= 500000:
-            return 'Platinum'
-        elif score >= 65 and ltv <= 50 and equity_dollars >= 300000:
-            return 'Gold'
-        elif score >= 50 and ltv <= 65 and equity_dollars >= 200000:
-            return 'Silver'
-        else:
-            return 'Nurture'
-    
-    df['APS_Tier'] = df.apply(assign_tier, axis=1)
-    
-    # Calculate CCI (Credit Confidence Index)
-    def calculate_cci(row):
-        equity_pct = row['Equity %']
-        ltv_pct = row['LTV %']
-        loan_age = row['Loan_Age_Mo']
-        
-        # Equity component (0-40 points)
-        equity_component = min(40, (equity_pct / 100) * 40)
-        
-        # LTV component (0-35 points)
-        ltv_component = max(0, 35 - (ltv_pct / 100) * 35)
-        
-        # Loan age component (0-25 points)
-        if loan_age >= 18:
-            age_component = min(25, 25 * (loan_age / 60))
-        else:
-            age_component = (loan_age / 18) * 15
-        
-        cci = equity_component + ltv_component + age_component
-        return round(cci, 1)
-    
-    df['CCI'] = df.apply(calculate_cci, axis=1)
-    
-    # Clean up temporary columns
-    df = df.drop(columns=['_property_value', '_loan_balance', '_loan_date'], errors='ignore')
+    equity_dollars = np.round(property_value * (equity_pct / 100), 0)
+    
+    # Calculate Loan Age in Months (year/month parts vs. one reference date)
+    loan_age = months_elapsed(loan_date, today)
+    
+    derived = {
+        'LTV %': ltv_pct,
+        'Equity %': equity_pct,
+        'Equity_Dollars': equity_dollars,
+        'Loan_Age_Mo': loan_age
+    }
+    
+    # APS Score v2.0, APS Tier and CCI (plus any shadow models) in one pass
+    derived.update(evaluate_models([derived, df], len(df)))
+    for col, values in derived.items():
+        # Wrapped in a Series so pandas adopts the array instead of copying it
+        df[col] = pd.Series(values, index=df.index, copy=False)
     
     return df
\ No newline at end of file
@@ -26,10 +26,17 @@ from engine.aps_black_kit import (
     APS_COLORS, add_teal_divider, get_black_kit_styles, 
     get_black_kit_table_style, apply_black_kit_to_plot
 )
+from engine.aps_sketch import column_median
 
 # ==================== PAGE 1: COVER ====================
-def create_page1_cover(story, df, market_name="Raleigh, NC", quarter=4, year=2025):
-    """Cover page with summary metrics"""
+def create_page1_cover(story, df, market_name="Raleigh, NC", quarter=4, year=2025, sketches=None,
+                       counts=None):
+    """
+    Cover page with summary metrics (medians reuse `sketches` from earlier stages)
+    
+    When df is a report sample, `counts` (HealthPartial.counts of the full
+    input) supplies the record and refi-eligible counts.
+    """
     styles = get_black_kit_styles()
     
     # Title
@@ -46,14 +53,15 @@ def create_page1_cover(story, df, market_name="Raleigh, NC", quarter=4, year=202
     add_teal_divider(story)
     
     # Calculate metrics
-    total_records = len(df)
-    median_ltv = df['LTV %'].median() if 'LTV %' in df.columns else 0
-    median_equity_pct = df['Equity %'].median() if 'Equity %' in df.columns else 0
-    median_equity_dollars = df['Equity_Dollars'].median() if 'Equity_Dollars' in df.columns else 0
-    median_loan_age = df['Loan_Age_Mo'].median() if 'Loan_Age_Mo' in df.columns else 0
-    
-    refi_eligible = 0
-    if 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
+    counts = counts or {}
+    total_records = counts.get('total_records', len(df))
+    median_ltv = column_median(df, 'LTV %', sketches)
+    median_equity_pct = column_median(df, 'Equity %', sketches)
+    median_equity_dollars = column_median(df, 'Equity_Dollars', sketches)
+    median_loan_age = column_median(df, 'Loan_Age_Mo', sketches)
+    
+    refi_eligible = counts.get('refi_eligible', 0)
+    if 'refi_eligible' not in counts and 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
         refi_eligible = len(df[(df['LTV %'] <= 80) & (df['Loan_Age_Mo'] >= 18)])
     refi_pct = (refi_eligible / total_records * 100) if total_records > 0 else 0
     
@@ -98,7 +106,7 @@ def create_page2_geo_intelligence(story, df):
     
     # ZIP-level analysis
     if 'ZIP' in df.columns and 'Equity_Dollars' in df.columns and 'LTV %' in df.columns:
-        zip_analysis = df.groupby('ZIP').agg({
+        zip_analysis = df.groupby('ZIP', observed=True).agg({
             'Equity_Dollars': 'median',
             'LTV %': 'median',
             'APS_Score (v2.0)': 'median'
@@ -426,10 +434,17 @@ from engine.aps_black_kit import (
     APS_COLORS, add_teal_divider, get_black_kit_styles, 
     get_black_kit_table_style, apply_black_kit_to_plot
 )
+from engine.aps_sketch import column_median
 
 # ==================== PAGE 1: COVER ====================
-def create_page1_cover(story, df, market_name="Raleigh, NC", quarter=4, year=2025):
-    """Cover page with summary metrics"""
+def create_page1_cover(story, df, market_name="Raleigh, NC", quarter=4, year=2025, sketches=None,
+                       counts=None):
+    """
+    Cover page with summary metrics (medians reuse `sketches` from earlier stages)
+    
+    When df is a report sample, `counts` (HealthPartial.counts of the full
+    input) supplies the record and refi-eligible counts.
+    """
     styles = get_black_kit_styles()
     
     # Title
@@ -446,14 +461,15 @@ def create_page1_cover(story, df, market_name="Raleigh, NC", quarter=4, year=202
     add_teal_divider(story)
     
     # Calculate metrics
-    total_records = len(df)
-    median_ltv = df['LTV %'].median() if 'LTV %' in df.columns else 0
-    median_equity_pct = df['Equity %'].median() if 'Equity %' in df.columns else 0
-    median_equity_dollars = df['Equity_Dollars'].median() if 'Equity_Dollars' in df.columns else 0
-    median_loan_age = df['Loan_Age_Mo'].median() if 'Loan_Age_Mo' in df.columns else 0
-    
-    refi_eligible = 0
-    if 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
+    counts = counts or {}
+    total_records = counts.get('total_records', len(df))
+    median_ltv = column_median(df, 'LTV %', sketches)
+    median_equity_pct = column_median(df, 'Equity %', sketches)
+    median_equity_dollars = column_median(df, 'Equity_Dollars', sketches)
+    median_loan_age = column_median(df, 'Loan_Age_Mo', sketches)
+    
+    refi_eligible = counts.get('refi_eligible', 0)
+    if 'refi_eligible' not in counts and 'LTV %' in df.columns and 'Loan_Age_Mo' in df.columns:
         refi_eligible = len(df[(df['LTV %'] <= 80) & (df['Loan_Age_Mo'] >= 18)])
     refi_pct = (refi_eligible / total_records * 100) if total_records > 0 else 0
     
@@ -801,7 +817,7 @@ def create_page7_geo_heatmap(story, df):
     
     # ZIP-level analysis
     if 'ZIP' in df.columns and 'Equity_Dollars' in df.columns and 'LTV %' in df.columns:
-        zip_analysis = df.groupby('ZIP').agg({
+        zip_analysis = df.groupby('ZIP', observed=True).agg({
             'Equity_Dollars': 'median',
             'LTV %': 'median',
             'APS_Score (v2.0)': 'median'
@@ -0,0 +1,120 @@
+# aps_parallel.py - Multi-Core Normalize & Score
+"""
+Process-pool executor for normalize_and_score
+Splits a large frame into contiguous row partitions, scores them on every
+core and reassembles the result in the original row order.
+Only the money/date source columns go to the workers and only the derived
+columns come back, so inter-process traffic stays small.
+Frames below PARALLEL_MIN_ROWS take the single-process path.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from engine.aps_config import PARALLEL_MIN_ROWS, PARALLEL_WORKERS
+from engine.aps_normalize import normalize_and_score
+from engine.aps_parsers import DATE_FORMAT_CACHE, detect_date_format, header_signature
+from engine.aps_models import model_columns, model_inputs
+
+# Columns normalize_and_score reads (either naming) and the columns it adds before scoring
+SOURCE_COLUMNS = ['EstValue', 'property_value', 'TotalLoanBal', 'loan_balance', 'LastLoanDate', 'loan_date']
+DATE_COLUMNS = ['LastLoanDate', 'loan_date']
+NORMALIZED_COLUMNS = ['LTV %', 'Equity %', 'Equity_Dollars', 'Loan_Age_Mo']
+
+# Parsed source arrays travel back under these names when the caller wants them
+SOURCE_ARRAY_PREFIX = '_source_'
+
+# ==================== WORKER SETUP ====================
+
+def _seed_date_formats(formats: dict):
+    """Pool initializer: share the parent's detected date formats"""
+    DATE_FORMAT_CACHE.update(formats)
+
+def _detect_date_formats(df: pd.DataFrame) -> dict:
+    """
+    Detect loan date formats once, over the whole frame
+
+    Without this every partition would detect on its own sample and could
+    settle on a different format (e.g. a partition with no day > 12).
+    """
+    signature = header_signature(df.columns)
+    for col in DATE_COLUMNS:
+        if col in df.columns and DATE_FORMAT_CACHE.get((signature, col)) is None:
+            fmt = detect_date_format(pd.unique(df[col]))
+            if fmt is not None:
+                DATE_FORMAT_CACHE[(signature, col)] = fmt
+    return dict(DATE_FORMAT_CACHE)
+
+def _score_partition(partition: pd.DataFrame, today: datetime, with_sources: bool = False) -> pd.DataFrame:
+    """Worker: derived columns for one partition (tiers as category to keep pickles small)"""
+    sources = {}
+    scored = normalize_and_score(partition, today=today, sources=sources)
+    derived = scored[NORMALIZED_COLUMNS + model_columns()]
+    labels = [col for col in derived.columns if not pd.api.types.is_numeric_dtype(derived[col].dtype)]
+    derived = derived.astype({col: 'category' for col in labels})
+    if with_sources:
+        derived = derived.assign(**{SOURCE_ARRAY_PREFIX + name: values for name, values in sources.items()})
+    return derived
+
+# ==================== PARALLEL SCORING ====================
+
+def resolve_workers(workers: int = None) -> int:
+    """Worker count: argument, then PARALLEL_WORKERS, then CPU count"""
+    return max(1, workers or PARALLEL_WORKERS or os.cpu_count() or 1)
+
+def normalize_and_score_parallel(df: pd.DataFrame, today: datetime = None, workers: int = None,
+                                 min_rows: int = PARALLEL_MIN_ROWS, sources: dict = None,
+                                 parsed: dict = None) -> pd.DataFrame:
+    """
+    normalize_and_score across a process pool
+
+    Args:
+        df: Raw or alias-mapped vendor DataFrame
+        today: Loan-age reference date shared by every partition (default: now)
+        workers: Process count (default: PARALLEL_WORKERS or CPU count)
+        min_rows: Below this row count, score in-process
+        sources: Optional dict that receives the parsed source arrays
+                 (see normalize_and_score)
+        parsed: parse_sources(df) output, reused on the single-process path
+                (workers parse their own partitions)
+
+    Returns:
+        Scored DataFrame, identical to normalize_and_score(df, today)
+
+    Example:
+        >>> scored = normalize_and_score_parallel(df, workers=8)
+    """
+    if today is None:
+        today = datetime.now()
+
+    workers = resolve_workers(workers)
+    if len(df) < min_rows or workers <= 1:
+        return normalize_and_score(df, today=today, sources=sources, parsed=parsed)
+
+    needed = SOURCE_COLUMNS + [col for col in model_inputs() if col not in SOURCE_COLUMNS]
+    source = df[[col for col in needed if col in df.columns]]
+    formats = _detect_date_formats(source)
+
+    # Contiguous partitions, so concatenation restores the original order
+    bounds = np.linspace(0, len(df), workers + 1).astype(int)
+    partitions = [source.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_seed_date_formats,
+                             initargs=(formats,)) as pool:
+        derived = pd.concat(pool.map(_score_partition, partitions, [today] * workers,
+                                     [sources is not None] * workers))
+
+    if sources is not None:
+        parsed = [col for col in derived.columns if col.startswith(SOURCE_ARRAY_PREFIX)]
+        sources.update({col[len(SOURCE_ARRAY_PREFIX):]: derived[col].to_numpy() for col in parsed})
+        derived = derived.drop(columns=parsed)
+
+    for col in derived.columns:
+        values = derived[col]
+        df[col] = values.to_numpy(dtype=object) if isinstance(values.dtype, pd.CategoricalDtype) else values.to_numpy()
+
+    return df
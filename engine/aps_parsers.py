@@ -0,0 +1,286 @@
+# aps_parsers.py - Vendor Column Parsers
+"""
+Fast parsers for vendor-formatted columns used by normalize_and_score
+Money: $, commas, whitespace, (negatives), trailing K/M
+Dates: format detected once per vendor header, parsed per unique value
+"""
+
+import hashlib
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# ==================== MONEY ====================
+
+MONEY_SUFFIXES = {'K': 1e3, 'M': 1e6}
+
+# Cells longer than this (or with more significant digits) take the regex path
+MAX_MONEY_WIDTH = 24
+MAX_MONEY_DIGITS = 15
+
+_MONEY_NOISE = r'[\s$,]'
+_MONEY_PATTERN = r'^(?P<open>\()?(?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?P<suffix>[KkMm])?(?P<close>\))?$'
+
+_POW10 = 10.0 ** np.arange(0, MAX_MONEY_DIGITS + 8)
+
+# Byte -> character class lookup for the byte-buffer parser
+_INVALID, _DIGIT, _NOISE, _DOT, _MINUS, _PLUS, _OPEN, _CLOSE, _K, _M = range(10)
+_MONEY_CLASS = np.zeros(256, dtype=np.uint8)
+_MONEY_CLASS[ord('0'):ord('9') + 1] = _DIGIT
+_MONEY_CLASS[[0, ord(' '), ord('\t'), ord('$'), ord(',')]] = _NOISE
+_MONEY_CLASS[ord('.')] = _DOT
+_MONEY_CLASS[ord('-')] = _MINUS
+_MONEY_CLASS[ord('+')] = _PLUS
+_MONEY_CLASS[ord('(')] = _OPEN
+_MONEY_CLASS[ord(')')] = _CLOSE
+_MONEY_CLASS[[ord('K'), ord('k')]] = _K
+_MONEY_CLASS[[ord('M'), ord('m')]] = _M
+
+def parse_money(values) -> np.ndarray:
+    """
+    Parse a vendor money column to float64
+
+    Fast paths:
+    1. Numeric dtype (pandas already parsed it) - no string work at all
+    2. ASCII strings - parsed in one pass over the fixed-width byte buffer
+    Only cells the byte parser rejects (exponents, non-ASCII, very long
+    cells) fall back to a regex pass.
+
+    Args:
+        values: Series / array-like column
+
+    Returns:
+        float64 array (unparseable -> NaN)
+
+    Example:
+        >>> parse_money(pd.Series(['$1,250', '(500)', '1.2K', 'n/a']))
+        array([1250., -500., 1200., nan])
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+
+    # Fast path 1: already numeric
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    parsed = np.full(len(series), np.nan)
+    present = series.notna().to_numpy()
+    if not present.any():
+        return parsed
+
+    text = series[present].astype(str)
+    todo = np.flatnonzero(present)
+
+    # Fast path 2: byte-buffer parser
+    fast = np.ones(len(text), dtype=bool)
+    try:
+        raw = text.to_numpy(dtype='S')
+    except UnicodeEncodeError:
+        fast = text.str.isascii().to_numpy(copy=True)
+        raw = None
+    if raw is None or raw.dtype.itemsize > MAX_MONEY_WIDTH:
+        fast &= (text.str.len() <= MAX_MONEY_WIDTH).to_numpy()
+        raw = text[fast].to_numpy(dtype='S')
+
+    numbers, ok = _parse_money_bytes(raw)
+    parsed[todo[fast][ok]] = numbers[ok]
+    fast[np.flatnonzero(fast)[~ok]] = False
+
+    # Slow path: whatever the byte parser could not take
+    if not fast.all():
+        parsed[todo[~fast]] = _parse_money_regex(text[~fast])
+
+    return parsed
+
+def _parse_money_bytes(raw: np.ndarray):
+    """
+    Parse a fixed-width bytes array ('S' dtype) of money strings
+
+    The buffer is viewed as a (width, rows) uint8 matrix and scanned one
+    character column at a time, so every step is a whole-column operation.
+    Digits accumulate into an exact int64 mantissa that is scaled by one
+    power of ten, giving the correctly rounded float (same as float()).
+
+    Returns:
+        (float64 values, bool mask of cells that were parsed)
+    """
+    rows = len(raw)
+    width = raw.dtype.itemsize
+    if rows == 0 or width == 0:
+        return np.full(rows, np.nan), np.zeros(rows, dtype=bool)
+
+    columns = np.ascontiguousarray(raw.view(np.uint8).reshape(rows, width).T)
+
+    mantissa = np.zeros(rows, dtype=np.int64)
+    n_digits = np.zeros(rows, dtype=np.int16)
+    frac_digits = np.zeros(rows, dtype=np.int16)
+    state = {name: np.zeros(rows, dtype=bool) for name in
+             ('bad', 'digit', 'dot', 'sign', 'minus', 'open', 'close', 'k', 'm')}
+
+    for column in columns:
+        cls = _MONEY_CLASS[column]
+        is_digit = cls == _DIGIT
+        is_dot = cls == _DOT
+        is_sign = (cls == _MINUS) | (cls == _PLUS)
+        is_open = cls == _OPEN
+        is_close = cls == _CLOSE
+        is_suffix = (cls == _K) | (cls == _M)
+        finished = state['close'] | state['k'] | state['m']
+        started = state['digit'] | state['dot']
+
+        state['bad'] |= (
+            (cls == _INVALID) |
+            ((is_digit | is_dot) & finished) |
+            (is_dot & state['dot']) |
+            (is_sign & (started | state['sign'])) |
+            (is_open & (started | state['open'])) |
+            (is_close & (~state['open'] | state['close'])) |
+            (is_suffix & (~state['digit'] | finished))
+        )
+
+        mantissa = np.where(is_digit, mantissa * 10 + (column - 48), mantissa)
+        n_digits += is_digit
+        frac_digits += is_digit & state['dot']
+
+        state['digit'] |= is_digit
+        state['dot'] |= is_dot
+        state['sign'] |= is_sign
+        state['minus'] |= cls == _MINUS
+        state['open'] |= is_open
+        state['close'] |= is_close
+        state['k'] |= cls == _K
+        state['m'] |= cls == _M
+
+    ok = ~state['bad'] & state['digit'] & (n_digits <= MAX_MONEY_DIGITS) & (state['open'] == state['close'])
+
+    # Decimal exponent: digits after the dot, minus K/M
+    exponent = frac_digits - np.where(state['k'], 3, np.where(state['m'], 6, 0))
+    scale = _POW10[np.abs(exponent)]
+    numbers = np.where(exponent >= 0, mantissa / scale, mantissa * scale)
+    numbers = np.where(state['minus'] | state['open'], -numbers, numbers)
+
+    return np.where(ok, numbers, np.nan), ok
+
+def _parse_money_regex(text: pd.Series) -> np.ndarray:
+    """Regex fallback for cells the byte parser rejects"""
+    parts = text.str.replace(_MONEY_NOISE, '', regex=True).str.extract(_MONEY_PATTERN)
+
+    number = pd.to_numeric(parts['number'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    multiplier = parts['suffix'].str.upper().map(MONEY_SUFFIXES).fillna(1).to_numpy(dtype=np.float64)
+
+    has_open = parts['open'].notna().to_numpy()
+    has_close = parts['close'].notna().to_numpy()
+    sign = np.where(has_open & has_close, -1.0, 1.0)
+
+    return np.where(has_open != has_close, np.nan, number * multiplier * sign)
+
+# ==================== DATES ====================
+
+# Candidate vendor date formats, most common first
+DATE_FORMATS = [
+    '%m/%d/%Y', '%Y-%m-%d', '%m/%d/%y', '%Y/%m/%d', '%m-%d-%Y', '%Y%m%d',
+    '%d-%b-%Y', '%b %d, %Y', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'
+]
+DATE_SAMPLE_SIZE = 200
+DATE_MATCH_THRESHOLD = 0.9
+
+# Engine-derived columns, ignored when fingerprinting a vendor header
+DERIVED_COLUMNS = {
+    '_property_value', '_loan_balance', '_loan_date',
+    'LTV %', 'Equity %', 'Equity_Dollars', 'Loan_Age_Mo',
+    'APS_Score (v2.0)', 'APS_Tier', 'CCI'
+}
+
+# (header signature, column) -> detected format (None = no explicit format fits)
+DATE_FORMAT_CACHE = {}
+
+def header_signature(columns) -> str:
+    """
+    Stable fingerprint of a vendor header row
+
+    Engine-derived columns are ignored, so a raw frame and its scored
+    output share a signature.
+
+    Args:
+        columns: Column names (in file order)
+
+    Returns:
+        16-char hex digest
+    """
+    vendor_columns = [str(col) for col in columns if col not in DERIVED_COLUMNS]
+    return hashlib.sha1('\x1f'.join(vendor_columns).encode('utf-8')).hexdigest()[:16]
+
+def detect_date_format(values) -> Optional[str]:
+    """
+    Detect the date format from a sample of values
+
+    Args:
+        values: Array-like of date strings (ideally unique values)
+
+    Returns:
+        strptime format matching >= DATE_MATCH_THRESHOLD of the sample, or None
+    """
+    sample = pd.Series(values, dtype=object).dropna().astype(str).head(DATE_SAMPLE_SIZE)
+    if sample.empty:
+        return None
+
+    best_format, best_rate = None, 0.0
+    for fmt in DATE_FORMATS:
+        rate = pd.to_datetime(sample, format=fmt, errors='coerce').notna().mean()
+        if rate > best_rate:
+            best_format, best_rate = fmt, rate
+        if rate == 1.0:
+            break
+
+    return best_format if best_rate >= DATE_MATCH_THRESHOLD else None
+
+def parse_dates(values, signature: Optional[str] = None, column: Optional[str] = None) -> pd.Series:
+    """
+    Parse a vendor date column with an explicit, cached format
+
+    Loan dates repeat heavily, so only the unique values are parsed and the
+    result is broadcast back. The detected format is cached per
+    (header signature, column) so repeat vendors skip detection.
+
+    Args:
+        values: Series / array-like of dates
+        signature: header_signature() of the source file (optional)
+        column: Source column name (cache key)
+
+    Returns:
+        datetime64 Series aligned to `values` (unparseable -> NaT)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    uniques = pd.Index(uniques).astype(str)
+
+    # Only detected formats are cached: a chunk with no recognizable dates is re-detected next time
+    cache_key = (signature, column)
+    fmt = DATE_FORMAT_CACHE.get(cache_key) if signature is not None else None
+    if fmt is None:
+        fmt = detect_date_format(uniques)
+
+    if fmt is not None:
+        parsed = pd.to_datetime(uniques, format=fmt, errors='coerce')
+        if parsed.notna().mean() < DATE_MATCH_THRESHOLD:
+            # Vendor changed its layout under the same header - detect again
+            fmt = detect_date_format(uniques)
+            parsed = pd.to_datetime(uniques, format=fmt, errors='coerce') if fmt else None
+    if fmt is None:
+        parsed = pd.to_datetime(uniques, errors='coerce')
+
+    if signature is not None:
+        if fmt is not None:
+            DATE_FORMAT_CACHE[cache_key] = fmt
+        else:
+            DATE_FORMAT_CACHE.pop(cache_key, None)
+
+    result = parsed.to_numpy(dtype='datetime64[ns]')[codes]
+    result[codes < 0] = np.datetime64('NaT')
+    return pd.Series(result, index=series.index)
@@ -12,12 +12,22 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
-from aps_config import INPUT_DIR, OUTPUT_DIR
-from engine.aps_normalize import normalize_and_score
-from aps_healthcheck import health_check
+from aps_config import INPUT_DIR, OUTPUT_DIR, STREAM_CHUNK_ROWS, STREAM_THRESHOLD_MB
+from engine.aps_parallel import normalize_and_score_parallel
+from engine.aps_dtypes import apply_dtype_plan, bytes_per_row, memory_report
+from engine.aps_stream import stream_score_csv
+from engine.aps_quarantine import quarantine_path, quarantine_rows
+from engine.aps_aliases import engine_header_map
+from engine.aps_schema import read_plan
+from engine.aps_normalize import parse_sources
+from engine.aps_io import read_csv
+from aps_healthcheck import HealthPartial, health_check, health_report
 from aps_render import render_pdf
 from aps_black_kit import generate_aps_filename
 
+# Feed this pipeline renders (its Black Kit is the Core Equity layout)
+FEED = 'core_equity'
+
 def extract_market_info(df):
     """Extract market name, quarter, year from data"""
     market_name = "Raleigh, NC"  # Default
@@ -37,7 +47,7 @@ def extract_market_info(df):
     
     return market_name, quarter, year
 
-def main(csv_path: str):
+def main(csv_path: str, chunk_rows: int = None):
     """
     Main pipeline execution
     
@@ -47,32 +57,85 @@ def main(csv_path: str):
     3. Run 18-point health check
     4. Save scored CSV
     5. Generate Black Kit PDF (7 pages)
+    
+    With chunk_rows (or any file over STREAM_THRESHOLD_MB), steps 1, 2 and 4
+    stream chunk by chunk and steps 3 and 5 run on a uniform report sample.
     """
     csv_path = Path(csv_path)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
+    if chunk_rows is None and csv_path.stat().st_size > STREAM_THRESHOLD_MB * 1024 * 1024:
+        chunk_rows = STREAM_CHUNK_ROWS
+    csv_out = OUTPUT_DIR / (csv_path.stem + "_scored.csv")
+    quarantine_out = quarantine_path(csv_out)
+    
     print("\n" + "="*60)
     print("APS MARKET INTELLIGENCE PIPELINE")
     print("="*60)
     print(f"\n📁 Input file: {csv_path.name}")
     
-    # Step 1: Load CSV
-    print("\n[1/5] Loading CSV...")
-    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-    print(f"  ✓ Loaded {len(df):,} records")
-    print(f"  ✓ Found {len(df.columns)} columns")
-    
-    # Step 2: Normalize and score
-    print("\n[2/5] Normalizing and scoring data...")
-    df = normalize_and_score(df)
-    print("  ✓ Calculated LTV, Equity, Loan Age")
-    print("  ✓ Calculated APS Score v2.0")
-    print("  ✓ Assigned APS Tiers")
-    print("  ✓ Calculated CCI Index")
+    sources = {}  # parsed money/date arrays, reused by the health check
+    health = None  # streaming: health statistics merged from every chunk
+    if chunk_rows:
+        # Steps 1, 2 & 4 (streaming): score each chunk and append it to the scored CSV
+        print(f"\n[1/5] Streaming CSV ({chunk_rows:,} rows per chunk)...")
+        print("\n[2/5] Normalizing and scoring data...")
+        health = HealthPartial()
+        # Columns the feed outputs and the names the engine reads, resolved once from the header row
+        header = read_csv(csv_path, nrows=0).columns
+        usecols = read_plan(header, FEED)['usecols']
+        header_map = engine_header_map(usecols)
+        print(f"  ✓ Reading {len(usecols)} of {len(header)} columns")
+        if header_map:
+            print(f"  ✓ Mapped {len(header_map)} vendor headers")
+        total_rows, df = stream_score_csv(
+            csv_path,
+            csv_out,
+            chunk_rows,
+            encoding='utf-8',
+            read_kwargs={'dtype': str, 'keep_default_na': False, 'usecols': usecols},
+            health=health,
+            quarantine_path=quarantine_out,
+            header_map=header_map
+        )
+        print(f"  ✓ Scored {total_rows:,} records")
+        print(f"  ✓ Report sample: {len(df):,} records")
+        df = apply_dtype_plan(df)
+    else:
+        # Step 1: Load CSV
+        print("\n[1/5] Loading CSV...")
+        header = read_csv(csv_path, nrows=0).columns
+        df = read_csv(csv_path, dtype=str, keep_default_na=False, usecols=read_plan(header, FEED)['usecols'])
+        header_map = engine_header_map(df.columns)
+        df.rename(columns=header_map, inplace=True)
+        print(f"  ✓ Loaded {len(df):,} records")
+        if header_map:
+            print(f"  ✓ Mapped {len(header_map)} vendor headers")
+        print(f"  ✓ Read {len(df.columns)} of {len(header)} columns")
+        
+        # Rows failing the quarantine rules go to a sidecar CSV, unscored
+        parsed = parse_sources(df)
+        df, quarantined = quarantine_rows(df, parsed)
+        if len(quarantined):
+            quarantined.to_csv(quarantine_out, index=False, encoding='utf-8')
+            print(f"  ⚠ Quarantined {len(quarantined):,} rows → {quarantine_out.name}")
+        
+        # Step 2: Normalize and score
+        print("\n[2/5] Normalizing and scoring data...")
+        df = normalize_and_score_parallel(df, sources=sources, parsed=parsed)
+        print("  ✓ Calculated LTV, Equity, Loan Age")
+        print("  ✓ Calculated APS Score v2.0")
+        print("  ✓ Assigned APS Tiers")
+        print("  ✓ Calculated CCI Index")
+        before = bytes_per_row(df)
+        df = apply_dtype_plan(df)
+        print(f"  ✓ Compact dtypes: {memory_report(before, df)}")
     
     # Step 3: Health check
     print("\n[3/5] Running 18-point health check...")
-    hc = health_check(df)
+    sketches = health.sketches if health is not None else {}  # medians reused by the cover page
+    counts = health.counts if health is not None else None  # full-file cover counts (df is a sample)
+    hc = health_report(health) if health is not None else health_check(df, sources, sketches)
     
     print("\n" + "-"*60)
     print("HEALTH CHECK RESULTS")
@@ -107,8 +170,8 @@ def main(csv_path: str):
     
     # Step 4: Save scored CSV
     print("\n[4/5] Saving scored CSV...")
-    csv_out = OUTPUT_DIR / (csv_path.stem + "_scored.csv")
-    df.to_csv(csv_out, index=False, encoding='utf-8')
+    if not chunk_rows:
+        df.to_csv(csv_out, index=False, encoding='utf-8')
     print(f"  ✓ Saved: {csv_out.name}")
     
     # Step 5: Generate PDF
@@ -126,7 +189,7 @@ def main(csv_path: str):
     print(f"  → Output: {pdf_filename}")
     
     render_pdf(df, pdf_out, csv_filename=csv_path.name, 
-              market_name=market_name, quarter=quarter, year=year)
+              market_name=market_name, quarter=quarter, year=year, sketches=sketches, counts=counts)
     
     print("\n" + "="*60)
     print("PIPELINE COMPLETE ✓")
@@ -143,9 +206,13 @@ def main(csv_path: str):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("\nUsage: python aps_pipeline.py <csv_file_path>")
+        print("\nUsage: python aps_pipeline.py <csv_file_path> [--chunk-rows N]")
         print("Example: python aps_pipeline.py input/test.csv")
         print("\nOr use: RUN_ME.bat\n")
         sys.exit(1)
     
-    main(sys.argv[1])
\ No newline at end of file
+    chunk_rows = None
+    if '--chunk-rows' in sys.argv:
+        chunk_rows = int(sys.argv[sys.argv.index('--chunk-rows') + 1])
+    
+    main(sys.argv[1], chunk_rows=chunk_rows)
\ No newline at end of file
@@ -0,0 +1,294 @@
+# aps_quarantine.py - Row Quarantine Rules
+"""
+Declarative row validation (quarantine_rules/*.yaml) compiled to vectorized masks
+Runs right after alias mapping, before scoring: each input is parsed once
+per chunk (the same parse_sources arrays scoring uses), every rule becomes
+one boolean mask and the masks are packed into a reason bit field per row.
+Rows with any bit set are split off with their reason codes and written to
+a sidecar file instead of being scored and rendered.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from engine.aps_config import QUARANTINE_RULES
+from engine.aps_dedupe import normalize_zip
+from engine.aps_normalize import parse_sources
+
+# Reason codes of each quarantined row, '|'-joined (e.g. "VALUE_MISSING|ZIP_INVALID")
+REASON_COLUMN = 'Quarantine_Reasons'
+
+# Conditions a rule may declare (a rule with several matches when all of them do)
+CONDITIONS = ['missing', 'unparseable', 'below', 'above', 'not_match']
+
+# Conditions that need numeric inputs (source / ratio) and text inputs (parse)
+NUMERIC_CONDITIONS = {'unparseable', 'below', 'above'}
+TEXT_CONDITIONS = {'not_match'}
+
+# Text parsers, applied once per distinct value (NaN = missing)
+TEXT_PARSERS = {
+    'text': lambda values: values.astype('str').str.strip().where(values.notna()).replace('', np.nan),
+    'zip': normalize_zip
+}
+
+# rules path -> CompiledRules (loaded on first use)
+RULES_CACHE = {}
+
+# ==================== INPUTS ====================
+
+def _first_column(df: pd.DataFrame, names: list) -> Optional[str]:
+    """First of `names` present in df"""
+    return next((name for name in names if name in df.columns), None)
+
+def _blank(series: pd.Series) -> np.ndarray:
+    """True where a raw cell is missing, empty or whitespace only"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.isna().to_numpy()
+    # NaN is masked first: pandas 2 turns object NaN into the string 'nan'
+    return series.isna().to_numpy() | series.astype('str').str.strip().eq('').to_numpy(dtype=bool)
+
+class _Input:
+    """
+    One rule input over a chunk
+
+    Numeric inputs hold a parsed array (parse_sources or a ratio); text
+    inputs are parsed once per distinct value and broadcast through codes.
+    """
+
+    def __init__(self, raw: Optional[pd.Series], values: Optional[np.ndarray] = None,
+                 parse: Optional[str] = None):
+        self.raw = raw
+        self.values = values
+        self.parse = parse
+        self._distinct = None
+
+    def distinct(self) -> tuple:
+        """(codes per row, parsed distinct values as objects; None = missing)"""
+        if self._distinct is None:
+            codes, uniques = pd.factorize(self.raw)
+            parsed = TEXT_PARSERS[self.parse](pd.Series(uniques))
+            self._distinct = codes, parsed.to_numpy(dtype=object, na_value=None)
+        return self._distinct
+
+    def missing(self) -> np.ndarray:
+        """Blank or unparseable"""
+        if self.values is not None:
+            return np.isnan(self.values) if self.values.dtype.kind == 'f' else np.isnat(self.values)
+        if self.parse == 'text':
+            return _blank(self.raw)
+        codes, parsed = self.distinct()
+        return np.append(np.equal(parsed, None), True)[codes]
+
+    def unparseable(self) -> np.ndarray:
+        """Present in the raw column but not parseable (blanks are only checked on missing rows)"""
+        mask = self.missing()
+        if self.raw is not None and mask.any():
+            mask[mask] = ~_blank(self.raw[mask])
+        return mask
+
+    def not_match(self, pattern: re.Pattern) -> np.ndarray:
+        """Missing or not fully matching `pattern`, tested once per distinct value"""
+        codes, parsed = self.distinct()
+        matches = [value is not None and pattern.fullmatch(value) is not None for value in parsed]
+        return ~np.append(np.array(matches, dtype=bool), False)[codes]
+
+# ==================== RULE COMPILER ====================
+
+def _compile_condition(name: str, arg):
+    """One condition -> function of an _Input returning a bool mask"""
+    if name == 'missing':
+        return (lambda x: x.missing()) if arg else (lambda x: ~x.missing())
+    if name == 'unparseable':
+        return (lambda x: x.unparseable()) if arg else (lambda x: ~x.unparseable())
+    if name == 'below':
+        return lambda x: np.less(x.values, arg)
+    if name == 'above':
+        return lambda x: np.greater(x.values, arg)
+    if name == 'not_match':
+        pattern = re.compile(arg)
+        return lambda x: x.not_match(pattern)
+    raise ValueError(f"Unknown condition: {name}")
+
+class CompiledRules:
+    """
+    A rule set compiled to vectorized masks
+
+    Example:
+        >>> rules = load_rules()
+        >>> clean, quarantined = rules.split(chunk)
+    """
+
+    def __init__(self, spec: dict):
+        self.name = spec.get('name', 'quarantine')
+        self.version = str(spec.get('version', ''))
+        self.inputs = spec['inputs']
+        self.codes = []
+        self.rules = []
+
+        for rule in spec['rules']:
+            if rule['input'] not in self.inputs:
+                raise ValueError(f"{self.name}: rule {rule['code']} uses unknown input {rule['input']}")
+            names = [name for name in CONDITIONS if name in rule]
+            numeric = 'parse' not in self.inputs[rule['input']]
+            if (numeric and TEXT_CONDITIONS.intersection(names)) or (not numeric and NUMERIC_CONDITIONS.intersection(names)):
+                raise ValueError(f"{self.name}: rule {rule['code']} mixes up text and numeric conditions")
+            conditions = [_compile_condition(name, rule[name]) for name in names]
+            if not conditions:
+                raise ValueError(f"{self.name}: rule {rule['code']} has no condition ({', '.join(CONDITIONS)})")
+            if rule['code'] not in self.codes:
+                self.codes.append(rule['code'])
+            self.rules.append((rule['input'], self.codes.index(rule['code']), conditions))
+
+        if len(self.codes) > 64:
+            raise ValueError(f"{self.name}: at most 64 reason codes")
+
+    def _parse_inputs(self, df: pd.DataFrame, parsed: dict) -> Dict[str, _Input]:
+        """Inputs whose columns are present (parse_sources arrays are reused, nothing parsed twice)"""
+        inputs = {}
+        for name, spec in self.inputs.items():
+            if 'ratio' in spec:
+                continue
+            col = _first_column(df, spec['columns'])
+            if col is None:
+                continue
+            if 'source' in spec:
+                inputs[name] = _Input(df[col], values=np.asarray(parsed[spec['source']]))
+            else:
+                inputs[name] = _Input(df[col], parse=spec.get('parse', 'text'))
+
+        for name, spec in self.inputs.items():
+            if 'ratio' in spec:
+                numerator, denominator = spec['ratio']
+                if numerator in inputs and denominator in inputs:
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        values = inputs[numerator].values / inputs[denominator].values * spec.get('scale', 1)
+                    inputs[name] = _Input(None, values=np.where(np.isfinite(values), values, np.nan))
+        return inputs
+
+    def evaluate(self, df: pd.DataFrame, parsed: Optional[dict] = None) -> np.ndarray:
+        """
+        Reason bits per row (bit i set = self.codes[i] matched; 0 = clean)
+
+        Args:
+            df: Raw or alias-mapped DataFrame
+            parsed: parse_sources(df) output, when the caller already has it
+
+        Returns:
+            uint64 array aligned with df rows
+        """
+        if parsed is None:
+            parsed = parse_sources(df)
+        inputs = self._parse_inputs(df, parsed)
+
+        bits = np.zeros(len(df), dtype=np.uint64)
+        for name, code, conditions in self.rules:
+            if name not in inputs:
+                continue
+            mask = conditions[0](inputs[name])
+            for condition in conditions[1:]:
+                mask &= condition(inputs[name])
+            bits[mask] |= np.uint64(1 << code)
+        return bits
+
+    def reasons(self, bits: np.ndarray) -> np.ndarray:
+        """'|'-joined reason codes per bit pattern (each distinct pattern formatted once)"""
+        patterns, codes = np.unique(bits, return_inverse=True)
+        labels = np.array(['|'.join(code for i, code in enumerate(self.codes) if int(pattern) >> i & 1)
+                           for pattern in patterns], dtype=object)
+        return labels[codes]
+
+    def split(self, df: pd.DataFrame, parsed: Optional[dict] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split a chunk into clean and quarantined rows
+
+        Args:
+            df: Raw or alias-mapped DataFrame
+            parsed: parse_sources(df) output, when the caller already has it;
+                    its arrays are cut down to the clean rows in place, so it
+                    can go straight on to normalize_and_score(clean, parsed=...)
+
+        Returns:
+            (clean rows, quarantined rows with a REASON_COLUMN)
+        """
+        if parsed is None:
+            parsed = parse_sources(df)
+        bits = self.evaluate(df, parsed)
+        flagged = bits != 0
+
+        if not flagged.any():
+            return df, df.iloc[:0].assign(**{REASON_COLUMN: pd.Series(dtype='str')})
+
+        quarantined = df[flagged].assign(**{REASON_COLUMN: self.reasons(bits[flagged])})
+        clean = df[~flagged]
+        for name, values in parsed.items():
+            parsed[name] = np.asarray(values)[~flagged]
+        return clean, quarantined
+
+# ==================== LOADING ====================
+
+def compile_rules(spec: dict) -> CompiledRules:
+    """Compile a rules spec (parsed YAML) into masks"""
+    return CompiledRules(spec)
+
+def load_rules(path: Path = QUARANTINE_RULES) -> Optional[CompiledRules]:
+    """
+    Compiled rules from a YAML file (cached per path)
+
+    Returns None when `path` is None (quarantine disabled) or missing.
+    """
+    if path is None:
+        return None
+    path = Path(path)
+    if path not in RULES_CACHE:
+        if not path.exists():
+            print(f"  ⚠ Quarantine rules not found: {path} - rows are not validated")
+            RULES_CACHE[path] = None
+        else:
+            with open(path) as f:
+                RULES_CACHE[path] = compile_rules(yaml.safe_load(f))
+    return RULES_CACHE[path]
+
+def quarantine_rows(df: pd.DataFrame, parsed: Optional[dict] = None,
+                    rules: Optional[CompiledRules] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split off the rows that fail the deployment's quarantine rules
+
+    Args:
+        df: Raw or alias-mapped DataFrame
+        parsed: parse_sources(df) output, trimmed to the clean rows (see CompiledRules.split)
+        rules: Rule set (default: load_rules())
+
+    Returns:
+        (clean rows, quarantined rows with a REASON_COLUMN)
+
+    Example:
+        >>> parsed = parse_sources(chunk)
+        >>> clean, quarantined = quarantine_rows(chunk, parsed)
+        >>> scored = normalize_and_score(clean, parsed=parsed)
+    """
+    rules = rules if rules is not None else load_rules()
+    if rules is None:
+        return df, df.iloc[:0].assign(**{REASON_COLUMN: pd.Series(dtype='str')})
+    return rules.split(df, parsed)
+
+def reason_counts(quarantined: pd.DataFrame) -> Dict[str, int]:
+    """Rows per reason code (a row with several reasons counts under each)"""
+    if len(quarantined) == 0:
+        return {}
+    return quarantined[REASON_COLUMN].str.split('|').explode().value_counts().to_dict()
+
+def merge_counts(total: Dict[str, int], counts: Dict[str, int]) -> Dict[str, int]:
+    """Add one chunk's reason counts into a running total (in place)"""
+    for code, count in counts.items():
+        total[code] = total.get(code, 0) + int(count)
+    return total
+
+def quarantine_path(output_path: Path) -> Path:
+    """Sidecar file next to a scored output: <stem>_quarantine.csv"""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_quarantine.csv")
@@ -100,7 +100,8 @@ def create_header_footer_with_background(canvas, doc, logo_path=None):
     
     canvas.restoreState()
 
-def render_pdf(df, out_path, csv_filename=None, market_name="Raleigh, NC", quarter=4, year=2025):
+def render_pdf(df, out_path, csv_filename=None, market_name="Raleigh, NC", quarter=4, year=2025,
+               sketches=None, counts=None):
     """
     Main PDF rendering function with APS Black Kit branding
     
@@ -120,6 +121,10 @@ def render_pdf(df, out_path, csv_filename=None, market_name="Raleigh, NC", quart
         market_name: Market name for cover page
         quarter: Quarter number
         year: Year
+        sketches: Optional median sketches by column from earlier stages
+                  (health_check, calculate_market_aggregates)
+        counts: Optional full-input counts (HealthPartial.counts) for the
+                cover page when df is a report sample
     """
     
     # Detect feed type
@@ -151,7 +156,7 @@ def render_pdf(df, out_path, csv_filename=None, market_name="Raleigh, NC", quart
     story = []
     
     print("  → Rendering Page 1: Cover...")
-    create_page1_cover(story, df, market_name, quarter, year)
+    create_page1_cover(story, df, market_name, quarter, year, sketches, counts)
     
     print("  → Rendering Page 2: Churn Layer (Predictive Framework)...")
     create_page2_churn_layer(story, df)
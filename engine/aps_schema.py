@@ -0,0 +1,376 @@
+# aps_schema.py - Vendor Schema Fingerprint Cache
+"""
+Persistent cache of per-layout ingest discovery
+A vendor file layout is identified by a hash of its raw header row. The
+first job with a new layout runs the full discovery (schema validation,
+alias mapping, dtype inference, date-format detection, feed detection)
+and stores the results under that hash; later jobs with the same header
+skip straight to a typed, projected read. Stored in SCHEMA_CACHE_PATH.
+Read plans project every read down to the columns the selected feed
+outputs, with ZIP and state read in their final types.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from engine.aps_config import SCHEMA_CACHE_PATH, SCHEMA_CACHE_MAX_ENTRIES, PROJECTED_READS
+from engine.aps_aliases import resolver_for
+from engine.aps_feed_config import FEED_TYPES, detect_feed_type
+from engine.aps_parsers import DATE_FORMAT_CACHE, DERIVED_COLUMNS, header_signature
+
+# Source date columns whose detected format is remembered (either naming)
+DATE_COLUMNS = ['LastLoanDate', 'loan_date']
+
+# Canonical field -> read dtype (ZIPs keep leading zeros, states arrive as the
+# category the dtype plan uses, dates stay text for parse_dates' per-value parse)
+FIELD_DTYPES = {
+    'zip': 'str',
+    'mailing_zip': 'str',
+    'state': 'category',
+    'loan_date': 'str',
+    'sale_date': 'str'
+}
+
+# Read whatever the feed: duplicate keys (APN) and the control columns
+# apply_dnc_filter and detect_feed_type look at
+CONTROL_FIELDS = ['apn']
+CONTROL_COLUMNS = ['feed_type', 'dnc_flag', 'consent']
+
+# Bump when the stored entry layout changes (older entries are ignored)
+FINGERPRINT_VERSION = 1
+
+# Cache writes are serialized (background jobs can finish concurrently)
+_WRITE_LOCK = threading.Lock()
+
+class SchemaDrift(ValueError):
+    """A file no longer fits the dtypes cached for its header"""
+
+# ==================== KEYS ====================
+
+def fingerprint_key(columns, alias_map: Optional[Dict[str, List[str]]] = None) -> str:
+    """
+    Hash of a raw header row (and of the alias map, when a request supplies one)
+
+    Example:
+        >>> fingerprint_key(['Property Address', 'City', 'State', 'ZIP'])
+        'e3661e492feeed06'
+    """
+    text = '\x1f'.join(str(col) for col in columns)
+    if alias_map is not None:
+        text += '\x1e' + json.dumps(alias_map, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+# Inferred column kind -> read dtype. Inferred bool/int turn into object/float
+# once a blank shows up, and the C parser reads nullable Int64 about half as
+# fast as it infers int64, so those stay with inference (None).
+READ_DTYPES = {'category': 'category', 'float': 'float64', 'str': 'str', 'int': None, 'bool': None}
+
+def _kind(dtype) -> str:
+    """Kind of an inferred column dtype (READ_DTYPES key)"""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'int'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'float'
+    return 'str'
+
+def _widen(kind: Optional[str], other: str) -> str:
+    """Kind covering two chunks of one column (int + float -> float, other mixes -> str)"""
+    if kind is None or kind == other:
+        return other
+    if {kind, other} == {'int', 'float'}:
+        return 'float'
+    return 'str'
+
+# ==================== READ PLAN ====================
+
+def feed_fields(feed: Optional[str] = None) -> List[str]:
+    """
+    Canonical fields a feed's outputs need (plus CONTROL_FIELDS)
+
+    Args:
+        feed: FEED_TYPES key; None = not known before scoring (a per-row
+              feed_type column), so every feed's fields
+
+    Returns:
+        Field names
+    """
+    feeds = [FEED_TYPES[feed]] if feed is not None else FEED_TYPES.values()
+    fields = dict.fromkeys(field for config in feeds for field in config['output_fields'])
+    return list(fields) + [field for field in CONTROL_FIELDS if field not in fields]
+
+def header_feed(columns) -> Optional[str]:
+    """
+    Feed decided by the header alone, None when a feed_type column decides it per row
+
+    Same answer detect_feed_type gives for the scored frame, whose columns
+    are these plus the engine-derived ones.
+    """
+    if 'feed_type' in columns:
+        return None
+    return detect_feed_type(data=pd.DataFrame(columns=list(columns) + sorted(DERIVED_COLUMNS)))
+
+def read_plan(columns, feed: Optional[str] = None,
+              alias_map: Optional[Dict[str, List[str]]] = None) -> dict:
+    """
+    usecols + dtype map for a typed, projected read
+
+    Headers are resolved through the alias map; only those resolving to a
+    field the feed outputs (and the control columns) are read. With
+    PROJECTED_READS off every column is read, still with the field dtypes.
+
+    Args:
+        columns: Raw header row
+        feed: Selected feed (see feed_fields)
+        alias_map: Request alias map (None = default alias file)
+
+    Returns:
+        read_csv / iter_csv options: {'usecols': [...], 'dtype': {...}}
+
+    Example:
+        >>> df = read_csv(path, encoding='utf-8-sig', **read_plan(header, 'core_equity'))
+    """
+    fields = resolver_for(alias_map).resolve(columns)
+    wanted = set(feed_fields(feed))
+    if PROJECTED_READS:
+        usecols = [col for col in columns if fields.get(col) in wanted or col in CONTROL_COLUMNS]
+    else:
+        usecols = list(columns)
+    dtype = {col: FIELD_DTYPES[fields[col]] for col in usecols if fields.get(col) in FIELD_DTYPES}
+    return {'usecols': usecols, 'dtype': dtype}
+
+# ==================== FINGERPRINT ====================
+
+class SchemaFingerprint:
+    """
+    Discovery results for one vendor header layout
+
+    Attributes:
+        columns: Raw header row
+        usecols: Columns to read (blank-header filler columns left out)
+        dtypes: Read dtype per text / float column (ints and bools are inferred)
+        rename: Vendor header -> canonical field (alias mapping)
+        schemas: Schema versions the layout has passed
+        date_formats: Source date column -> strptime format (None = no fixed format)
+        feed: Feed type, when the header alone decides it (None = per-row feed_type column)
+    """
+
+    def __init__(self, key: str, entry: dict):
+        self.key = key
+        self.columns = entry['columns']
+        self.usecols = entry['usecols']
+        self.dtypes = entry['dtypes']
+        self.rename = entry['rename']
+        self.schemas = entry['schemas']
+        self.date_formats = entry['date_formats']
+        self.feed = entry.get('feed')
+        self.created_at = entry.get('created_at')
+
+    def to_dict(self) -> dict:
+        return {
+            'version': FINGERPRINT_VERSION,
+            'columns': self.columns,
+            'usecols': self.usecols,
+            'dtypes': self.dtypes,
+            'rename': self.rename,
+            'schemas': self.schemas,
+            'date_formats': self.date_formats,
+            'feed': self.feed,
+            'created_at': self.created_at
+        }
+
+    def read_kwargs(self) -> dict:
+        """read_csv / iter_csv options for the typed, projected read"""
+        return {'usecols': self.usecols, 'dtype': self.dtypes}
+
+    def mapped_columns(self) -> List[str]:
+        """Column names after the projected read and alias mapping"""
+        return [self.rename.get(col, col) for col in self.usecols]
+
+    def seed_date_formats(self):
+        """Put the stored date formats in DATE_FORMAT_CACHE, so parse_dates skips detection"""
+        signature = header_signature(self.mapped_columns())
+        for col, fmt in self.date_formats.items():
+            if fmt is not None:
+                DATE_FORMAT_CACHE[(signature, col)] = fmt
+
+class ReadProfile:
+    """
+    Inferred dtypes of a raw read, accumulated chunk by chunk
+
+    Chunks are typed independently, so each column keeps the kind that
+    covers every chunk seen (what one whole-file read would have inferred).
+
+    Example:
+        >>> profile = ReadProfile()
+        >>> for chunk in iter_csv(path, 100_000):
+        ...     profile.add(chunk)
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.kinds = {}
+        self.filled = set()
+
+    def add(self, chunk: pd.DataFrame):
+        """Fold in one raw chunk (before alias mapping)"""
+        if self.columns is None:
+            self.columns = [str(col) for col in chunk.columns]
+        for col in chunk.columns:
+            self.kinds[str(col)] = _widen(self.kinds.get(str(col)), _kind(chunk[col].dtype))
+            # Only blank-header columns are dropped when empty, so only they are scanned
+            if str(col).startswith('Unnamed:') and col not in self.filled and chunk[col].notna().any():
+                self.filled.add(str(col))
+
+    def dtype(self, col: str) -> Optional[str]:
+        """Read dtype reproducing the column (None = leave to inference)"""
+        return READ_DTYPES[self.kinds[col]]
+
+    def filler(self, col: str) -> bool:
+        """Blank-header column that was empty in every chunk"""
+        return col.startswith('Unnamed:') and col not in self.filled
+
+def learn_fingerprint(header, profile: ReadProfile, schema_version: str,
+                      alias_map: Optional[Dict[str, List[str]]] = None) -> SchemaFingerprint:
+    """
+    Fingerprint of a file that went through full discovery
+
+    Args:
+        header: The file's raw header row
+        profile: ReadProfile of every raw chunk read (may be projected)
+        schema_version: Schema version the file passed
+        alias_map: Request alias map (None = default alias file)
+
+    Returns:
+        SchemaFingerprint (not yet stored); date formats detected while
+        scoring are picked up from DATE_FORMAT_CACHE
+    """
+    header = [str(col) for col in header]
+    columns = profile.columns or []
+    rename = resolver_for(alias_map).rename_map(columns)
+
+    # Discovery scored every column read, so its formats sit under that mapped header
+    signature = header_signature([rename.get(col, col) for col in columns])
+    date_formats = {col: DATE_FORMAT_CACHE[(signature, col)] for col in DATE_COLUMNS
+                    if (signature, col) in DATE_FORMAT_CACHE}
+
+    feed = header_feed(columns)
+
+    # Known feed: later reads narrow down to its columns
+    usecols = read_plan([col for col in columns if not profile.filler(col)], feed, alias_map)['usecols']
+    dtypes = {col: dtype for col in usecols if (dtype := profile.dtype(col)) is not None}
+
+    return SchemaFingerprint(fingerprint_key(header, alias_map), {
+        'columns': header,
+        'usecols': usecols,
+        'dtypes': dtypes,
+        'rename': {col: name for col, name in rename.items() if col in usecols},
+        'schemas': [schema_version],
+        'date_formats': date_formats,
+        'feed': feed,
+        'created_at': datetime.now().isoformat()
+    })
+
+def typed_chunks(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Pass chunks of a typed read through, turning dtype conversion errors into SchemaDrift"""
+    try:
+        yield from chunks
+    except (ValueError, TypeError) as e:
+        raise SchemaDrift(str(e)) from e
+
+# ==================== CACHE ====================
+
+class SchemaCache:
+    """
+    Header hash -> SchemaFingerprint, persisted as one JSON file
+
+    Example:
+        >>> cache = SchemaCache()
+        >>> fingerprint = cache.lookup(header, alias_map, 'v2.0')
+        >>> if fingerprint is None:
+        ...     cache.store(learn_fingerprint(header, profile, 'v2.0', alias_map))
+    """
+
+    def __init__(self, path: Path = SCHEMA_CACHE_PATH, max_entries: int = SCHEMA_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.entries = {}
+        if self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def load(self):
+        """Read the cache from disk (entries of an older layout are dropped)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠ Schema cache unreadable ({e}) - starting empty")
+            entries = {}
+        self.entries = {key: entry for key, entry in entries.items()
+                        if entry.get('version') == FINGERPRINT_VERSION}
+
+    def save(self):
+        """Write the cache atomically (temp file, then rename)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix('.tmp.json')
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(temp, self.path)
+
+    def lookup(self, columns, alias_map: Optional[Dict[str, List[str]]] = None,
+               schema_version: Optional[str] = None) -> Optional[SchemaFingerprint]:
+        """
+        Fingerprint of a header row, or None on a miss
+
+        Args:
+            columns: Raw header row
+            alias_map: Request alias map (None = default alias file)
+            schema_version: Only a hit when the layout has passed this version
+
+        Returns:
+            SchemaFingerprint or None
+        """
+        columns = [str(col) for col in columns]
+        key = fingerprint_key(columns, alias_map)
+        entry = self.entries.get(key)
+        if entry is None or entry['columns'] != columns:
+            return None
+        if schema_version is not None and schema_version not in entry['schemas']:
+            return None
+        return SchemaFingerprint(key, entry)
+
+    def store(self, fingerprint: SchemaFingerprint):
+        """Add (or replace) a fingerprint and write the cache (re-read first, so concurrent jobs aren't lost)"""
+        with _WRITE_LOCK:
+            if self.path.exists():
+                self.load()
+            entry = fingerprint.to_dict()
+            previous = self.entries.pop(fingerprint.key, None)
+            if previous is not None and previous['columns'] == entry['columns']:
+                entry['schemas'] = sorted(set(previous['schemas']) | set(entry['schemas']))
+            self.entries[fingerprint.key] = entry
+            # Oldest layouts go first (entries are kept in insertion order)
+            while len(self.entries) > self.max_entries:
+                del self.entries[next(iter(self.entries))]
+            self.save()
+
+    def evict(self, key: str):
+        """Drop a fingerprint whose file layout drifted"""
+        with _WRITE_LOCK:
+            if self.path.exists():
+                self.load()
+            if self.entries.pop(key, None) is not None:
+                self.save()
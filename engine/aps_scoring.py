@@ -0,0 +1,112 @@
+# aps_scoring.py - APS v2.0 Scalar Reference
+"""
+Row-wise APS v2.0 reference: APS_Score (v2.0), APS_Tier and CCI for one record
+Production scoring runs the compiled scoring_models/aps_v2.0.yaml model
+(aps_models), which must match these functions exactly
+"""
+
+import numpy as np
+
+# ==================== APS v2.0 CONSTANTS ====================
+
+SCORE_WEIGHTS = {
+    'equity': 0.40,
+    'age': 0.30,
+    'ltv': 0.30
+}
+
+# (tier, min score, max LTV %, min equity dollars) - first match wins
+TIER_RULES = [
+    ('Platinum', 80, 30, 500000),
+    ('Gold', 65, 50, 300000),
+    ('Silver', 50, 65, 200000)
+]
+DEFAULT_TIER = 'Nurture'
+
+SCORE_COLUMNS = ['APS_Score (v2.0)', 'APS_Tier', 'CCI']
+
+# ==================== ROUNDING ====================
+
+def py_round(values, decimals: int = 1) -> np.ndarray:
+    """
+    Round an array exactly like Python's built-in round()
+
+    np.round scales by 10**decimals before rounding, which disagrees with
+    round() on values whose scaled form lands next to .5 (e.g. 0.15).
+    Those few near-ties are re-rounded with round() so the kernel output
+    is identical to the row-wise scores.
+
+    Args:
+        values: Array-like of floats
+        decimals: Decimal places
+
+    Returns:
+        float64 array
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+
+    scaled = np.abs(values) * (10.0 ** decimals)
+    near_tie = np.abs((scaled - np.floor(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        rounded[idx] = [round(float(v), decimals) for v in values[idx]]
+
+    return rounded
+
+# ==================== SCALAR REFERENCE ====================
+
+def age_score(loan_age: float) -> float:
+    """Loan age component (optimal 18-36 months)"""
+    if loan_age < 18:
+        return (loan_age / 18) * 50
+    elif loan_age <= 36:
+        return 100
+    elif loan_age <= 60:
+        return 100 - ((loan_age - 36) / 24) * 30
+    else:
+        return max(40, 70 - ((loan_age - 60) / 60) * 30)
+
+def calculate_aps_score(equity_pct: float, loan_age: float, ltv_pct: float) -> float:
+    """
+    APS Score v2.0 for a single record
+
+    Args:
+        equity_pct: Equity % (0-100)
+        loan_age: Loan age in months
+        ltv_pct: LTV % (0-100)
+
+    Returns:
+        Score rounded to 1 decimal
+    """
+    equity_score = equity_pct
+    ltv_score = 100 - ltv_pct
+
+    aps_score = (equity_score * SCORE_WEIGHTS['equity'] +
+                 age_score(loan_age) * SCORE_WEIGHTS['age'] +
+                 ltv_score * SCORE_WEIGHTS['ltv'])
+    return round(aps_score, 1)
+
+def assign_tier(score: float, ltv: float, equity_dollars: float) -> str:
+    """APS tier for a single record (Platinum/Gold/Silver/Nurture)"""
+    for tier, min_score, max_ltv, min_equity in TIER_RULES:
+        if score >= min_score and ltv <= max_ltv and equity_dollars >= min_equity:
+            return tier
+    return DEFAULT_TIER
+
+def calculate_cci(equity_pct: float, ltv_pct: float, loan_age: float) -> float:
+    """
+    CCI (Credit Confidence Index) for a single record
+
+    Components: equity (0-40), LTV (0-35), loan age (0-25)
+    """
+    equity_component = min(40, (equity_pct / 100) * 40)
+    ltv_component = max(0, 35 - (ltv_pct / 100) * 35)
+
+    if loan_age >= 18:
+        age_component = min(25, 25 * (loan_age / 60))
+    else:
+        age_component = (loan_age / 18) * 15
+
+    cci = equity_component + ltv_component + age_component
+    return round(cci, 1)
@@ -0,0 +1,246 @@
+# aps_sketch.py - Mergeable Quantile Sketch
+"""
+KLL-style quantile sketch for medians and percentiles across the engine
+Values are kept exactly until `exact_limit` is exceeded, so small inputs
+get the same median as np.median. Past that, levels of sorted samples are
+compacted (each level's items weigh 2^level), which bounds memory and keeps
+rank error within RANK_ERROR_FACTOR / k. Sketches built on separate chunks
+merge into the sketch of the whole input, and serialize (to_dict/to_bytes)
+so they can be stored and merged later.
+Set SKETCH_EXACT_LIMIT and SKETCH_RANK_ERROR in aps_config per deployment.
+"""
+
+import math
+import struct
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.aps_config import SKETCH_EXACT_LIMIT, SKETCH_RANK_ERROR
+from engine.aps_dtypes import widen
+
+# Observed worst-case rank error x k (99 quantiles, 2M values, several seeds)
+RANK_ERROR_FACTOR = 2.7
+
+# Capacity shrink factor per level below the top
+LEVEL_DECAY = 2 / 3
+
+# Binary layout: magic, version, k, exact_limit, count, level count; then level sizes and values
+BYTES_MAGIC = b'APSQ'
+BYTES_VERSION = 1
+BYTES_HEADER = struct.Struct('<4sBIQQI')
+
+def k_for_error(rank_error: float) -> int:
+    """Top-level compactor size that keeps rank error within `rank_error` (e.g. 0.005 = 0.5%)"""
+    if not 0 < rank_error < 1:
+        raise ValueError(f"rank_error must be between 0 and 1, got {rank_error}")
+    return max(8, math.ceil(RANK_ERROR_FACTOR / rank_error))
+
+# Compactor size of the top level (larger = more accurate, more memory)
+DEFAULT_K = k_for_error(SKETCH_RANK_ERROR)
+
+# Values kept exactly before the sketch starts compacting
+DEFAULT_EXACT_LIMIT = SKETCH_EXACT_LIMIT
+
+# ==================== SKETCH ====================
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with an exact mode for small inputs
+
+    Example:
+        >>> sketch = QuantileSketch()
+        >>> for chunk in chunks:
+        ...     sketch.update(chunk['LTV %'])
+        >>> sketch.median()
+        >>> restored = QuantileSketch.from_bytes(sketch.to_bytes())
+    """
+
+    def __init__(self, k: int = DEFAULT_K, exact_limit: int = DEFAULT_EXACT_LIMIT, seed: int = 42):
+        self.k = k
+        self.exact_limit = exact_limit
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def for_error(cls, rank_error: float, exact_limit: int = DEFAULT_EXACT_LIMIT) -> 'QuantileSketch':
+        """Sketch sized for a rank error bound (e.g. 0.01 = within 1% of the true rank)"""
+        return cls(k=k_for_error(rank_error), exact_limit=exact_limit)
+
+    @property
+    def exact(self) -> bool:
+        """True while every value is still held (no compaction yet)"""
+        return len(self.levels) == 1 and self.count <= self.exact_limit
+
+    @property
+    def rank_error(self) -> float:
+        """Rank error bound of quantile() (0 in exact mode)"""
+        return 0.0 if self.exact else RANK_ERROR_FACTOR / self.k
+
+    def update(self, values) -> 'QuantileSketch':
+        """Add an array of values (NaN skipped)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        # Large arrays go in blocks, so each compaction sorts a bounded level
+        step = max(self.exact_limit, self.k)
+        for start in range(0, len(values), step):
+            block = values[start:start + step]
+            self.levels[0] = np.concatenate([self.levels[0], block])
+            self.count += len(block)
+            self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Fold another sketch into this one (in place)"""
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        """Items a level may hold before it is compacted"""
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * LEVEL_DECAY ** depth)))
+
+    def _compress(self):
+        """Compact over-full levels bottom-up: sort, keep every other item, promote"""
+        if self.exact:
+            return
+
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so total weight is preserved exactly
+                leftover, items = (items[-1:], items[:-1]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    # ==================== QUERIES ====================
+
+    def quantiles(self, qs) -> np.ndarray:
+        """
+        Values at quantiles qs (0-1)
+
+        Exact mode matches np.quantile (linear interpolation);
+        NaN when the sketch is empty.
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        if self.exact:
+            return np.quantile(self.levels[0], qs)
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        positions = np.minimum(np.searchsorted(cumulative, qs * cumulative[-1]), len(items) - 1)
+        return items[order][positions]
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (0-1)"""
+        return float(self.quantiles([q])[0])
+
+    def median(self) -> float:
+        """Median (np.median in exact mode)"""
+        if self.exact and self.count:
+            return float(np.median(self.levels[0]))
+        return self.quantile(0.5)
+
+    def __len__(self) -> int:
+        return self.count
+
+    # ==================== SERIALIZATION ====================
+
+    def to_dict(self) -> dict:
+        """JSON-safe form (see from_dict)"""
+        return {
+            'k': self.k,
+            'exact_limit': self.exact_limit,
+            'count': self.count,
+            'levels': [items.tolist() for items in self.levels]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QuantileSketch':
+        """Rebuild a sketch from to_dict() output"""
+        sketch = cls(k=data['k'], exact_limit=data['exact_limit'])
+        sketch.count = data['count']
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in data['levels']] or [np.empty(0)]
+        return sketch
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form (header, level sizes, little-endian float64 values)"""
+        sizes = np.array([len(items) for items in self.levels], dtype='<u8')
+        header = BYTES_HEADER.pack(BYTES_MAGIC, BYTES_VERSION, self.k, self.exact_limit,
+                                   self.count, len(self.levels))
+        values = np.concatenate(self.levels).astype('<f8')
+        return header + sizes.tobytes() + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'QuantileSketch':
+        """Rebuild a sketch from to_bytes() output"""
+        magic, version, k, exact_limit, count, n_levels = BYTES_HEADER.unpack_from(data)
+        if magic != BYTES_MAGIC or version != BYTES_VERSION:
+            raise ValueError(f"Not a version {BYTES_VERSION} quantile sketch")
+
+        offset = BYTES_HEADER.size
+        sizes = np.frombuffer(data, dtype='<u8', count=n_levels, offset=offset).astype(np.int64)
+        offset += sizes.nbytes
+        values = np.frombuffer(data, dtype='<f8', count=int(sizes.sum()), offset=offset).astype(np.float64)
+
+        sketch = cls(k=k, exact_limit=exact_limit)
+        sketch.count = count
+        sketch.levels = np.split(values, np.cumsum(sizes)[:-1]) if n_levels else [np.empty(0)]
+        return sketch
+
+# ==================== HELPERS ====================
+
+def merge_sketches(sketches) -> Optional[QuantileSketch]:
+    """Merge an iterable of sketches into a new one (None when empty)"""
+    merged = None
+    for sketch in sketches:
+        if merged is None:
+            merged = QuantileSketch(sketch.k, sketch.exact_limit)
+        merged.merge(sketch)
+    return merged
+
+def column_median(df: pd.DataFrame, col: str, sketches: Optional[dict] = None, default=0):
+    """
+    Median of a numeric column, through a shared sketch
+
+    Exact up to SKETCH_EXACT_LIMIT values, within SKETCH_RANK_ERROR beyond.
+
+    Args:
+        df: Scored DataFrame
+        col: Column name
+        sketches: Optional dict of sketches by column; an existing sketch is
+                  reused, a new one is stored for the next caller
+        default: Returned when the column is missing
+
+    Example:
+        >>> sketches = {}
+        >>> checks = health_check(df, sources, sketches)
+        >>> column_median(df, 'LTV %', sketches)  # no second pass over LTV
+    """
+    if col not in df.columns:
+        return default
+
+    sketch = sketches.get(col) if sketches is not None else None
+    if sketch is None:
+        sketch = QuantileSketch().update(widen(df[col]).to_numpy(dtype=np.float64, na_value=np.nan))
+        if sketches is not None:
+            sketches[col] = sketch
+    return sketch.median()
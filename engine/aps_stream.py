@@ -0,0 +1,241 @@
+# aps_stream.py - Streaming Normalize & Score
+"""
+Chunked pipeline mode for files larger than memory
+Reads the input in bounded chunks, scores each chunk with normalize_and_score
+and appends it to the scored CSV as soon as it completes.
+Peak memory depends on chunk_rows, not on file size.
+The health check is merged from per-chunk partials and covers every row.
+Rows failing the quarantine rules go to a sidecar CSV instead of being scored.
+Ingest jobs spill each feed's rows the same way (FeedSpill).
+"""
+
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.aps_normalize import normalize_and_score, parse_sources
+from engine.aps_quarantine import quarantine_rows
+from engine.aps_healthcheck import HealthPartial, health_partial
+from engine.aps_io import iter_csv
+
+# Rows kept for the report stages (health check, aggregates, PDF) in streaming mode
+REPORT_SAMPLE_ROWS = 50_000
+
+# ==================== CHUNK GENERATOR ====================
+
+def iter_scored_chunks(csv_path: Path, chunk_rows: int, today: datetime = None,
+                       read_kwargs: Optional[Dict] = None,
+                       sources: Optional[Dict] = None,
+                       quarantine: Optional['ScoredCSVWriter'] = None,
+                       header_map: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield normalized + scored chunks of a CSV file
+
+    Args:
+        csv_path: Input CSV
+        chunk_rows: Rows per chunk
+        today: Loan-age reference date shared by every chunk (default: now)
+        read_kwargs: Extra read_csv arguments (encoding, dtype, ...)
+        sources: Optional dict refilled with each chunk's parsed source
+                 arrays before the chunk is yielded (see normalize_and_score)
+        quarantine: Optional writer for rows failing the quarantine rules;
+                    when given, only the clean rows are scored and yielded
+        header_map: Optional column renames applied to every chunk first
+                    (e.g. aps_aliases.engine_header_map of the file header)
+
+    Yields:
+        Scored DataFrame per chunk
+    """
+    if today is None:
+        today = datetime.now()
+
+    for chunk in iter_csv(csv_path, chunk_rows, **(read_kwargs or {})):
+        if header_map:
+            chunk.rename(columns=header_map, inplace=True)
+        if sources is not None:
+            sources.clear()
+        parsed = None
+        if quarantine is not None:
+            parsed = parse_sources(chunk)
+            chunk, quarantined = quarantine_rows(chunk, parsed)
+            if len(quarantined):
+                quarantine.write(quarantined)
+        yield normalize_and_score(chunk, today=today, sources=sources, parsed=parsed)
+
+# ==================== INCREMENTAL WRITER ====================
+
+class ScoredCSVWriter:
+    """
+    Append-only scored CSV writer
+
+    The header (and BOM for utf-8-sig) is written once, with the first chunk.
+
+    Example:
+        with ScoredCSVWriter(out_path) as writer:
+            for chunk in iter_scored_chunks(csv_path, 100_000):
+                writer.write(chunk)
+    """
+
+    def __init__(self, out_path: Path, encoding: str = 'utf-8-sig'):
+        self.out_path = Path(out_path)
+        self.encoding = encoding
+        self.rows_written = 0
+        self.columns = None
+        self._handle = None
+        self._header_written = False
+
+    def __enter__(self):
+        return self.open()
+
+    def open(self) -> 'ScoredCSVWriter':
+        """Create (truncate) the output file"""
+        self._handle = open(self.out_path, 'w', encoding=self.encoding, newline='')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, chunk: pd.DataFrame):
+        """Append one scored chunk"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        elif list(chunk.columns) != self.columns:
+            chunk = chunk.reindex(columns=self.columns)
+
+        chunk.to_csv(self._handle, index=False, header=not self._header_written)
+        self._header_written = True
+        self.rows_written += len(chunk)
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+# ==================== REPORT SAMPLE ====================
+
+class ReportSample:
+    """
+    Uniform fixed-size sample of scored rows across all chunks
+
+    Bottom-k sampling: every row gets a random key and the `size` smallest
+    keys are kept, which is a uniform sample without replacement no matter
+    how the file is chunked. Rows come back in original file order.
+    """
+
+    def __init__(self, size: int = REPORT_SAMPLE_ROWS, seed: int = 42):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.rows_seen = 0
+        self._sample = None
+
+    def add(self, chunk: pd.DataFrame):
+        """Offer one chunk to the sample"""
+        chunk = chunk.assign(
+            _row=np.arange(self.rows_seen, self.rows_seen + len(chunk)),
+            _key=self.rng.random(len(chunk))
+        )
+        self.rows_seen += len(chunk)
+
+        pool = chunk if self._sample is None else pd.concat([self._sample, chunk], ignore_index=True)
+        self._sample = pool.nsmallest(self.size, '_key') if len(pool) > self.size else pool
+
+    def frame(self) -> pd.DataFrame:
+        """Sampled rows in file order"""
+        if self._sample is None:
+            return pd.DataFrame()
+        return (self._sample.sort_values('_row')
+                .drop(columns=['_row', '_key'])
+                .reset_index(drop=True))
+
+# ==================== PER-FEED SPILLS ====================
+
+class FeedSpill:
+    """
+    One feed's outputs of a single-pass chunked job
+
+    Scored rows are appended to the feed's CSV as each chunk completes; a
+    report sample and a health partial (for the PDF's medians) are kept
+    alongside, so the feed never has to be re-read or held in memory.
+
+    Example:
+        >>> spill = FeedSpill(out_path)
+        >>> for rows, partial in routed_chunks:
+        ...     spill.add(rows, partial)
+        >>> spill.close()
+    """
+
+    def __init__(self, out_path: Path, encoding: str = 'utf-8-sig', sample_rows: int = REPORT_SAMPLE_ROWS):
+        self.writer = ScoredCSVWriter(out_path, encoding=encoding).open()
+        self.sample = ReportSample(sample_rows)
+        self.health = HealthPartial()
+
+    @property
+    def out_path(self) -> Path:
+        return self.writer.out_path
+
+    @property
+    def rows(self) -> int:
+        return self.writer.rows_written
+
+    def add(self, rows: pd.DataFrame, partial: Optional[HealthPartial] = None):
+        """Append one chunk's rows of this feed (with their health partial)"""
+        self.writer.write(rows)
+        self.sample.add(rows)
+        if partial is not None:
+            self.health.merge(partial)
+
+    def close(self):
+        self.writer.close()
+
+# ==================== STREAMING RUN ====================
+
+def stream_score_csv(csv_path: Path, out_path: Path, chunk_rows: int,
+                     encoding: str = 'utf-8-sig', read_kwargs: Optional[Dict] = None,
+                     sample_rows: int = REPORT_SAMPLE_ROWS, today: datetime = None,
+                     health: Optional[HealthPartial] = None,
+                     quarantine_path: Optional[Path] = None,
+                     header_map: Optional[Dict[str, str]] = None):
+    """
+    Score a CSV chunk by chunk, appending each chunk to the scored CSV
+
+    Args:
+        csv_path: Input CSV
+        out_path: Scored CSV output path
+        chunk_rows: Rows per chunk
+        encoding: Output encoding
+        read_kwargs: Extra read_csv arguments
+        sample_rows: Size of the report sample
+        today: Loan-age reference date (default: now, taken once)
+        health: Optional HealthPartial that every chunk is merged into, so the
+                health check covers the whole file rather than the sample
+        quarantine_path: Optional sidecar CSV for rows failing the quarantine
+                         rules (see aps_quarantine); they are not scored
+        header_map: Optional column renames applied to every chunk
+
+    Returns:
+        (total rows written, report sample DataFrame)
+    """
+    sample = ReportSample(sample_rows)
+    sources = {} if health is not None else None
+    quarantine_writer = ScoredCSVWriter(quarantine_path, encoding=encoding) if quarantine_path else nullcontext()
+
+    with ScoredCSVWriter(out_path, encoding=encoding) as writer, quarantine_writer as quarantine:
+        for i, chunk in enumerate(iter_scored_chunks(csv_path, chunk_rows, today, read_kwargs,
+                                                     sources, quarantine, header_map)):
+            writer.write(chunk)
+            sample.add(chunk)
+            if health is not None:
+                health.merge(health_partial(chunk, sources))
+            print(f"  → Chunk {i+1}: {writer.rows_written:,} rows scored")
+
+    if quarantine is not None:
+        if quarantine.rows_written:
+            print(f"  ⚠ Quarantined {quarantine.rows_written:,} rows → {quarantine.out_path.name}")
+        else:
+            quarantine.out_path.unlink(missing_ok=True)
+
+    return writer.rows_written, sample.frame()
@@ -0,0 +1,53 @@
+# conftest.py - Shared fixtures for the ingest job tests
+"""
+Runs /ingest background jobs end to end against a temporary output
+directory, duplicate index and schema cache. The download is served
+from a local file and PDF rendering is skipped.
+"""
+
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+import engine.aps_api as api
+from engine.aps_dedupe import DuplicateIndex
+from engine.aps_schema import SchemaCache
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_FEED = ROOT / "input" / "test_feeds" / "core_equity_test.csv"
+
+class _Download:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+@pytest.fixture
+def run_job(tmp_path, monkeypatch):
+    """
+    Run process_job on a local CSV and return the job record
+
+    Example:
+        >>> job = run_job(SAMPLE_FEED, chunk_rows=50)
+        >>> job['status']
+        <JobStatus.COMPLETED: 'completed'>
+    """
+    monkeypatch.setattr(api, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(api, "DuplicateIndex", partial(DuplicateIndex, tmp_path / "duplicate_index.npz"))
+    monkeypatch.setattr(api, "SchemaCache", partial(SchemaCache, tmp_path / "schema_fingerprints.json"))
+    monkeypatch.setattr(api, "render_pdf", lambda *args, **kwargs: None)
+
+    def run(csv_path: Path, chunk_rows: int = 50, job_id: str = "job"):
+        content = Path(csv_path).read_bytes()
+        monkeypatch.setattr(api.requests, "get", lambda *args, **kwargs: _Download(content))
+        api.JOBS[job_id] = {"status": api.JobStatus.PENDING}
+        asyncio.run(api.process_job(job_id, "http://example.com/feed.csv", "Raleigh, NC", "v2.0", None, chunk_rows))
+        return api.JOBS.pop(job_id)
+
+    return run
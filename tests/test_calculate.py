@@ -0,0 +1,47 @@
+# test_calculate.py - /v1/calculate Endpoint Tests
+"""
+Input validation of the single and batch calculate endpoints
+"""
+
+from fastapi.testclient import TestClient
+
+import engine.aps_api as api
+
+client = TestClient(api.app)
+
+def test_batch_rejects_non_numeric_json_types():
+    items = [
+        {"loan": 200000, "value": True},
+        {"loan": [200000], "value": 400000},
+        {"loan": 200000, "value": 400000, "equity_delta": False},
+        {"loan": "200000", "value": 400000.5}
+    ]
+    results = client.post("/v1/calculate/batch", json=items).json()
+
+    assert [result.get("error") for result in results] == [
+        "'value' must be a number",
+        "'loan' must be a number",
+        "'equity_delta' must be a number",
+        None
+    ]
+
+def test_batch_accepts_only_iso_loan_dates():
+    dates = ["2023-01-15", 20230115, "20230115", "2023-01-15T10:00:00", "2023-02-30", ""]
+    items = [{"loan": 200000, "value": 400000, "loan_date": loan_date} for loan_date in dates]
+    results = client.post("/v1/calculate/batch", json=items).json()
+
+    assert [result.get("error") for result in results] == [None] + [api.LOAN_DATE_ERROR] * 4 + [None]
+    assert results[0]["loan_age_months"] > 0
+
+def test_single_and_batch_agree_on_loan_dates():
+    for loan_date in ["2023-01-15", " 2023-01-15 ", "", "20230115", "2023-02-30", "01/15/2023", "soon"]:
+        single = client.post("/v1/calculate", params={"loan": 200000, "value": 400000, "loan_date": loan_date})
+        batch = client.post("/v1/calculate/batch", json=[{"loan": 200000, "value": 400000, "loan_date": loan_date}])
+        item = batch.json()[0]
+
+        if "error" in item:
+            assert single.status_code == 422, loan_date
+            assert single.json()["detail"] == item["error"]
+        else:
+            assert single.status_code == 200, loan_date
+            assert single.json() == {field: item[field] for field in single.json()}
@@ -0,0 +1,30 @@
+# test_ingest_job.py - /ingest Background Job Tests
+"""
+End-to-end checks of process_job on the sample feeds
+"""
+
+import pandas as pd
+
+from conftest import SAMPLE_FEED
+
+def test_health_checks_find_alias_mapped_columns(run_job):
+    job = run_job(SAMPLE_FEED, chunk_rows=50)
+
+    assert job["status"] == "completed", job.get("error")
+    missing = [name for name, check in job["health"].items()
+               if check.get("message") == "Column missing" or "missing columns" in check.get("message", "")]
+    assert missing == []
+    assert job["health"]["9_Duplicate_Detection"]["status"] != "WARN"
+
+def test_second_ingest_flags_previously_ingested_rows(run_job):
+    first = run_job(SAMPLE_FEED, chunk_rows=50, job_id="first")
+    second = run_job(SAMPLE_FEED, chunk_rows=50, job_id="second")
+
+    assert first["counts"]["duplicates"]["previously_ingested"] == 0
+    assert second["counts"]["duplicates"]["previously_ingested"] == second["counts"]["processed_rows"] > 0
+
+    for job, expected in [(first, False), (second, True)]:
+        for output in job["outputs"].values():
+            rows = pd.read_csv(output["csv"], encoding='utf-8-sig')
+            assert rows["Duplicate_Previously_Ingested"].eq(expected).all()
+            assert not rows["Duplicate_Within_Job"].any()
@@ -0,0 +1,31 @@
+# test_preview.py - /ingest/preview Tests
+"""
+The preview runs the ingest steps in the ingest order on its sample
+"""
+
+import pandas as pd
+
+import engine.aps_api as api
+from conftest import SAMPLE_FEED
+
+# Vendor headers the engine only reads after alias mapping
+VENDOR_HEADERS = {
+    'Property Address': 'Site Address',
+    'EstValue': 'Estimated Value',
+    'TotalLoanBal': 'Mortgage Balance',
+    'LastLoanDate': 'Last Refi Date'
+}
+
+def test_preview_maps_vendor_headers_before_scoring(run_job, tmp_path):
+    vendor_feed = tmp_path / "vendor_feed.csv"
+    pd.read_csv(SAMPLE_FEED).rename(columns=VENDOR_HEADERS).to_csv(vendor_feed, index=False)
+
+    preview = api.preview_sample(vendor_feed.read_bytes(), "v2.0", rows=5)
+    job = run_job(vendor_feed, chunk_rows=50)
+
+    assert preview["schema"]["columns"]["Estimated Value"] == "property_value"
+    assert preview["schema"]["columns"]["Last Refi Date"] == "loan_date"
+    assert preview["quarantine"]["rows"] == job["counts"]["quarantine"]["rows"]
+    assert {name: check["message"] for name, check in preview["health"].items()} == \
+           {name: check["message"] for name, check in job["health"].items()}
+    assert all(row["APS_Score (v2.0)"] is not None for row in preview["rows"])